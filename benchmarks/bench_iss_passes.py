@@ -0,0 +1,82 @@
+'''
+Benchmarks predicting every ISS pass over 10 days for the 12 regions and 1,000 locations
+Compares the ephem loop, one next_pass call at a time, with SGP4 over a time grid
+Run from the top level of the project: python3 -m benchmarks.bench_iss_passes
+'''
+import timeit
+from datetime import datetime, timedelta, timezone
+
+import ephem
+import numpy as np
+
+from src.astronomy_utils import REGIONS
+from src.iss_propagation import predict_passes_on_grid
+
+TLE = ("ISS (ZARYA)",
+       "1 25544U 98067A   25217.57738833  .00008075  00000-0  14750-3 0  9991",
+       "2 25544  51.6349  62.2717 0001595 155.7040 204.4024 15.50349286522825")
+START = datetime(2025, 8, 6, tzinfo=timezone.utc)
+DAYS = 10
+# More rises than any location sees in 10 days, so every pass in the window is found
+MAX_PASSES = 1000
+
+
+def make_locations(locations: int) -> dict:
+    '''Returns the regions, or random locations across the latitudes the ISS passes over'''
+    if locations == len(REGIONS):
+        return REGIONS
+    rng = np.random.default_rng(0)
+    return {f"location {i}": {"lat": lat, "lon": lon} for i, (lat, lon) in enumerate(
+        zip(rng.uniform(-55, 55, locations), rng.uniform(-180, 180, locations)))}
+
+
+def ephem_loop_passes(locations: dict) -> int:
+    '''
+    Predicts each location's passes over the window with next_pass, returning the count
+    This is the predict_passes loop, run until the rises pass the end of the window
+    '''
+    iss = ephem.readtle(*TLE)
+    end = ephem.Date(START + timedelta(days=DAYS))
+    total = 0
+    for coordinates in locations.values():
+        location = ephem.Observer()
+        location.lat, location.long = str(coordinates["lat"]), str(coordinates["lon"])
+        location.pressure = 0
+        location.date = START
+        while True:
+            rise_time, _, _, _, set_time, _ = location.next_pass(iss)
+            if rise_time is None:
+                # ephem finds no rise while the ISS is already up, so steps past it
+                location.date = location.date + 10 * ephem.minute
+                continue
+            if rise_time >= end:
+                break
+            total += (set_time - rise_time) * 24 * 60 * 60 > 60
+            location.date = rise_time + 25 * ephem.minute
+    return total
+
+
+def grid_passes(locations: dict) -> int:
+    '''Predicts every location's passes over the window with SGP4, returning the count'''
+    return len(predict_passes_on_grid(TLE, locations, MAX_PASSES, START, days=DAYS))
+
+
+def run_benchmark(locations: int, number: int = 3) -> dict:
+    '''Times both ways of predicting the passes for a number of locations, the slow loop once'''
+    observers = make_locations(locations)
+    result = {"locations": locations, "days": DAYS}
+
+    start = timeit.default_timer()
+    result["ephem_passes"] = ephem_loop_passes(observers)
+    result["ephem_seconds"] = timeit.default_timer() - start
+
+    result["grid_passes"] = grid_passes(observers)
+    result["grid_seconds"] = timeit.timeit(lambda: grid_passes(observers),
+                                           number=number) / number
+    result["speedup"] = result["ephem_seconds"] / result["grid_seconds"]
+    return result
+
+
+if __name__ == "__main__":
+    print(run_benchmark(len(REGIONS)))
+    print(run_benchmark(1000))
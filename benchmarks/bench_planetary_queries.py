@@ -0,0 +1,193 @@
+'''
+Benchmarks the dashboard's planetary body query against a year of forecasts for every region
+Compares the original tables, joined at query time, with the partitioned tables and the
+materialised view from src/schema.sql
+Needs a local Postgres to seed, whose tables in the bench_before and bench_after schemas
+are replaced, e.g. BENCH_DATABASE_URL=postgresql://postgres@localhost:5432/starwatch
+Run from the top level of the project: python3 -m benchmarks.bench_planetary_queries
+'''
+import os
+import timeit
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, text, Engine
+
+from src.astronomy_utils import REGIONS
+from src.dashboard_queries import PLANETARY_BODY_QUERY, WEEK_DAYS
+
+SCHEMA_PATH = Path(__file__).parent.parent / "src" / "schema.sql"
+START = date(2025, 1, 1)
+DAYS = 365
+BODIES = ("Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter",
+          "Saturn", "Uranus", "Neptune", "Pluto")
+
+# The tables before forecasts were keyed by location, without the unique key that stopped
+# more than one location being stored
+BEFORE_SCHEMA = '''
+    CREATE TABLE constellation (
+        constellation_id INT GENERATED ALWAYS AS IDENTITY NOT NULL,
+        constellation_name TEXT NOT NULL,
+        PRIMARY KEY (constellation_id)
+    );
+    CREATE TABLE planetary_body (
+        planetary_body_id INT GENERATED ALWAYS AS IDENTITY NOT NULL,
+        planetary_body_name TEXT NOT NULL,
+        PRIMARY KEY (planetary_body_id)
+    );
+    CREATE TABLE distance (
+        distance_id INT GENERATED ALWAYS AS IDENTITY NOT NULL,
+        astronomical_units FLOAT NOT NULL,
+        planetary_body_id INT NOT NULL,
+        date TIMESTAMP NOT NULL,
+        PRIMARY KEY (distance_id),
+        FOREIGN KEY (planetary_body_id) REFERENCES planetary_body(planetary_body_id),
+        UNIQUE(date, planetary_body_id)
+    );
+    CREATE TABLE forecast (
+        forecast_id INT GENERATED ALWAYS AS IDENTITY NOT NULL,
+        date TIMESTAMP NOT NULL,
+        longitude FLOAT NOT NULL,
+        latitude FLOAT NOT NULL,
+        planetary_body_id INT NOT NULL,
+        constellation_id INT,
+        right_ascension_hours FLOAT,
+        right_ascension_string TEXT,
+        declination_degrees FLOAT,
+        declination_string TEXT,
+        altitude_degrees FLOAT,
+        altitude_string TEXT,
+        azimuth_degrees FLOAT,
+        azimuth_string TEXT,
+        PRIMARY KEY (forecast_id),
+        FOREIGN KEY (planetary_body_id) REFERENCES planetary_body(planetary_body_id),
+        FOREIGN KEY (constellation_id) REFERENCES constellation(constellation_id)
+    );
+    INSERT INTO constellation (constellation_name)
+    SELECT 'Constellation ' || n FROM generate_series(1, 88) n;
+    INSERT INTO planetary_body (planetary_body_name) VALUES
+        ('Sun'), ('Moon'), ('Mercury'), ('Venus'), ('Earth'), ('Mars'),
+        ('Jupiter'), ('Saturn'), ('Uranus'), ('Neptune'), ('Pluto');
+'''
+
+BEFORE_QUERY = text('''
+    SELECT
+        pb.planetary_body_name,
+        f.date,
+        c.constellation_name,
+        d.astronomical_units,
+        f.right_ascension_hours,
+        f.right_ascension_string,
+        f.declination_degrees,
+        f.declination_string,
+        f.altitude_degrees,
+        f.altitude_string,
+        f.azimuth_degrees,
+        f.azimuth_string
+    FROM forecast f
+    JOIN planetary_body pb
+        ON pb.planetary_body_id = f.planetary_body_id
+    JOIN distance d
+        ON d.planetary_body_id = f.planetary_body_id
+        AND d.date = f.date
+    JOIN constellation c
+        ON c.constellation_id = f.constellation_id
+    WHERE pb.planetary_body_name = :planetary_body_name
+        AND f.date BETWEEN :start_date AND :end_date
+        AND f.latitude = :latitude
+        AND f.longitude = :longitude
+    ORDER BY f.date;
+''')
+
+# A year of forecasts for every location, with made up positions
+SEED_DATA = '''
+    INSERT INTO distance (astronomical_units, planetary_body_id, date)
+    SELECT random() * 40, pb.planetary_body_id, d
+    FROM planetary_body pb
+    CROSS JOIN generate_series(%(start)s::timestamp, %(end)s::timestamp, '1 day') d;
+
+    INSERT INTO forecast (
+        date, longitude, latitude, planetary_body_id, constellation_id,
+        right_ascension_hours, right_ascension_string, declination_degrees, declination_string,
+        altitude_degrees, altitude_string, azimuth_degrees, azimuth_string
+    )
+    SELECT d, loc.longitude, loc.latitude, pb.planetary_body_id, 1 + (random() * 87)::int,
+           random() * 24, '09h 21m 00s', random() * 180 - 90, '15° 30'' 36"',
+           random() * 180 - 90, '54° 5'' 24"', random() * 360, '177° 26'' 24"'
+    FROM unnest(%(latitudes)s::float[], %(longitudes)s::float[]) AS loc(latitude, longitude)
+    CROSS JOIN planetary_body pb
+    CROSS JOIN generate_series(%(start)s::timestamp, %(end)s::timestamp, '1 day') d;
+
+    ANALYZE;
+'''
+
+
+def run_script(engine: Engine, schema: str, script: str, params: dict = None) -> None:
+    '''Runs a multi-statement script in a fresh schema, with psycopg2 rather than SQLAlchemy'''
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(f"SET search_path TO {schema};")
+        cursor.execute(script, params)
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def seed(engine: Engine, schema: str, ddl: str) -> None:
+    '''Creates the tables in a schema of their own and fills them with a year of forecasts'''
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+    run_script(engine, schema, ddl)
+
+    end = START + timedelta(days=DAYS - 1)
+    partitioned = "create_forecast_partition" in ddl
+    months = "".join(f"SELECT create_forecast_partition('{START.year}-{month:02d}-01');"
+                     for month in range(1, 13)) if partitioned else ""
+    refresh = "REFRESH MATERIALIZED VIEW planetary_body_forecast;" if partitioned else ""
+    run_script(engine, schema, months + SEED_DATA + refresh, {
+        "start": START,
+        "end": end,
+        "latitudes": [region["lat"] for region in REGIONS.values()],
+        "longitudes": [region["lon"] for region in REGIONS.values()]
+    })
+
+
+def run_queries(engine: Engine, schema: str, query) -> int:
+    '''Runs the dashboard query for every region and body over a week, returning the rows'''
+    rows = 0
+    with engine.connect() as conn:
+        conn.execute(text(f"SET search_path TO {schema}"))
+        for region in REGIONS.values():
+            for body in BODIES:
+                rows += len(conn.execute(query, {
+                    "planetary_body_name": body,
+                    "start_date": START + timedelta(days=180),
+                    "end_date": START + timedelta(days=180 + WEEK_DAYS),
+                    "latitude": region["lat"],
+                    "longitude": region["lon"]
+                }).fetchall())
+    return rows
+
+
+def run_benchmark(engine: Engine, number: int = 5) -> dict:
+    '''Seeds both schemas then times a full set of dashboard queries against each'''
+    seed(engine, "bench_before", BEFORE_SCHEMA)
+    seed(engine, "bench_after", SCHEMA_PATH.read_text(encoding="utf-8"))
+    queries = len(REGIONS) * len(BODIES)
+    result = {"locations": len(REGIONS), "days": DAYS, "queries": queries}
+
+    for name, schema, query in (("before", "bench_before", BEFORE_QUERY),
+                                ("after", "bench_after", PLANETARY_BODY_QUERY)):
+        result[f"{name}_rows"] = run_queries(engine, schema, query)
+        result[f"{name}_ms_per_query"] = timeit.timeit(
+            lambda schema=schema, query=query: run_queries(engine, schema, query),
+            number=number) / number / queries * 1000
+
+    result["speedup"] = result["before_ms_per_query"] / result["after_ms_per_query"]
+    return result
+
+
+if __name__ == "__main__":
+    print(run_benchmark(create_engine(os.environ["BENCH_DATABASE_URL"])))
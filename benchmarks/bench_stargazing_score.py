@@ -0,0 +1,85 @@
+'''
+Benchmarks the stargazing score over a week of hours for the 12 regions and 1,000 locations
+For the regions it also times scoring each cell on its own with ephem, for comparison
+Run from the top level of the project: python3 -m benchmarks.bench_stargazing_score
+'''
+import math
+import timeit
+from datetime import datetime, timezone
+
+import ephem
+import numpy as np
+
+from src.astronomy_utils import REGIONS
+from src.stargazing_score import (make_hours, compute_scores, score_grid,
+                                  BRIGHT_PLANETS, PLANET_MIN_ALTITUDE)
+
+START = datetime(2025, 1, 10, tzinfo=timezone.utc)
+
+
+def make_weather(rng: np.random.Generator, locations: int, hours: int) -> dict:
+    '''Returns random weather over the locations x hours grid'''
+    return {
+        "cloud_cover": rng.uniform(0, 100, (locations, hours)),
+        "visibility": rng.uniform(1000, 40000, (locations, hours)),
+        "relative_humidity": rng.uniform(40, 100, (locations, hours))
+    }
+
+
+def per_cell_scores(latitudes, longitudes, weather: dict, times, aurora_status: str) -> np.ndarray:
+    '''Scores each location and hour on its own, with ephem computing every position'''
+    scores = np.empty((len(latitudes), len(times)))
+    observer = ephem.Observer()
+    observer.pressure = 0
+    for i, (lat, lon) in enumerate(zip(latitudes, longitudes)):
+        observer.lat, observer.lon = str(lat), str(lon)
+        for j, when in enumerate(times):
+            observer.date = when.to_pydatetime()
+            moon = ephem.Moon(observer)
+            planets_up = sum(math.degrees(getattr(ephem, planet)(observer).alt)
+                             > PLANET_MIN_ALTITUDE for planet in BRIGHT_PLANETS)
+            scores[i, j] = score_grid(
+                weather["cloud_cover"][i, j],
+                weather["visibility"][i, j],
+                weather["relative_humidity"][i, j],
+                math.degrees(ephem.Sun(observer).alt),
+                math.degrees(moon.alt),
+                moon.moon_phase,
+                planets_up,
+                aurora_status
+            )
+    return scores
+
+
+def run_benchmark(locations: int, compare: bool = False, number: int = 3) -> dict:
+    '''Times the vectorised score for a number of locations, and the per-cell score if asked'''
+    rng = np.random.default_rng(0)
+    times = make_hours(START)
+    if locations == len(REGIONS):
+        latitudes = [region["lat"] for region in REGIONS.values()]
+        longitudes = [region["lon"] for region in REGIONS.values()]
+    else:
+        latitudes = rng.uniform(50, 59, locations)
+        longitudes = rng.uniform(-8, 2, locations)
+    weather = make_weather(rng, locations, len(times))
+
+    result = {"locations": locations, "hours": len(times)}
+    result["vectorised_seconds"] = timeit.timeit(
+        lambda: compute_scores(latitudes, longitudes, weather, times, "Amber"),
+        number=number) / number
+
+    if compare:
+        vectorised = compute_scores(latitudes, longitudes, weather, times, "Amber")
+        per_cell = per_cell_scores(latitudes, longitudes, weather, times, "Amber")
+        result["max_score_difference"] = float(np.abs(vectorised - per_cell).max())
+        result["per_cell_seconds"] = timeit.timeit(
+            lambda: per_cell_scores(latitudes, longitudes, weather, times, "Amber"),
+            number=1)
+        result["speedup"] = result["per_cell_seconds"] / result["vectorised_seconds"]
+
+    return result
+
+
+if __name__ == "__main__":
+    print(run_benchmark(len(REGIONS), compare=True))
+    print(run_benchmark(1000))
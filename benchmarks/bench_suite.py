@@ -0,0 +1,459 @@
+'''
+End-to-end benchmark suite for the astronomy pipeline, the weather transforms and the
+dashboard's reads, recorded as JSON so runs can be compared across commits
+Replays the recorded Astronomy API response in data/, scaled up to more days, bodies and
+locations, against a local Postgres or a SQLite stand-in, and reports each stage's throughput,
+latency percentiles and peak memory
+Run from the top level of the project:
+    python3 -m benchmarks.bench_suite --output results.json [--baseline previous.json]
+Without --database-url or BENCH_DATABASE_URL a SQLite file in a temporary directory is used,
+a Postgres database given has its tables replaced by src/schema.sql
+'''
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import date, datetime, timezone, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+import requests
+from sqlalchemy import text, Engine
+
+from benchmarks.bench_weather_frames import Response, NOW
+from benchmarks.sqlite_upload import upload_with_inserts
+from src.astronomy_utils import REGIONS
+from src.coordinate_format import format_hours, format_degrees
+from src.dashboard_queries import get_planetary_body_data
+from src.database import get_engine
+from src.extract_weather import process_current_data, process_hourly_data, process_daily_data
+from src.load_astronomy_data import (get_ids_from_database, add_ids_to_dataframe, convert_types,
+                                     make_forecast_dataframe, make_distance_dataframe,
+                                     upload_to_db, get_forecast_storage)
+from src.pipeline_astronomy_data import run_pipeline, transform_locations
+from src.stargazing_score import get_best_windows, HOURS_AHEAD
+from src.transform_astronomy_data import filter_data
+from src.transform_weather import (transform_current_data, transform_hourly_data,
+                                   transform_daily_data)
+from src.weather_snapshot import make_snapshot, save_snapshot, load_region_weather
+
+FIXTURE_PATH = Path(__file__).parent.parent / "data" / "astronomy_test_data.json"
+SCHEMA_PATH = Path(__file__).parent.parent / "src" / "schema.sql"
+SQLITE_SCHEMA_PATH = Path(__file__).parent / "sqlite_schema.sql"
+
+# Days, copies of every body under new names, and observer locations in each variant
+SCALES = {
+    "fixture": {"days": 2, "body_copies": 1, "locations": 1},
+    "regions_week": {"days": 7, "body_copies": 1, "locations": len(REGIONS)},
+    "regions_quarter": {"days": 90, "body_copies": 1, "locations": len(REGIONS)},
+    "many_bodies_and_locations": {"days": 7, "body_copies": 4, "locations": 120}
+}
+# The dashboard only offers the regions, so no more locations than that are read per body
+DASHBOARD_LOCATIONS = len(REGIONS)
+PERCENTILES = (50, 90, 99)
+# Growth in a stage's median latency over the baseline's that counts as a regression
+REGRESSION_THRESHOLD = 1.2
+
+
+class CurrentVariable:
+    '''Stands in for one of the current conditions in an Open-Meteo response'''
+
+    def __init__(self, value: float):
+        self.value = value
+
+    def Value(self) -> float:  # pylint:disable=invalid-name
+        '''Returns the variable's value'''
+        return self.value
+
+
+class Current:
+    '''Stands in for the current section of an Open-Meteo response'''
+
+    def __init__(self, values: np.ndarray):
+        self.variables = [CurrentVariable(value) for value in values]
+
+    def Variables(self, index: int) -> CurrentVariable:  # pylint:disable=invalid-name
+        '''Returns one variable'''
+        return self.variables[index]
+
+
+class SnapshotResponse(Response):
+    '''The weather benchmark's stand-in response, with the current conditions a snapshot stores'''
+
+    def __init__(self, rng: np.random.Generator):
+        super().__init__(rng)
+        self.current = Current(rng.uniform(0, 100, 6).astype(np.float32))
+
+    def Current(self) -> Current:  # pylint:disable=invalid-name
+        '''Returns the current section'''
+        return self.current
+
+
+def body_name(name: str, copy_number: int) -> str:
+    '''Returns the name of a copy of a body, the first copy keeping the real name'''
+    return name if copy_number == 0 else f"{name} {copy_number + 1}"
+
+
+def scale_payload(
+    fixture: dict,
+    location: Dict[str, float],
+    start: date,
+    days: int,
+    body_copies: int
+) -> dict:
+    '''
+    Returns the recorded response as if it was for another location and run of days,
+    with each body's recorded cells cycled over the days and copies of every body
+    '''
+    time_of_day = fixture['data']['table']['header'][0].partition("T")[2]
+    dates = [f"{start + timedelta(days=day)}T{time_of_day}" for day in range(days)]
+
+    rows = []
+    for copy_number in range(body_copies):
+        for row in fixture['data']['table']['rows']:
+            name = body_name(row['entry']['name'], copy_number)
+            rows.append({
+                "entry": {**row['entry'], "name": name},
+                "cells": [{**row['cells'][day % len(row['cells'])], "date": dates[day],
+                           "name": name} for day in range(days)]
+            })
+
+    return {"data": {
+        "dates": {"from": dates[0], "to": dates[-1]},
+        "observer": {"location": {"latitude": location["lat"],
+                                  "longitude": location["lon"],
+                                  "elevation": 0}},
+        "table": {"header": dates, "rows": rows}
+    }}
+
+
+class AstronomyApiReplay:
+    '''
+    Answers the pipeline's Astronomy API requests with the scaled recorded response
+    Responses are encoded once for each request, so replays after the first only cost parsing
+    '''
+
+    def __init__(self, fixture: dict, body_copies: int):
+        self.fixture = fixture
+        self.body_copies = body_copies
+        self.encoded = {}
+        self.cells = 0
+        self.lock = threading.Lock()
+
+    def get(self, url: str, **_) -> requests.Response:
+        '''Returns the response to a positions request, in place of requests.Session.get'''
+        query = parse_qs(urlparse(url).query)
+        start = date.fromisoformat(query["from_date"][0])
+        days = (date.fromisoformat(query["to_date"][0]) - start).days + 1
+
+        key = (query["latitude"][0], query["longitude"][0], start, days)
+        if key not in self.encoded:
+            self.encoded[key] = json.dumps(scale_payload(
+                self.fixture,
+                {"lat": float(query["latitude"][0]), "lon": float(query["longitude"][0])},
+                start, days, self.body_copies)).encode("utf-8")
+
+        with self.lock:
+            self.cells += days * len(self.fixture['data']['table']['rows']) * self.body_copies
+
+        # The pipeline streams the body from raw rather than reading the content
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(self.encoded[key])
+        return response
+
+
+def make_locations(count: int) -> Dict[str, Dict[str, float]]:
+    '''Returns the first regions, or random locations across the UK if there are more'''
+    if count <= len(REGIONS):
+        return dict(list(REGIONS.items())[:count])
+    rng = np.random.default_rng(0)
+    return {f"Location {i}": {"lat": round(float(lat), 2), "lon": round(float(lon), 2)}
+            for i, (lat, lon) in enumerate(zip(rng.uniform(50, 58.5, count),
+                                               rng.uniform(-6, 1.7, count)))}
+
+
+def create_tables(engine: Engine) -> None:
+    '''Replaces the tables with src/schema.sql on Postgres, or with the SQLite stand-in's'''
+    connection = engine.raw_connection()
+    try:
+        if engine.dialect.name == "sqlite":
+            connection.driver_connection.executescript(
+                SQLITE_SCHEMA_PATH.read_text(encoding="utf-8"))
+        else:
+            connection.cursor().execute(SCHEMA_PATH.read_text(encoding="utf-8"))
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def add_missing_names(engine: Engine, table_name: str, column: str, names: List[str]) -> None:
+    '''Inserts any of the names a lookup table doesn't have yet, e.g. copies of the bodies'''
+    with engine.begin() as conn:
+        existing = set(conn.execute(text(f"SELECT {column} FROM {table_name}")).scalars())
+        missing = [{"name": name} for name in dict.fromkeys(names) if name not in existing]
+        if missing:
+            conn.execute(text(f"INSERT INTO {table_name} ({column}) VALUES (:name)"), missing)
+
+
+def clear_forecasts(engine: Engine) -> None:
+    '''Empties the forecast and distance tables, so the pipeline fetches a full week again'''
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM forecast"))
+        conn.execute(text("DELETE FROM distance"))
+
+
+def run_stage(
+    calls: List[Callable[[], int]],
+    repeats: int,
+    setup: Callable[[], None] = None
+) -> dict:
+    '''
+    Runs every call once to warm up and once traced for peak memory, then times each call
+    over the repeats, with the setup run untimed before each pass
+    Each call returns the number of items it handled, e.g. rows or requests
+    Returns the stage's throughput, latency percentiles in ms and peak memory in MB
+    '''
+    def run_pass() -> None:
+        if setup is not None:
+            setup()
+        for call in calls:
+            call()
+
+    run_pass()
+    tracemalloc.start()
+    run_pass()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies, items = [], 0
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        for call in calls:
+            start = time.perf_counter()
+            items += call()
+            latencies.append(time.perf_counter() - start)
+
+    latencies_ms = np.array(latencies) * 1000
+    seconds = float(np.sum(latencies))
+    return {
+        "calls": len(latencies),
+        "items": items,
+        "seconds": seconds,
+        "items_per_second": items / seconds,
+        "latency_ms": {**{f"p{percentile}": float(np.percentile(latencies_ms, percentile))
+                          for percentile in PERCENTILES},
+                       "max": float(latencies_ms.max())},
+        "peak_memory_mb": peak_memory / 2 ** 20
+    }
+
+
+def transform_weather(response: SnapshotResponse) -> int:
+    '''Transforms one response into the dashboard's weather frames as the weather page does'''
+    transform_current_data(process_current_data(response))
+    transform_hourly_data(process_hourly_data(response, now=NOW))
+    transform_daily_data(process_daily_data(response))
+    return 1
+
+
+def save_weather(engine: Engine, responses: Dict[str, SnapshotResponse]) -> int:
+    '''Stores every region's weather as the snapshot job does, returning the region count'''
+    save_snapshot(engine, make_snapshot(responses, fetched_at=NOW))
+    return len(responses)
+
+
+def read_region_weather(engine: Engine, region_name: str) -> int:
+    '''Reads one region's stored weather and transforms it as the dashboard does'''
+    current, hourly, daily = load_region_weather(engine, region_name, now=NOW)
+    transform_current_data(current)
+    transform_hourly_data(hourly)
+    transform_daily_data(daily)
+    return 1
+
+
+def read_planetary_body(engine: Engine, name: str, location: Dict[str, float],
+                        start: date) -> int:
+    '''Reads a body's week from one location and formats its coordinates as the dashboard does'''
+    data = get_planetary_body_data(engine, name, location["lat"], location["lon"],
+                                   start_date=start)
+    format_hours(data["right_ascension_hours"])
+    for column in ("declination_degrees", "altitude_degrees", "azimuth_degrees"):
+        format_degrees(data[column])
+    return len(data)
+
+
+def score_windows(engine: Engine, locations: Dict[str, Dict[str, float]]) -> int:
+    '''
+    Finds the best stargazing windows as the dashboard does, returning the region hours scored
+    The random weather may leave no window worth showing, so the windows aren't counted
+    '''
+    get_best_windows(engine, locations, start=NOW)
+    return len(locations) * HOURS_AHEAD
+
+
+def benchmark_scale(engine: Engine, fixture: dict, scale: dict, repeats: int,
+                    upload: Callable = upload_to_db) -> dict:
+    '''
+    Runs every stage on one scaled-up variant of the recorded response
+    Forecasts are loaded with upload, which the pipeline uses too while the stages run
+    '''
+    locations = make_locations(scale["locations"])
+    start = date.today()
+    payloads = [scale_payload(fixture, location, start, scale["days"], scale["body_copies"])
+                for location in locations.values()]
+    body_names = [row['entry']['name'] for row in payloads[0]['data']['table']['rows']]
+    add_missing_names(engine, "planetary_body", "planetary_body_name", body_names)
+    add_missing_names(engine, "constellation", "constellation_name", [
+        cell['position']['constellation']['name']
+        for row in fixture['data']['table']['rows'] for cell in row['cells']])
+
+    stages = {}
+    stages["transform_filter_data"] = run_stage(
+        [lambda payload=payload: len(filter_data(payload)) for payload in payloads], repeats)
+    stages["transform_locations"] = run_stage(
+        [lambda: len(transform_locations(payloads))], repeats)
+
+    # The load is timed on its own, from data prepared like the pipeline's main
+    data = transform_locations(payloads)
+    data = convert_types(add_ids_to_dataframe(data, *get_ids_from_database(engine)))
+    forecast_df, distance_df = make_forecast_dataframe(data), make_distance_dataframe(data)
+    stages["load_upload_to_db"] = run_stage(
+        [lambda: sum(table["rows"] for table in
+                     upload(forecast_df, distance_df, engine).values())], repeats)
+
+    replay = AstronomyApiReplay(fixture, scale["body_copies"])
+
+    def replay_pipeline() -> int:
+        cells = replay.cells
+        run_pipeline(list(locations.values()))
+        return replay.cells - cells
+
+    with patch.object(requests.Session, "get", new=replay.get), \
+            patch("src.load_astronomy_data.upload_to_db", new=upload):
+        stages["pipeline_run_pipeline"] = run_stage(
+            [replay_pipeline], repeats, setup=lambda: clear_forecasts(engine))
+
+    # The pipeline leaves today's week loaded for every location, which the dashboard reads
+    stages["dashboard_planetary_body_data"] = run_stage(
+        [lambda name=name, location=location: read_planetary_body(engine, name, location, start)
+         for location in list(locations.values())[:DASHBOARD_LOCATIONS]
+         for name in body_names], repeats)
+
+    rng = np.random.default_rng(0)
+    responses = {name: SnapshotResponse(rng) for name in locations}
+    stages["weather_transforms"] = run_stage(
+        [lambda response=response: transform_weather(response)
+         for response in responses.values()], repeats)
+    stages["weather_snapshot_save"] = run_stage(
+        [lambda: save_weather(engine, responses)], repeats)
+    stages["dashboard_region_weather"] = run_stage(
+        [lambda name=name: read_region_weather(engine, name) for name in locations], repeats)
+    stages["dashboard_best_windows"] = run_stage(
+        [lambda: score_windows(engine, locations)], repeats)
+
+    return {**scale, "rows": len(data), "stages": stages}
+
+
+def get_commit() -> str | None:
+    '''Returns the commit being benchmarked, or None outside a git checkout'''
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(database_url: str, scales: List[str], repeats: int) -> dict:
+    '''Creates the tables then benchmarks every scale, returning the results'''
+    # The pipeline finds its database through get_engine, so it is pointed there too
+    os.environ["DATABASE_URL"] = database_url
+    engine = get_engine()
+    create_tables(engine)
+
+    with open(FIXTURE_PATH, encoding="utf-8") as fixture_file:
+        fixture = json.load(fixture_file)
+    # SQLite has no COPY, partitions or materialised views, so loads use plain upserts
+    upload = upload_with_inserts if engine.dialect.name == "sqlite" else upload_to_db
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "database": engine.dialect.name,
+        "forecast_storage": get_forecast_storage(),
+        "repeats": repeats,
+        "scales": {name: benchmark_scale(engine, fixture, SCALES[name], repeats, upload)
+                   for name in scales}
+    }
+
+
+def compare_results(baseline: dict, results: dict,
+                    threshold: float = REGRESSION_THRESHOLD) -> List[dict]:
+    '''Returns the stages whose median latency grew by more than the threshold over a baseline'''
+    regressions = []
+    for scale_name, scale in results["scales"].items():
+        for stage_name, stage in scale["stages"].items():
+            before = baseline["scales"].get(scale_name, {}).get("stages", {}).get(stage_name)
+            if before is None:
+                continue
+            ratio = stage["latency_ms"]["p50"] / before["latency_ms"]["p50"]
+            if ratio > threshold:
+                regressions.append({"scale": scale_name, "stage": stage_name,
+                                    "p50_ratio": ratio,
+                                    "baseline_commit": baseline.get("commit")})
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    '''Returns the command line options'''
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"),
+                        help="local Postgres to run against, a temporary SQLite file if unset")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=list(SCALES))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="file to write the results to, printed if unset")
+    parser.add_argument("--baseline", help="results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    return parser.parse_args()
+
+
+def main() -> int:
+    '''Runs the suite from the command line, returning 1 if any stage regressed'''
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run_suite(args.database_url or f"sqlite:///{directory}/starwatch.db",
+                            args.scales, args.repeats)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            results["regressions"] = compare_results(json.load(baseline_file), results,
+                                                     args.threshold)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+
+    return 1 if results.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(message)s")
+    sys.exit(main())
@@ -0,0 +1,50 @@
+'''
+Benchmarks filter_data against filter_data_columnar on scaled-up API responses
+Run from the top level of the project: python3 -m benchmarks.bench_transform_astronomy
+'''
+import copy
+import json
+import timeit
+
+import pandas as pd
+
+from src.transform_astronomy_data import filter_data, filter_data_columnar
+
+FIXTURE_PATH = "data/astronomy_test_data.json"
+
+
+def scale_response(json_data: dict, repeats: int) -> dict:
+    '''Returns a copy of an API response with every body's cells repeated'''
+    scaled = copy.deepcopy(json_data)
+    for planetary_body in scaled['data']['table']['rows']:
+        planetary_body['cells'] = planetary_body['cells'] * repeats
+    return scaled
+
+
+def run_benchmark(repeats: int, number: int = 5) -> dict:
+    '''Times both transforms on one scaled response, checking they agree first'''
+    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
+        json_data = scale_response(json.load(f), repeats)
+
+    expected = filter_data(json_data)
+    result = filter_data_columnar(json_data)
+    pd.testing.assert_frame_equal(expected, result.astype({
+        "planetary_body": expected.dtypes["planetary_body"],
+        "constellation": expected.dtypes["constellation"]
+    }))
+
+    row_seconds = timeit.timeit(lambda: filter_data(json_data), number=number) / number
+    columnar_seconds = timeit.timeit(
+        lambda: filter_data_columnar(json_data), number=number) / number
+
+    return {
+        "cells": len(expected),
+        "filter_data_seconds": row_seconds,
+        "filter_data_columnar_seconds": columnar_seconds,
+        "speedup": row_seconds / columnar_seconds
+    }
+
+
+if __name__ == "__main__":
+    for scale in (50, 500, 5000):
+        print(run_benchmark(scale))
@@ -0,0 +1,157 @@
+'''
+Benchmarks building the hourly and daily weather display frames from many API responses
+Compares the original full-frame, per-row approach with the sliced, vectorised one
+Run from the top level of the project: python3 -m benchmarks.bench_weather_frames
+'''
+import timeit
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from src.extract_weather import (process_hourly_data, process_daily_data,
+                                 convert_unix_timestamp, HOURLY_VARIABLES, DAILY_VARIABLES)
+from src.transform_weather import transform_hourly_data, transform_daily_data
+
+START = datetime(2025, 8, 1, tzinfo=timezone.utc)
+NOW = START + timedelta(hours=30)
+
+
+class Variable:
+    '''Stands in for an Open-Meteo FlatBuffers variable'''
+
+    def __init__(self, values: np.ndarray):
+        self.values = values
+
+    def ValuesAsNumpy(self) -> np.ndarray:  # pylint:disable=invalid-name
+        '''Returns the variable's values'''
+        return self.values
+
+    def ValuesInt64AsNumpy(self) -> np.ndarray:  # pylint:disable=invalid-name
+        '''Returns the variable's values as integers'''
+        return self.values
+
+
+class Series:
+    '''Stands in for the hourly or daily section of an Open-Meteo response'''
+
+    def __init__(self, interval: int, variables: list[np.ndarray]):
+        self.interval = interval
+        self.variables = [Variable(values) for values in variables]
+
+    def Time(self) -> int:  # pylint:disable=invalid-name
+        '''Returns the first timestamp'''
+        return int(START.timestamp())
+
+    def TimeEnd(self) -> int:  # pylint:disable=invalid-name
+        '''Returns the timestamp after the last value'''
+        return int((START + timedelta(days=7)).timestamp())
+
+    def Interval(self) -> int:  # pylint:disable=invalid-name
+        '''Returns the seconds between values'''
+        return self.interval
+
+    def Variables(self, index: int) -> Variable:  # pylint:disable=invalid-name
+        '''Returns one variable'''
+        return self.variables[index]
+
+
+class Response:
+    '''Stands in for an Open-Meteo response with a week of random float32 forecasts'''
+
+    def __init__(self, rng: np.random.Generator):
+        self.hourly = Series(3600, [rng.uniform(0, 20000, 168).astype(np.float32)
+                                    for _ in range(9)])
+        sun = int(START.timestamp()) + 86400 * np.arange(7, dtype=np.int64)
+        self.daily = Series(86400, [sun + 18000, sun + 72000]
+                            + [rng.uniform(0, 40, 7).astype(np.float32) for _ in range(4)])
+
+    def Hourly(self) -> Series:  # pylint:disable=invalid-name
+        '''Returns the hourly section'''
+        return self.hourly
+
+    def Daily(self) -> Series:  # pylint:disable=invalid-name
+        '''Returns the daily section'''
+        return self.daily
+
+
+def make_date_range(series: Series) -> pd.DatetimeIndex:
+    '''Returns the timestamps of a section'''
+    return pd.date_range(
+        start=pd.to_datetime(series.Time(), unit="s", utc=True),
+        end=pd.to_datetime(series.TimeEnd(), unit="s", utc=True),
+        freq=pd.Timedelta(seconds=series.Interval()),
+        inclusive="left"
+    )
+
+
+def original_frames(response: Response, hour: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    '''The original approach: a full week of hours sliced afterwards, per-row conversions'''
+    hourly = response.Hourly()
+    hourly_data = {"Date": make_date_range(hourly)}
+    for column, index in HOURLY_VARIABLES.items():
+        hourly_data[column] = hourly.Variables(index).ValuesAsNumpy()
+    hourly_df = pd.DataFrame(data=hourly_data).iloc[hour:hour + 24]
+
+    hourly_df["Temperature (°C)"] = hourly_df["Temperature (°C)"].astype(float).round(1)
+    hourly_df["Wind Speed (km/h)"] = hourly_df["Wind Speed (km/h)"].astype(float).round(1)
+    hourly_df["Wind Gusts (km/h)"] = hourly_df["Wind Gusts (km/h)"].astype(float).round(1)
+    hourly_df["Relative Humidity (%)"] = hourly_df["Relative Humidity (%)"].astype(int)
+    hourly_df["Cloud Cover (%)"] = hourly_df["Cloud Cover (%)"].astype(int)
+    hourly_df["Visibility (km)"] = (hourly_df["Visibility (m)"] / 1000).astype(float).round(1)
+    hourly_df = hourly_df[["Date", "Temperature (°C)", "Relative Humidity (%)",
+                           "Wind Speed (km/h)", "Wind Gusts (km/h)",
+                           "Visibility (km)", "Cloud Cover (%)"]]
+
+    daily = response.Daily()
+    daily_data = {"Date": make_date_range(daily),
+                  "Sunrise": daily.Variables(0).ValuesInt64AsNumpy(),
+                  "Sunset": daily.Variables(1).ValuesInt64AsNumpy()}
+    for column, index in DAILY_VARIABLES.items():
+        daily_data[column] = daily.Variables(index).ValuesAsNumpy()
+    daily_df = pd.DataFrame(data=daily_data)
+    daily_df["Sunrise"] = daily_df["Sunrise"].apply(convert_unix_timestamp)
+    daily_df["Sunset"] = daily_df["Sunset"].apply(convert_unix_timestamp)
+
+    daily_df["Date"] = pd.to_datetime(daily_df["Date"]).dt.date
+    daily_df["Sunrise"] = pd.to_datetime(daily_df["Sunrise"]).dt.strftime("%H:%M")
+    daily_df["Sunset"] = pd.to_datetime(daily_df["Sunset"]).dt.strftime("%H:%M")
+    for column in DAILY_VARIABLES:
+        daily_df[column] = daily_df[column].astype(float).round(1)
+
+    return hourly_df, daily_df
+
+
+def vectorised_frames(response: Response) -> tuple[pd.DataFrame, pd.DataFrame]:
+    '''The current approach: sliced before the frame is built, vectorised conversions'''
+    return (transform_hourly_data(process_hourly_data(response, now=NOW)),
+            transform_daily_data(process_daily_data(response)))
+
+
+def run_benchmark(responses: int, number: int = 3) -> dict:
+    '''Times both approaches over many responses, checking they agree first'''
+    rng = np.random.default_rng(0)
+    batch = [Response(rng) for _ in range(responses)]
+
+    expected_hourly, expected_daily = original_frames(batch[0], 30)
+    hourly, daily = vectorised_frames(batch[0])
+    pd.testing.assert_frame_equal(expected_hourly.reset_index(drop=True), hourly,
+                                  check_dtype=False)
+    pd.testing.assert_frame_equal(expected_daily, daily, check_dtype=False)
+
+    original_seconds = timeit.timeit(
+        lambda: [original_frames(response, 30) for response in batch], number=number) / number
+    vectorised_seconds = timeit.timeit(
+        lambda: [vectorised_frames(response) for response in batch], number=number) / number
+
+    return {
+        "responses": responses,
+        "original_seconds": original_seconds,
+        "vectorised_seconds": vectorised_seconds,
+        "speedup": original_seconds / vectorised_seconds
+    }
+
+
+if __name__ == "__main__":
+    for count in (12, 120, 1200):
+        print(run_benchmark(count))
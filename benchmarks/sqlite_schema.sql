@@ -0,0 +1,104 @@
+-- SQLite stand-in for the tables in src/schema.sql that the benchmark suite reads and writes
+-- Forecasts aren't partitioned and the dashboard's view is an ordinary one, which SQLite
+-- keeps up to date itself, so the pipeline has nothing to refresh
+DROP VIEW IF EXISTS planetary_body_forecast;
+DROP TABLE IF EXISTS forecast;
+DROP TABLE IF EXISTS distance;
+DROP TABLE IF EXISTS planetary_body;
+DROP TABLE IF EXISTS constellation;
+DROP TABLE IF EXISTS weather_current;
+DROP TABLE IF EXISTS weather_hourly;
+DROP TABLE IF EXISTS weather_daily;
+
+CREATE TABLE constellation (
+    constellation_id INTEGER PRIMARY KEY,
+    constellation_name TEXT NOT NULL
+);
+
+CREATE TABLE planetary_body (
+    planetary_body_id INTEGER PRIMARY KEY,
+    planetary_body_name TEXT NOT NULL
+);
+
+CREATE TABLE distance (
+    distance_id INTEGER PRIMARY KEY,
+    astronomical_units FLOAT NOT NULL,
+    planetary_body_id INT NOT NULL REFERENCES planetary_body(planetary_body_id),
+    date TIMESTAMP NOT NULL,
+    UNIQUE(planetary_body_id, date)
+);
+
+CREATE TABLE forecast (
+    forecast_id INTEGER PRIMARY KEY,
+    date TIMESTAMP NOT NULL,
+    longitude FLOAT NOT NULL,
+    latitude FLOAT NOT NULL,
+    planetary_body_id INT NOT NULL REFERENCES planetary_body(planetary_body_id),
+    constellation_id INT REFERENCES constellation(constellation_id),
+    right_ascension_hours REAL,
+    right_ascension_string TEXT,
+    declination_degrees REAL,
+    declination_string TEXT,
+    altitude_degrees REAL,
+    altitude_string TEXT,
+    azimuth_degrees REAL,
+    azimuth_string TEXT,
+    UNIQUE(planetary_body_id, latitude, longitude, date)
+);
+
+CREATE VIEW planetary_body_forecast AS
+SELECT
+    pb.planetary_body_name,
+    f.latitude,
+    f.longitude,
+    f.date,
+    c.constellation_name,
+    d.astronomical_units,
+    f.right_ascension_hours,
+    f.declination_degrees,
+    f.altitude_degrees,
+    f.azimuth_degrees
+FROM forecast f
+JOIN planetary_body pb
+    ON pb.planetary_body_id = f.planetary_body_id
+JOIN distance d
+    ON d.planetary_body_id = f.planetary_body_id
+    AND d.date = f.date
+JOIN constellation c
+    ON c.constellation_id = f.constellation_id;
+
+CREATE TABLE weather_current (
+    region_name TEXT NOT NULL PRIMARY KEY,
+    fetched_at TIMESTAMP NOT NULL,
+    temperature REAL,
+    relative_humidity REAL,
+    wind_speed REAL,
+    wind_gusts REAL,
+    precipitation REAL,
+    cloud_cover REAL
+);
+
+CREATE TABLE weather_hourly (
+    region_name TEXT NOT NULL,
+    forecast_time TIMESTAMP NOT NULL,
+    temperature REAL,
+    relative_humidity REAL,
+    precipitation REAL,
+    wind_speed REAL,
+    wind_gusts REAL,
+    visibility REAL,
+    cloud_cover REAL,
+    PRIMARY KEY (region_name, forecast_time)
+);
+
+CREATE TABLE weather_daily (
+    region_name TEXT NOT NULL,
+    date DATE NOT NULL,
+    sunrise TIMESTAMP,
+    sunset TIMESTAMP,
+    max_wind_speed REAL,
+    max_wind_gusts REAL,
+    max_temperature REAL,
+    min_temperature REAL,
+    PRIMARY KEY (region_name, date)
+);
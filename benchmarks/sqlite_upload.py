@@ -0,0 +1,63 @@
+'''
+Loads forecasts into the SQLite stand-in the benchmark suite runs against without a Postgres
+SQLite has no COPY, partitions or materialised views, so upload_to_db is swapped for
+upload_with_inserts, which upserts the same rows with ordinary batched inserts
+'''
+import logging
+import time
+from typing import Dict, List
+
+import pandas as pd
+from sqlalchemy import text, Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.load_astronomy_data import CONFLICT_KEYS
+
+
+def upsert_rows(conn, data: pd.DataFrame, table_name: str, key: List[str]) -> int:
+    '''
+    Upserts a dataframe with one batched INSERT ... ON CONFLICT through SQLAlchemy
+    Rows sharing a key are collapsed to the last one, like bulk_upsert does
+    Returns the number of rows inserted or updated
+    '''
+    data = data.drop_duplicates(subset=key, keep='last')
+    columns = ", ".join(data.columns)
+    values = ", ".join(f":{col}" for col in data.columns)
+    updates = ", ".join(f"{col} = EXCLUDED.{col}"
+                        for col in data.columns if col not in key)
+
+    # Missing values are stored as NULL rather than NaN
+    records = data.astype(object).where(data.notna(), None).to_dict('records')
+    conn.execute(text(f"""
+        INSERT INTO {table_name} ({columns}) VALUES ({values})
+        ON CONFLICT ({", ".join(key)}) DO UPDATE SET {updates};
+    """), records)
+    return len(records)
+
+
+def upload_with_inserts(
+        forecast_df: pd.DataFrame,
+        distance_df: pd.DataFrame,
+        engine: Engine
+) -> Dict[str, Dict[str, float]]:
+    '''
+    Loads the forecast and distance dataframes into a SQLite database in a single transaction
+    There are no partitions or materialised view to maintain, the view is an ordinary one
+    Returns the row count and time taken for each table, like upload_to_db
+    '''
+    stats = {}
+    try:
+        with engine.begin() as conn:
+            for table_name, data in (("forecast", forecast_df), ("distance", distance_df)):
+                start = time.perf_counter()
+                rows = upsert_rows(conn, data, table_name, CONFLICT_KEYS[table_name])
+                stats[table_name] = {
+                    "rows": rows,
+                    "seconds": time.perf_counter() - start
+                }
+
+    except SQLAlchemyError as e:
+        logging.error('[ERROR] Could Not Insert Into Database: %s', e)
+        raise RuntimeError(f"Database load failed: {e}") from e
+
+    return stats
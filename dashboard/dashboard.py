@@ -2,107 +2,65 @@
 
 # pylint:disable=import-error
 import os
+from concurrent.futures import Future, as_completed, TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta, date
+from typing import Any, Callable
 
 import streamlit as st
 import pandas as pd
-from sqlalchemy import create_engine, text, Engine
+import numpy as np
+import requests
+from sqlalchemy import Engine
 from dotenv import load_dotenv
 
-import openmeteo_requests
-from openmeteo_sdk.WeatherApiResponse import WeatherApiResponse
-
-
-from src.extract_weather import (get_client, get_response,
-                                 process_current_data, process_hourly_data,
-                                 process_daily_data)
 from src.transform_weather import (transform_current_data, transform_hourly_data,
                                    transform_daily_data)
 
 import src.astronomy_utils
-from src.moon_phase_extract import get_moon_phase_image
-
+from src.coordinate_format import format_hours, format_degrees
+from src.database import get_engine
+from src.dashboard_data import (fetch_apod, fetch_apod_image, fetch_apod_history,
+                                fetch_neos, fetch_aurora_activity,
+                                fetch_iss_position, fetch_iss_ground_track, fetch_iss_passes,
+                                fetch_moon_phase_image, fetch_region_weather,
+                                fetch_planetary_body_data, fetch_best_windows,
+                                SECTION_EXECUTOR)
 
-from src.aurora_etl import extract_activity_data, find_most_recent_status_info
 
-from src.extract_nasa import get_image_details, get_neos
+from src.aurora_etl import (find_most_recent_status_info, STATUS_DESCRIPTIONS,
+                            STATUS_LIKELIHOODS)
 
-from src.iss_etl import get_iss_lat_long_now, get_passes, present_iss_passes
+from src.iss_etl import present_iss_passes
 
-AURORA_ACTIVITY_URL = "http://aurorawatch-api.lancs.ac.uk/0.2.5/status/project/awn/sum-activity.xml"
 
 APOD_URL = "https://api.nasa.gov/planetary/apod"
 
-NEO_URL = "https://api.nasa.gov/neo/rest/v1/feed"
-
 API_KEY = os.environ.get("API_KEY")
 
 TODAY = str(date.today())
 
+# Seconds to wait for a section's data before showing its fallback message
+SECTION_TIMEOUT = 20
+
 
 def create_regions_dataframe() -> pd.DataFrame:
     """Returns dataframe containing lat/long pairs for all regions of the UK"""
 
-    # lat/long pairs snatched from Wikipedia
     regions = {
-        "region_name": [
-            "Cymru Wales",
-            "East Midlands",
-            "East of England",
-            "London",
-            "North East & Cumbria",
-            "North West",
-            "Northern Ireland",
-            "Scotland",
-            "South East",
-            "South West",
-            "West Midlands",
-            "Yorkshire & the Humber"
-        ],
-        "latitude": [
-            +51.29,  # Wales (actually Cardiff)
-            +52.98,  # East Midlands
-            +52.24,  # East of England
-            +51.30,  # London (actually City of London)
-            +55.00,  # North East & Cumbria
-            +54.04,  # North West
-            +54.60,  # Northern Ireland (actually Belfast)
-            +55.57,  # Scotland (actually Edinburgh)
-            +51.30,  # South East
-            +50.96,  # South West
-            +52.28,  # West Midlands
-            +53.34  # Yorkshire & the Humber
-        ],
-        "longitude": [
-            -03.11,  # Wales (actually Cardiff)
-            -00.75,  # East Midlands
-            +00.41,  # East of England
-            -00.05,  # London (actually City of London)
-            -01.87,  # North East & Cumbria
-            -02.45,  # North West
-            -05.93,  # Northern Ireland (actually Belfast)
-            -03.11,  # Scotland (actually Edinburgh)
-            -00.80,  # South East
-            -03.22,  # South West
-            -02.15,  # West Midlands
-            -01.12  # Yorkshire & the Humber
-        ]
+        "region_name": list(src.astronomy_utils.REGIONS),
+        "latitude": [coordinates["lat"]
+                     for coordinates in src.astronomy_utils.REGIONS.values()],
+        "longitude": [coordinates["lon"]
+                      for coordinates in src.astronomy_utils.REGIONS.values()]
     }
     return pd.DataFrame(data=regions)
 
 
-def create_response_for_region(region_name: str, regions: pd.DataFrame,
-                               weather_client: openmeteo_requests.Client) -> WeatherApiResponse:
-    """Returns Ocean-Meteo API response, provided with a region name, a region dataframe (containing
-    latitude and longitude pairs for each region), and an Open-Meteo requests client.
-    """
+def get_region_coordinates(regions: pd.DataFrame, region_name: str) -> tuple[float, float]:
+    """Returns the latitude and longitude of a region from the regions dataframe"""
 
     region_lat_long = regions[regions["region_name"] == region_name]
-    region_latitude = region_lat_long["latitude"].values[0]
-    region_longitude = region_lat_long["longitude"].values[0]
-
-    return get_response(
-        latitude=region_latitude, longitude=region_longitude, client=weather_client)
+    return region_lat_long["latitude"].values[0], region_lat_long["longitude"].values[0]
 
 
 def display_current_weather_metrics(current_data: tuple[str], daily_data: pd.DataFrame) -> None:
@@ -176,18 +134,11 @@ def display_daily_graphs(daily_data: pd.DataFrame) -> None:
                          y="Sunset")
 
 
-def weather_section(regions_df: pd.DataFrame, region_option: str) -> None:
-    """Weather section of the dashboard, with selectable region"""""
+def weather_section(region_weather: tuple[tuple[float], pd.DataFrame, pd.DataFrame]) -> None:
+    """Weather section of the dashboard, for the selected region's stored weather"""
 
-    # Cache weather data for 15 minutes
-    weather_client = get_client(cache_expiry=900)
-    weather_response = create_response_for_region(
-        region_option, regions_df, weather_client)
-
-    # Extract and transform data
-    extract_current_weather = process_current_data(weather_response)
-    extract_hourly_weather = process_hourly_data(weather_response)
-    extract_daily_weather = process_daily_data(weather_response)
+    # Transform the current, hourly and daily data read from the weather snapshot
+    extract_current_weather, extract_hourly_weather, extract_daily_weather = region_weather
 
     transform_current_weather = transform_current_data(extract_current_weather)
     transform_hourly_weather = transform_hourly_data(extract_hourly_weather)
@@ -204,14 +155,10 @@ def weather_section(regions_df: pd.DataFrame, region_option: str) -> None:
     display_daily_graphs(transform_daily_weather)
 
 
-def display_moon_phase_data(regions_df: pd.DataFrame, region_option: str) -> None:
-    """Displays the moon phase for a selected region"""
+def display_moon_phase_data(moon_phase_image: bytes | np.ndarray, region_option: str) -> None:
+    """Displays the moon phase image for a selected region"""
 
     st.subheader("Moon Phase :full_moon:", divider="blue")
-    # Gets the lat/lon of the selected region
-    region_lat_long = regions_df[regions_df["region_name"] == region_option]
-    latitude = region_lat_long["latitude"].values[0]
-    longitude = region_lat_long["longitude"].values[0]
 
     col1, col2 = st.columns([1, 2])
 
@@ -219,101 +166,34 @@ def display_moon_phase_data(regions_df: pd.DataFrame, region_option: str) -> Non
         st.markdown(f"**Region:** {region_option}")
         st.markdown(f"**Date:** {datetime.now().date()}")
 
-    moon_phase_url = "https://api.astronomyapi.com/api/v2/studio/moon-phase"
-
-    # Runs the moon phase API call and returns image
     with col2:
-        st.image(
-            get_moon_phase_image(
-                latitude,
-                longitude,
-                str(datetime.now().date()),
-                src.astronomy_utils.make_request_headers(),
-                moon_phase_url
-            )
-        )
+        st.image(moon_phase_image)
 
 
 def get_db_connection() -> Engine:
-    """Establish and returns connection to DB"""
+    """Returns the process-wide pooled engine, shared by every session and rerun"""
     load_dotenv()
-    db_username = os.getenv("db_username")
-    db_password = os.getenv("db_password")
-    db_name = os.getenv("db_name")
-    db_port = os.getenv("db_port")
-    db_host = os.getenv("db_host")
-
-    # String concatenation for connection url
-    url = (
-        f"postgresql+psycopg2://{db_username}:{db_password}"
-        + f"@{db_host}:{db_port}/{db_name}"
-    )
-    return create_engine(url)
-
-
-def get_rds_data(engine: Engine, table_name: str) -> pd.DataFrame:
-    """Connects to RDS database and returns data corresponding to the table name
-    entered.
-    """
-    with engine.connect() as conn:
-        rds_data = conn.execute(
-            text(f"SELECT * FROM {table_name}")).fetchall()
-    return rds_data
-
-
-def get_all_data(engine: Engine) -> pd.DataFrame:
-    """Returns all relevant data from the database to be displayed in the dashboard"""
-
-    # Query database to select all data from each table
-    distance_df = pd.DataFrame(get_rds_data(engine, "distance"))
-    planetary_body_df = pd.DataFrame(get_rds_data(engine, "planetary_body"))
-    forecast_df = pd.DataFrame(get_rds_data(engine, "forecast"))
-    constellation_df = pd.DataFrame(get_rds_data(engine, "constellation"))
-
-    # Merge table
-    distance_pb = pd.merge(
-        distance_df, planetary_body_df, on="planetary_body_id")
-    distance_pb_forecast = pd.merge(
-        distance_pb, forecast_df, on=["planetary_body_id", "date"])
-    all_data = pd.merge(distance_pb_forecast,
-                        constellation_df, on="constellation_id")
-
-    relevant_data = all_data[["planetary_body_name",
-                              "date",
-                              "constellation_name",
-                              "astronomical_units",
-                              "right_ascension_hours",
-                              "right_ascension_string",
-                              "declination_degrees",
-                              "declination_string",
-                              "altitude_degrees",
-                              "altitude_string",
-                              "azimuth_degrees",
-                              "azimuth_string"
-                              ]
-                             ]
-
-    return relevant_data
+    return get_engine()
 
 
 def format_coordinate_data(planetary_body_data: pd.DataFrame, coordinate_type: str) -> pd.DataFrame:
     """Transforms dataframe in an ideal format to display on the dashboard"""
 
-    # Extract relevant information and rename columns for equatorial data
+    # Format the stored equatorial coordinates as the API's strings
     if coordinate_type == "equatorial":
-        relevant_data = planetary_body_data[[
-            "date", "right_ascension_string", "declination_string"]]
-        relevant_data = relevant_data.copy()
-        relevant_data.rename(columns={"right_ascension_string": "Right Ascension",
-                                      "declination_string": "Declination"}, inplace=True)
+        relevant_data = pd.DataFrame({
+            "date": planetary_body_data["date"],
+            "Right Ascension": format_hours(planetary_body_data["right_ascension_hours"]),
+            "Declination": format_degrees(planetary_body_data["declination_degrees"])
+        })
 
-    # Extract relevant information and rename columns for horizontal data
+    # Format the stored horizontal coordinates as the API's strings
     elif coordinate_type == "horizontal":
-        relevant_data = planetary_body_data[[
-            "date", "altitude_string", "azimuth_string"]]
-        relevant_data = relevant_data.copy()
-        relevant_data.rename(
-            columns={"altitude_string": "Altitude", "azimuth_string": "Azimuth"}, inplace=True)
+        relevant_data = pd.DataFrame({
+            "date": planetary_body_data["date"],
+            "Altitude": format_degrees(planetary_body_data["altitude_degrees"]),
+            "Azimuth": format_degrees(planetary_body_data["azimuth_degrees"])
+        })
 
     # Extract one week of data from today
     today = pd.Timestamp("today").normalize()
@@ -334,21 +214,27 @@ def format_coordinate_data(planetary_body_data: pd.DataFrame, coordinate_type: s
     return transpose_data
 
 
-def display_planetary_body_data(data: pd.DataFrame) -> None:
-    """Displays planetary body data, including two metrics and two tables,
-    with the option to select the planetary body.
+def select_planetary_body() -> tuple[str, str]:
+    """
+    Displays the planetary positions heading and returns the selected planetary body
+    and the region it's observed from, which its horizontal co-ordinates depend on
     """
 
     st.subheader("Planetary Positions :telescope:", divider="blue")
-    planetary_body_option = st.selectbox("Select a planetary body:", ["Sun", "Moon",
-                                                                      "Mercury", "Venus",
-                                                                      "Earth", "Mars",
-                                                                      "Jupiter", "Saturn",
-                                                                      "Uranus", "Neptune",
-                                                                      "Pluto"])
+    planetary_body = st.selectbox("Select a planetary body:", ["Sun", "Moon",
+                                                               "Mercury", "Venus",
+                                                               "Earth", "Mars",
+                                                               "Jupiter", "Saturn",
+                                                               "Uranus", "Neptune",
+                                                               "Pluto"])
+    region_names = list(src.astronomy_utils.REGIONS)
+    observer_region = st.selectbox("Observe from:", region_names,
+                                   index=region_names.index("London"))
+    return planetary_body, observer_region
 
-    planetary_body_data = data[data["planetary_body_name"]
-                               == planetary_body_option]
+
+def display_planetary_body_data(planetary_body_data: pd.DataFrame) -> None:
+    """Displays the selected planetary body's data, including two metrics and two tables"""
 
     today = datetime.today().strftime("%Y-%m-%d")
     pb_data_today = planetary_body_data[planetary_body_data["date"] == today]
@@ -383,23 +269,7 @@ def display_aurora_data(activity_data: pd.DataFrame) -> None:
     status colour, and time that the status was created.
     """
 
-    status_description_dict = {
-        "Green": "No significant activity. Aurora is unlikely to be visible by "
-        "eye or camera from anywhere in the UK.",
-        "Yellow": "Minor geomagnetic activity. Aurora may be visible by eye from Scotland "
-        "and may be visible by camera from Scotland, northern England and Northern Ireland.",
-        "Amber": "Amber alert: possible aurora. Aurora is likely to be visible by eye from "
-        "Scotland, northern England and Northern Ireland possibly visible from elsewhere in "
-        "the UK. Photographs of aurora are likely from anywhere in the UK.",
-        "Red": "Red alert: aurora likely. It is likely that aurora will be visible by eye "
-        "and camera from anywhere in the UK."}
-
-    colour_meaning = {"Green": "Unlikely",
-                      "Yellow": "Possibly",
-                      "Amber": "Likely",
-                      "Red": "Very Likely"}
-
-    status_colour, description, date_time = find_most_recent_status_info(status_description_dict,
+    status_colour, description, date_time = find_most_recent_status_info(STATUS_DESCRIPTIONS,
                                                                          activity_data)
 
     st.subheader(
@@ -407,17 +277,42 @@ def display_aurora_data(activity_data: pd.DataFrame) -> None:
 
     a, b = st.columns(2)
     a.metric("Will an aurora be visible tonight?",
-             colour_meaning[status_colour], border=True)
+             STATUS_LIKELIHOODS[status_colour], border=True)
     b.metric("Time of Status", date_time, border=True)
 
     with st.expander("Description"):
         st.markdown(f"{description}")
 
 
-def display_apod() -> None:
-    """Displays the Astronomy Picture of the Day, it's title and an explanation from NASA
+def display_best_windows(windows: pd.DataFrame) -> None:
+    """Displays the best stargazing windows across the regions over the coming week"""
+
+    st.subheader("Best Stargazing Windows :milky_way:", divider="blue")
+
+    if windows.empty:
+        st.markdown("No clear, dark skies forecast anywhere this week")
+        return
+
+    st.dataframe(pd.DataFrame({
+        "Region": windows["location"],
+        "From": windows["start"].dt.strftime("%H:%M, %a %d %b"),
+        "Until": windows["end"].dt.strftime("%H:%M, %a %d %b"),
+        "Hours": windows["hours"],
+        "Score": windows["mean_score"]
+    }), hide_index=True)
 
-    If there's no image for the day, displays no image today message to the user"""
+
+def fetch_apod_image_or_url(image_url: str, rendition: str = "web") -> bytes | str:
+    """Returns a downscaled APOD image, or its url for the browser to fetch if that fails"""
+
+    try:
+        return fetch_apod_image(image_url, rendition)
+    except (RuntimeError, OSError, requests.RequestException):
+        return image_url
+
+
+def fetch_todays_apod() -> tuple[str, str, bytes | str] | None:
+    """Returns today's APOD title, explanation and web-sized image, or None if it isn't an image"""
 
     apod_params = {
         "api_key": API_KEY,
@@ -425,31 +320,91 @@ def display_apod() -> None:
     }
 
     try:
-        title, explanation, url = get_image_details(APOD_URL, apod_params)
+        title, explanation, image_url = fetch_apod(APOD_URL, apod_params)
+    except ValueError:
+        return None
+    return title, explanation, fetch_apod_image_or_url(image_url)
+
+
+def fetch_apod_thumbnails() -> tuple[pd.DataFrame, list[bytes | str]]:
+    """Returns the latest archived pictures of the day and a thumbnail of each"""
+
+    history = fetch_apod_history(get_db_connection())
+    return history, [fetch_apod_image_or_url(url, "thumbnail") for url in history["image_url"]]
+
+
+def display_apod(apod_details: tuple[str, str, bytes | str] | None) -> None:
+    """Displays the Astronomy Picture of the Day, it's title and an explanation from NASA
+
+    If there's no image for the day, displays no image today message to the user"""
+
+    if apod_details is not None:
+        title, explanation, image = apod_details
 
         st.markdown(
             "Discover a new image each day of our fascinating universe (Sourced from NASA). "
             "Each image includes an explanation from a professional astronomer!")
         st.subheader(f"{title}", divider="blue")
-        st.image(url)
+        st.image(image)
         st.subheader("Image Explanation", divider="blue")
         st.markdown(explanation)
 
-    except ValueError:
+    else:
         st.markdown(
             "No Picture of the Day today! Please check back tomorrow"
         )
 
 
-def display_neos() -> None:
+def display_apod_history(history_thumbnails: tuple[pd.DataFrame, list[bytes | str]]) -> None:
+    """Displays thumbnails of the latest pictures of the day, and any one of them chosen in full"""
+
+    history, thumbnails = history_thumbnails
+    st.subheader("Previous Pictures of the Day", divider="blue")
+
+    columns = st.columns(4)
+    for i, (picture, thumbnail) in enumerate(zip(history.itertuples(), thumbnails)):
+        columns[i % 4].image(thumbnail, caption=f"{picture.apod_date}: {picture.title}")
+
+    chosen_date = st.selectbox("View a previous picture:", history["apod_date"])
+    chosen = history[history["apod_date"] == chosen_date].iloc[0]
+    st.markdown(f"**{chosen['title']}**")
+    st.image(fetch_apod_image_or_url(chosen["image_url"]))
+    st.markdown(chosen["explanation"])
+
+
+NEO_SORT_OPTIONS = {"Miss Distance": "miss_distance_km",
+                    "Relative Velocity": "relative_velocity_kmph",
+                    "Diameter": "diameter_max_m",
+                    "Name": "name"}
+
+
+def select_neo_filters() -> dict:
+    """Lets the user filter and sort the day's Near-Earth objects"""
+
+    a, b = st.columns(2)
+    sort_by = a.selectbox("Sort by:", list(NEO_SORT_OPTIONS))
+    descending = b.radio("Order:", ["Ascending", "Descending"], horizontal=True) == "Descending"
+
+    hazardous_only = st.checkbox("Potentially hazardous objects only")
+    max_miss_distance = st.slider("Maximum miss distance (million km):", 0.0, 75.0, 75.0)
+    min_velocity = st.slider("Minimum relative velocity (thousand km/h):", 0, 150, 0)
+
+    return {"hazardous_only": hazardous_only,
+            "max_miss_distance_km": max_miss_distance * 1_000_000,
+            "min_velocity_kmph": min_velocity * 1000,
+            "sort_by": NEO_SORT_OPTIONS[sort_by],
+            "descending": descending}
+
+
+def fetch_todays_neos(filters: dict) -> list[dict[str, str]]:
+    """Returns the day's Near-Earth objects from the database, filtered and sorted"""
+
+    return fetch_neos(get_db_connection(), TODAY, **filters)
+
+
+def display_neos(data: list[dict[str, str]]) -> None:
     """Displays the day's Near-Earth objects and their associated metrics"""
 
-    neo_params = {
-        "start_date": TODAY,
-        "end_date": TODAY,
-        "api_key": API_KEY
-    }
-    data = get_neos(NEO_URL, neo_params, TODAY)
     st.metric(f"Number of NEOs Today", len(data), border=True)
 
     for n in data:
@@ -466,28 +421,31 @@ def display_neos() -> None:
                  f"{n["relative_velocity_kmph"]} km/h", border=True)
 
 
-def display_iss_data(regions_df: pd.DataFrame, region_option: str) -> None:
-    """Displays the current latitude and longitude of the International Space
-    Station, as well as a prediction for when it will next be overhead.
-    """
+def display_iss_location(current_location: tuple[float, float]) -> None:
+    """Displays the current latitude and longitude of the International Space Station"""
 
     st.subheader(
         "International Space Station :rocket:", divider="blue")
 
     st.markdown("#### Current Location")
-    current_location = get_iss_lat_long_now()
     a, b = st.columns(2)
     b.metric("Latitude", current_location[0], border=True)
     a.metric("Longitude", current_location[1], border=True)
 
-    # Gets the lat/lon of the selected region
-    region_lat_long = regions_df[regions_df["region_name"] == region_option]
-    latitude = region_lat_long["latitude"].values[0]
-    longitude = region_lat_long["longitude"].values[0]
+
+def display_iss_ground_track(track: pd.DataFrame) -> None:
+    """Displays the path of the International Space Station over its next orbit"""
+
+    st.markdown("#### Path Over the Next Orbit")
+    st.map(track[["latitude", "longitude"]], latitude="latitude", longitude="longitude",
+           size=20000, zoom=0)
+
+
+def display_iss_passes(passes: dict) -> None:
+    """Displays a prediction for when the International Space Station will next be overhead"""
 
     st.markdown("#### When will the ISS be next overhead?")
-    region_specific = present_iss_passes(get_passes(
-        lat=latitude, lon=longitude))[0]
+    region_specific = present_iss_passes(passes)[0]
 
     time_next_overhead = region_specific[0]
     datetime_obj = datetime.strptime(time_next_overhead, "%Y-%m-%d %H:%M:%S%z")
@@ -497,51 +455,108 @@ def display_iss_data(regions_df: pd.DataFrame, region_option: str) -> None:
     st.metric("Number of Seconds Visible", region_specific[1], border=True)
 
 
-def main() -> None:
-    """Main function to run all necessary code for the dashboard"""
-
-    st.image("dashboard/banner.png", use_container_width=True)
-
-    home, location, apod, neo = st.tabs(
-        ["Home", "By Location", "Astronomy Picture of the Day", "Near-Earth Objects"])
-
-    with home:
-
-        engine = get_db_connection()
-        all_planetary_data = get_all_data(engine)
-        display_planetary_body_data(all_planetary_data)
-
-        try:
-            aurora_data = extract_activity_data(AURORA_ACTIVITY_URL)
-            display_aurora_data(aurora_data)
-        except RuntimeError:
-            st.markdown("Aurora data not currently available")
-
-    with location:
-        st.subheader("Region Selection :world_map:", divider="blue")
-        regions_df = create_regions_dataframe()
-        region_option = st.selectbox("Select a region:", ["Cymru Wales", "East Midlands",
-                                                          "East of England", "London",
-                                                          "North East & Cumbria", "North West",
-                                                          "Northern Ireland", "Scotland",
-                                                          "South East", "South West",
-                                                          "West Midlands", "Yorkshire & the Humber"])
+def render_sections(sections: list[tuple[Future, Callable[[Any], None], str]]) -> None:
+    """Renders each (future, display function, fallback message) section in page order,
+    filling in each one as soon as its data arrives. A section whose fetch fails or takes
+    longer than SECTION_TIMEOUT shows its fallback message without holding up the others.
+    """
 
-        display_moon_phase_data(regions_df, region_option)
+    # Reserve each section's place on the page before any data has arrived
+    pending = {future: (st.container(), display, fallback)
+               for future, display, fallback in sections}
 
-        display_iss_data(regions_df, region_option)
+    try:
+        for future in as_completed(pending, timeout=SECTION_TIMEOUT):
+            container, display, fallback = pending.pop(future)
+            with container:
+                try:
+                    display(future.result())
+                except Exception:  # pylint:disable=broad-exception-caught
+                    st.markdown(fallback)
 
-        weather_section(regions_df, region_option)
+    except FutureTimeoutError:
+        for container, _, fallback in pending.values():
+            with container:
+                st.markdown(fallback)
 
-    with apod:
-        st.title("Astronomy Picture of the Day")
 
-        display_apod()
+def main() -> None:
+    """Main function to run all necessary code for the dashboard"""
 
-    with neo:
-        st.title("Near-Earth Objects")
+    st.image("dashboard/banner.png", use_container_width=True)
 
-        display_neos()
+    # Rerunning on tab change lets only the open tab fetch its data
+    home, location, apod, neo = st.tabs(
+        ["Home", "By Location", "Astronomy Picture of the Day", "Near-Earth Objects"],
+        key="section", on_change="rerun")
+
+    if home.open:
+        with home:
+            planetary_body_option, observer_region = select_planetary_body()
+
+            # Only the selected body's week of data, as seen from the region, leaves the database
+            observer = src.astronomy_utils.REGIONS[observer_region]
+            render_sections([
+                (SECTION_EXECUTOR.submit(fetch_planetary_body_data, get_db_connection(),
+                                         planetary_body_option, observer["lat"],
+                                         observer["lon"], date.today()),
+                 display_planetary_body_data, "Planetary data not currently available"),
+                (SECTION_EXECUTOR.submit(fetch_aurora_activity, get_db_connection()),
+                 display_aurora_data, "Aurora data not currently available"),
+                (SECTION_EXECUTOR.submit(fetch_best_windows, get_db_connection(),
+                                         pd.Timestamp.now(tz="UTC").floor("h")),
+                 display_best_windows, "Stargazing forecast not currently available")
+            ])
+
+    if location.open:
+        with location:
+            st.subheader("Region Selection :world_map:", divider="blue")
+            regions_df = create_regions_dataframe()
+            region_option = st.selectbox("Select a region:", ["Cymru Wales", "East Midlands",
+                                                              "East of England", "London",
+                                                              "North East & Cumbria", "North West",
+                                                              "Northern Ireland", "Scotland",
+                                                              "South East", "South West",
+                                                              "West Midlands",
+                                                              "Yorkshire & the Humber"])
+            latitude, longitude = get_region_coordinates(regions_df, region_option)
+
+            render_sections([
+                (SECTION_EXECUTOR.submit(fetch_moon_phase_image, latitude, longitude,
+                                         str(datetime.now().date())),
+                 lambda image: display_moon_phase_data(image, region_option),
+                 "Moon phase image not currently available"),
+                (SECTION_EXECUTOR.submit(fetch_iss_position),
+                 display_iss_location, "ISS location not currently available"),
+                (SECTION_EXECUTOR.submit(fetch_iss_ground_track),
+                 display_iss_ground_track, "ISS ground track not currently available"),
+                (SECTION_EXECUTOR.submit(fetch_iss_passes, get_db_connection(), region_option),
+                 display_iss_passes, "ISS pass predictions not currently available"),
+                (SECTION_EXECUTOR.submit(fetch_region_weather, get_db_connection(),
+                                         region_option),
+                 weather_section, "Weather data not currently available")
+            ])
+
+    if apod.open:
+        with apod:
+            st.title("Astronomy Picture of the Day")
+
+            render_sections([
+                (SECTION_EXECUTOR.submit(fetch_todays_apod),
+                 display_apod, "Picture of the Day not currently available"),
+                (SECTION_EXECUTOR.submit(fetch_apod_thumbnails),
+                 display_apod_history, "Previous Pictures of the Day not currently available")
+            ])
+
+    if neo.open:
+        with neo:
+            st.title("Near-Earth Objects")
+            neo_filters = select_neo_filters()
+
+            render_sections([
+                (SECTION_EXECUTOR.submit(fetch_todays_neos, neo_filters),
+                 display_neos, "Near-Earth objects not currently available")
+            ])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,96 @@
+"""
+Keeps an archive of Astronomy Pictures of the Day in the database
+Any range of dates is backfilled with a single APOD request, and the daily run adds the latest
+"""
+import logging
+import os
+import sys
+from datetime import date, timedelta
+
+import pandas as pd
+from dotenv import load_dotenv
+from sqlalchemy import Engine, text
+
+from src.database import get_engine
+from src.extract_nasa import get_apod_archive, APOD_COLUMNS
+
+APOD_URL = "https://api.nasa.gov/planetary/apod"
+# Days fetched by a run without a start date, so a missed run or two is filled in
+DEFAULT_BACKFILL_DAYS = 7
+# Number of past pictures the dashboard lists
+HISTORY_LENGTH = 12
+
+UPSERT_APOD = text("""
+    INSERT INTO apod (apod_date, title, explanation, media_type, image_url, hd_image_url)
+    VALUES (:apod_date, :title, :explanation, :media_type, :image_url, :hd_image_url)
+    ON CONFLICT (apod_date) DO UPDATE SET
+        title = EXCLUDED.title,
+        explanation = EXCLUDED.explanation,
+        media_type = EXCLUDED.media_type,
+        image_url = EXCLUDED.image_url,
+        hd_image_url = EXCLUDED.hd_image_url;
+""")
+
+
+def backfill_apod(engine: Engine = None, start: date = None, end: date = None) -> int:
+    """Upserts every APOD from the start to the end date, returning how many were stored"""
+    if engine is None:
+        engine = get_engine()
+    if end is None:
+        end = date.today()
+    if start is None:
+        start = end - timedelta(days=DEFAULT_BACKFILL_DAYS - 1)
+
+    archive = get_apod_archive(APOD_URL, os.environ.get("API_KEY"), str(start), str(end))
+    # Missing values are stored as NULL rather than NaN
+    archive = archive.astype(object).where(archive.notna(), None)
+
+    if not archive.empty:
+        with engine.begin() as conn:
+            conn.execute(UPSERT_APOD, archive.to_dict("records"))
+
+    logging.info("%s pictures of the day stored", len(archive))
+    return len(archive)
+
+
+def load_apod_history(engine: Engine, limit: int = HISTORY_LENGTH,
+                      before: str = None) -> pd.DataFrame:
+    """Returns the latest stored pictures of the day that are images, newest first"""
+    conditions = ["media_type = 'image'"]
+    params = {"limit": limit}
+    if before is not None:
+        conditions.append("apod_date < :before")
+        params["before"] = before
+
+    with engine.connect() as conn:
+        history = pd.read_sql(
+            text(f"SELECT {', '.join(APOD_COLUMNS)} FROM apod "
+                 f"WHERE {' AND '.join(conditions)} ORDER BY apod_date DESC LIMIT :limit"),
+            conn, params=params)
+
+    if history.empty:
+        raise RuntimeError("No pictures of the day stored")
+    history["apod_date"] = history["apod_date"].astype(str)
+    return history
+
+
+def handler(event, context):
+    """handler function for lambda function"""
+    try:
+        pictures_stored = backfill_apod()
+        logging.info("%s : Lambda time remaining in MS: %s", event,
+                     context.get_remaining_time_in_millis())
+        return {"statusCode": 200, "pictures": pictures_stored}
+    except RuntimeError as e:
+        return {"statusCode": 500, "error": str(e)}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(message)s"
+    )
+
+    load_dotenv()
+    # An optional start date backfills the archive from that date, e.g. 2025-01-01
+    backfill_apod(start=date.fromisoformat(sys.argv[1]) if len(sys.argv) > 1 else None)
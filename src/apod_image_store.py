@@ -0,0 +1,84 @@
+"""
+Keeps Astronomy Picture of the Day images on local disk in the sizes the dashboard shows
+Each image is downloaded once, and its thumbnail and web-sized renditions are made from
+that copy the first time they're asked for
+Every file has its own lock, so a slow download only holds up requests for the same image
+"""
+import hashlib
+import os
+import threading
+from io import BytesIO
+from pathlib import Path
+
+import requests as reqs
+from PIL import Image
+
+from src.file_utils import write_atomically
+
+DEFAULT_STORE_DIRECTORY = ".apod_image_store"
+# Longest side in pixels of each rendition
+RENDITION_SIZES = {"thumbnail": 320, "web": 1280}
+JPEG_QUALITY = 85
+
+
+class ApodImageStore:
+    """Original APOD images and their downscaled renditions in a local directory"""
+
+    def __init__(self, directory: str | Path = None):
+        if directory is None:
+            directory = os.getenv("APOD_IMAGE_STORE_DIR", DEFAULT_STORE_DIRECTORY)
+        self.directory = Path(directory)
+        # Guards path_locks, which holds the lock for each file being made or read
+        self.lock = threading.Lock()
+        self.path_locks = {}
+        for folder in ["originals", *RENDITION_SIZES]:
+            (self.directory / folder).mkdir(parents=True, exist_ok=True)
+
+    def original_path(self, url: str) -> Path:
+        """Returns the path of the original image downloaded from a url"""
+        return self.directory / "originals" / hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def rendition_path(self, url: str, rendition: str) -> Path:
+        """Returns the path of a rendition of the image from a url"""
+        name = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / rendition / f"{name}.jpg"
+
+    def path_lock(self, path: Path) -> threading.Lock:
+        """Returns the lock for a file, creating it the first time"""
+        with self.lock:
+            return self.path_locks.setdefault(path, threading.Lock())
+
+    def get_original(self, url: str) -> bytes:
+        """Returns the original image from a url, only downloading it the first time
+
+        Raises:
+            RuntimeError: If the image can't be downloaded."""
+        path = self.original_path(url)
+        with self.path_lock(path):
+            if path.exists():
+                return path.read_bytes()
+
+            response = reqs.get(url, timeout=60)
+            if response.status_code != 200:
+                raise RuntimeError(f"Failed to download APOD image: {response.status_code}")
+            write_atomically(path, response.content)
+            return response.content
+
+    def get_rendition(self, url: str, rendition: str = "web") -> bytes:
+        """Returns a JPEG of the image from a url, scaled down to the rendition's size"""
+        if rendition not in RENDITION_SIZES:
+            raise ValueError(f"Unknown rendition {rendition}, expected one of "
+                             f"{list(RENDITION_SIZES)}")
+
+        path = self.rendition_path(url, rendition)
+        with self.path_lock(path):
+            if path.exists():
+                return path.read_bytes()
+
+            image = Image.open(BytesIO(self.get_original(url))).convert("RGB")
+            image.thumbnail((RENDITION_SIZES[rendition], RENDITION_SIZES[rendition]))
+            output = BytesIO()
+            image.save(output, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+
+            write_atomically(path, output.getvalue())
+            return output.getvalue()
@@ -5,6 +5,23 @@ from typing import Dict
 
 DATA_FILEPATH = '../data/'
 
+# Observer coordinates for each region of the UK, keyed by region name
+# lat/long pairs snatched from Wikipedia
+REGIONS: Dict[str, Dict[str, float]] = {
+    "Cymru Wales": {"lat": +51.29, "lon": -03.11},  # actually Cardiff
+    "East Midlands": {"lat": +52.98, "lon": -00.75},
+    "East of England": {"lat": +52.24, "lon": +00.41},
+    "London": {"lat": +51.30, "lon": -00.05},  # actually City of London
+    "North East & Cumbria": {"lat": +55.00, "lon": -01.87},
+    "North West": {"lat": +54.04, "lon": -02.45},
+    "Northern Ireland": {"lat": +54.60, "lon": -05.93},  # actually Belfast
+    "Scotland": {"lat": +55.57, "lon": -03.11},  # actually Edinburgh
+    "South East": {"lat": +51.30, "lon": -00.80},
+    "South West": {"lat": +50.96, "lon": -03.22},
+    "West Midlands": {"lat": +52.28, "lon": -02.15},
+    "Yorkshire & the Humber": {"lat": +53.34, "lon": -01.12}
+}
+
 def construct_astronomy_api_auth() -> str:
     """
     WARN!!! Assumes the .env is loaded and has values for:
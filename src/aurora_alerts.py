@@ -0,0 +1,138 @@
+"""
+Edge-triggered aurora alerts
+An alert fires when the status rises into an alerting colour, not on every poll while it
+stays there, so a long red period sends one email rather than one per scheduled run
+"""
+import json
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import Engine, text
+
+# Colours from least to most active
+STATUS_LEVELS = {"Green": 0, "Yellow": 1, "Amber": 2, "Red": 3}
+
+# Colours that send an alert, against the hours before that colour can alert again
+# The cooldown stops a status flapping around a threshold from sending a stream of emails
+DEFAULT_ALERT_COOLDOWNS = {"Red": 3}
+
+STATE_KEY = "aurora_status"
+
+
+def status_level(status: str | None) -> int:
+    """Returns how active a status colour is, with no status counting as the least active"""
+    if status is None:
+        return -1
+    if status not in STATUS_LEVELS:
+        raise ValueError(f"Unknown aurora status {status}")
+    return STATUS_LEVELS[status]
+
+
+def parse_alert_cooldowns(setting: str) -> dict[str, float]:
+    """
+    Parses alert colours and cooldowns from a setting like "Amber:6,Red:3"
+    A colour without a cooldown, like "Red", uses no cooldown
+    """
+    cooldowns = {}
+    for item in filter(None, (part.strip() for part in setting.split(","))):
+        colour, _, hours = item.partition(":")
+        colour = colour.strip().title()
+        status_level(colour)
+        cooldowns[colour] = float(hours) if hours else 0.0
+    return cooldowns
+
+
+def evaluate_alert(
+    state: dict | None,
+    status: str,
+    status_time: datetime,
+    cooldowns: dict[str, float] = None
+) -> tuple[bool, dict]:
+    """
+    Returns whether to alert for the latest status and the state to store for the next poll
+    Alerts fire when the status rises into an alerting colour, once per status record,
+    and not within that colour's cooldown of the last alert at that colour or above
+    """
+    if cooldowns is None:
+        cooldowns = DEFAULT_ALERT_COOLDOWNS
+    state = dict(state or {})
+    status_time_str = status_time.isoformat()
+
+    # The same status record polled again is coalesced into the first poll
+    if state.get("status_time") == status_time_str:
+        return False, state
+
+    rising = status_level(status) > status_level(state.get("status"))
+    alert = status in cooldowns and rising
+
+    if alert and state.get("alerted_at"):
+        since_alert = status_time - datetime.fromisoformat(state["alerted_at"])
+        recently_alerted = status_level(state.get("alerted_status")) >= status_level(status)
+        alert = not (recently_alerted and since_alert < timedelta(hours=cooldowns[status]))
+
+    state.update({"status": status, "status_time": status_time_str})
+    if alert:
+        state.update({"alerted_status": status, "alerted_at": status_time_str})
+        logging.info("Aurora alert for a %s status at %s", status, status_time_str)
+
+    return alert, state
+
+
+class FileStateStore:
+    """Keeps the alert state in a local JSON file"""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def load(self) -> dict | None:
+        """Returns the stored state, or None if nothing has been stored yet"""
+        if not self.path.exists():
+            return None
+        return json.loads(self.path.read_text(encoding="utf-8"))
+
+    def save(self, state: dict) -> None:
+        """Replaces the stored state, writing a temporary file first so a crash can't corrupt it"""
+        temporary_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        temporary_path.write_text(json.dumps(state), encoding="utf-8")
+        temporary_path.replace(self.path)
+
+
+class DatabaseStateStore:
+    """Keeps the alert state as JSON in the aurora_alert_state table"""
+
+    def __init__(self, engine: Engine, key: str = STATE_KEY):
+        self.engine = engine
+        self.key = key
+
+    def load(self) -> dict | None:
+        """Returns the stored state, or None if nothing has been stored yet"""
+        with self.engine.connect() as conn:
+            state = conn.execute(
+                text("SELECT state FROM aurora_alert_state WHERE alert_key = :key"),
+                {"key": self.key}
+            ).scalar()
+        return json.loads(state) if state else None
+
+    def save(self, state: dict) -> None:
+        """Replaces the stored state"""
+        with self.engine.begin() as conn:
+            conn.execute(text("""
+                INSERT INTO aurora_alert_state (alert_key, state)
+                VALUES (:key, :state)
+                ON CONFLICT (alert_key) DO UPDATE SET state = EXCLUDED.state;
+            """), {"key": self.key, "state": json.dumps(state)})
+
+
+def check_for_alert(
+    store: FileStateStore | DatabaseStateStore,
+    status: str,
+    status_time: datetime,
+    cooldowns: dict[str, float] = None
+) -> bool:
+    """Evaluates the latest status against the stored state, saving the new state if it changed"""
+    state = store.load()
+    alert, new_state = evaluate_alert(state, status, status_time, cooldowns)
+    if new_state != state:
+        store.save(new_state)
+    return alert
@@ -1,7 +1,23 @@
 """Lambda handler script to create the html content of the email notification"""
 
-def handler(event=None, context=None):
-    html_str = """<!DOCTYPE html>
+import html
+import logging
+from datetime import datetime, timezone
+from string import Template
+
+import requests
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.astronomy_utils import REGIONS
+from src.aurora_etl import STATUS_DESCRIPTIONS, STATUS_LIKELIHOODS
+from src.database import get_engine
+from src.iss_etl import get_passes, present_iss_passes
+from src.iss_passes import load_next_passes
+from src.stargazing_score import get_best_windows
+from src.ttl_cache import TTLCache
+
+# Compiled once when the container starts, so warm invocations only fill in the values
+EMAIL_TEMPLATE = Template("""<!DOCTYPE html>
             <html>
             <head>
             <style>
@@ -12,11 +28,123 @@ def handler(event=None, context=None):
             </head>
             <body>
 
-            <h2>Aurora Alert!</h2>
-            <p>It is likely that an aurora will be visible by eye and camera from anywhere in the UK.</p>
+            <h2>$heading</h2>
+            <p>$description</p>
+            <p><b>Chance of seeing an aurora:</b> $likelihood (status issued $status_time)</p>
+
+            <h3>Best place to look</h3>
+            <p>$best_region</p>
+
+            <h3>Next ISS pass</h3>
+            <p>$iss_pass</p>
+
             <p>Check the StarWatch dashboard and start planning your night! </p>
 
             </body>
             </html>
-            """
-    return {"html": html_str}
+            """)
+
+HEADINGS = {"Green": "Aurora Update",
+            "Yellow": "Aurora Watch",
+            "Amber": "Aurora Alert!",
+            "Red": "Aurora Alert!"}
+
+# Region whose ISS pass is shown when there's no best region to use
+DEFAULT_REGION = "London"
+
+NO_WINDOWS = "No clear, dark skies are forecast for the coming week, " \
+    "but keep an eye on the northern horizon."
+FALLBACK_REGION = "Head somewhere dark with a clear view to the north."
+FALLBACK_ISS_PASS = "Check the StarWatch dashboard for the next ISS pass over your region."
+
+# Rendered emails by (status, status time, hour), reused by warm invocations within the hour
+RENDERED_EMAILS = TTLCache(ttl=60 * 60, maxsize=16)
+
+
+def find_best_region(status: str, hour: datetime) -> tuple[str, str]:
+    """Returns the region with the best stargazing window and a sentence describing it"""
+    windows = get_best_windows(get_engine(), REGIONS, start=hour, aurora_status=status, top=1)
+    if windows.empty:
+        return DEFAULT_REGION, NO_WINDOWS
+
+    best = windows.iloc[0]
+    return best["location"], (
+        f"{best['location']}, from {best['start'].strftime('%H:%M on %a %d %b')} "
+        f"for {best['hours']} hours (stargazing score {best['mean_score']:.0f}/100)."
+    )
+
+
+def load_next_pass(region_name: str) -> dict:
+    """
+    Returns the next pass over a region from the stored passes
+    Predicts it directly if none are stored, e.g. before the pass table is first filled
+    """
+    try:
+        return load_next_passes(get_engine(), region_name, n=1)
+    except (RuntimeError, SQLAlchemyError) as e:
+        logging.warning("No stored ISS pass for %s, predicting it: %s", region_name, e)
+        region = REGIONS[region_name]
+        return get_passes(lon=region["lon"], lat=region["lat"], n=1)
+
+
+def describe_next_iss_pass(region_name: str) -> str:
+    """Returns a sentence describing the next ISS pass over a region"""
+    passes = present_iss_passes(load_next_pass(region_name))
+    if not passes:
+        return FALLBACK_ISS_PASS
+
+    rise_time, duration = passes[0]
+    rise_time = datetime.fromisoformat(rise_time).strftime("%H:%M UTC on %a %d %b")
+    return f"Over {region_name} at {rise_time}, visible for {duration // 60} minutes."
+
+
+def render_email(status: str, status_time: str, hour: datetime) -> str:
+    """
+    Returns the alert email for a status, rendered at most once per status record per hour
+    Emails missing the best region or ISS pass aren't kept, so the next invocation retries
+    """
+    if status not in STATUS_DESCRIPTIONS:
+        raise ValueError(f"Unknown aurora status {status}")
+
+    # The status time is part of the key, as a later record in the same hour shows its own time
+    key = (status, status_time, hour)
+    found, email = RENDERED_EMAILS.get(key)
+    if found:
+        return email
+
+    complete = True
+    try:
+        region_name, best_region = find_best_region(status, hour)
+    except (RuntimeError, SQLAlchemyError) as e:
+        logging.warning("Unable to find the best region: %s", e)
+        region_name, best_region, complete = DEFAULT_REGION, FALLBACK_REGION, False
+
+    try:
+        iss_pass = describe_next_iss_pass(region_name)
+    except (RuntimeError, ValueError, requests.RequestException) as e:
+        logging.warning("Unable to predict the next ISS pass: %s", e)
+        iss_pass, complete = FALLBACK_ISS_PASS, False
+
+    email = EMAIL_TEMPLATE.substitute(
+        heading=HEADINGS[status],
+        description=html.escape(STATUS_DESCRIPTIONS[status]),
+        likelihood=STATUS_LIKELIHOODS[status],
+        status_time=html.escape(status_time),
+        best_region=html.escape(best_region),
+        iss_pass=html.escape(iss_pass)
+    )
+
+    if complete:
+        RENDERED_EMAILS.set(key, email)
+    return email
+
+
+def handler(event=None, context=None):
+    """Returns the alert email for the status passed on by the status check"""
+    event = event or {}
+    now = datetime.now(timezone.utc)
+    status = event.get("Status", "Red")
+    status_time = event.get("StatusTime", now.strftime("%H:%M, %a %d %b"))
+
+    return {"html": render_email(status, status_time,
+                                 now.replace(minute=0, second=0, microsecond=0))}
@@ -2,6 +2,8 @@
 ready to be loaded on to the dashboard"""
 
 from datetime import datetime
+from typing import IO, Iterator
+from xml.etree.ElementTree import iterparse
 
 import xmltodict
 import requests
@@ -9,6 +11,26 @@ import pandas as pd
 
 ACTIVITY_URL = "http://aurorawatch-api.lancs.ac.uk/0.2.5/status/project/awn/sum-activity.xml"
 
+ACTIVITY_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+
+# What each status colour means, shared by the dashboard and the alert emails
+STATUS_DESCRIPTIONS = {
+    "Green": "No significant activity. Aurora is unlikely to be visible by "
+    "eye or camera from anywhere in the UK.",
+    "Yellow": "Minor geomagnetic activity. Aurora may be visible by eye from Scotland "
+    "and may be visible by camera from Scotland, northern England and Northern Ireland.",
+    "Amber": "Amber alert: possible aurora. Aurora is likely to be visible by eye from "
+    "Scotland, northern England and Northern Ireland possibly visible from elsewhere in "
+    "the UK. Photographs of aurora are likely from anywhere in the UK.",
+    "Red": "Red alert: aurora likely. It is likely that aurora will be visible by eye "
+    "and camera from anywhere in the UK."}
+
+# How likely an aurora is to be visible for each status colour
+STATUS_LIKELIHOODS = {"Green": "Unlikely",
+                      "Yellow": "Possibly",
+                      "Amber": "Likely",
+                      "Red": "Very Likely"}
+
 
 def extract_activity_data(activity_data_url: str) -> pd.DataFrame:
     """Returns dataframe of recent aurora activity data from the API response"""
@@ -24,6 +46,47 @@ def extract_activity_data(activity_data_url: str) -> pd.DataFrame:
     return pd.DataFrame(activity_data)
 
 
+def fetch_activity_document(activity_data_url: str, etag: str = None,
+                            last_modified: str = None) -> requests.Response | None:
+    """
+    Returns a streaming response for the activity document, or None if it hasn't changed
+    since the given ETag or Last-Modified value, so an unchanged document isn't downloaded
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    response = requests.get(activity_data_url, headers=headers, timeout=20, stream=True)
+    if response.status_code == 304:
+        response.close()
+        return None
+    if response.status_code != 200:
+        raise RuntimeError("Unable to retrieve activity data. "
+                           f"Error {response.status_code}: {response.text}")
+
+    response.raw.decode_content = True
+    return response
+
+
+def iter_activity_records(stream: IO[bytes]) -> Iterator[dict]:
+    """
+    Yields each activity record in an activity document as it is parsed
+    Each element is cleared once read, so the whole document is never held in memory
+    """
+    for _, element in iterparse(stream, events=("end",)):
+        if element.tag != "activity":
+            continue
+        yield {
+            "activity_time": datetime.strptime(element.findtext("datetime"),
+                                               ACTIVITY_DATETIME_FORMAT),
+            "status_id": element.get("status_id"),
+            "value": float(element.findtext("value"))
+        }
+        element.clear()
+
+
 def find_most_recent_status_info(status_descriptions: dict,
                                  activity_data: pd.DataFrame) -> tuple[str, str, str]:
     """Returns the status colour, status description, and the date and time of the status"""
@@ -37,7 +100,7 @@ def find_most_recent_status_info(status_descriptions: dict,
 
         # Convert datetime data into more readable format
         date_time = most_recent_aurora_activity["datetime"].values[0]
-        datetime_obj = datetime.strptime(date_time, "%Y-%m-%dT%H:%M:%S%z")
+        datetime_obj = datetime.strptime(date_time, ACTIVITY_DATETIME_FORMAT)
         datetime_str = datetime_obj.strftime("%H:%M %p, %a %d %b")
 
         return most_recent_colour, most_recent_status_description, datetime_str
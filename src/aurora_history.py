@@ -0,0 +1,129 @@
+"""
+Keeps a history of AuroraWatch UK activity in the database for the dashboard to read
+Each run only inserts records newer than the latest one stored, and skips the download
+altogether when the document hasn't changed since the last run
+"""
+import logging
+from datetime import datetime, timezone
+
+import pandas as pd
+from dotenv import load_dotenv
+from sqlalchemy import Engine, Connection, text
+
+from src.aurora_etl import (ACTIVITY_URL, ACTIVITY_DATETIME_FORMAT,
+                            fetch_activity_document, iter_activity_records)
+from src.database import get_engine
+
+# Number of the most recent records the dashboard reads
+RECENT_RECORDS = 24
+
+INSERT_ACTIVITY = text("""
+    INSERT INTO aurora_activity (activity_time, status_id, value)
+    VALUES (:activity_time, :status_id, :value)
+    ON CONFLICT (activity_time) DO NOTHING;
+""")
+
+UPSERT_FEED_STATE = text("""
+    INSERT INTO aurora_feed_state (feed_url, etag, last_modified, checked_at)
+    VALUES (:feed_url, :etag, :last_modified, :checked_at)
+    ON CONFLICT (feed_url) DO UPDATE SET
+        etag = EXCLUDED.etag,
+        last_modified = EXCLUDED.last_modified,
+        checked_at = EXCLUDED.checked_at;
+""")
+
+
+def get_high_water_mark(conn: Connection) -> datetime | None:
+    """Returns the time of the latest stored activity record, or None if there are none"""
+    latest = conn.execute(text("SELECT MAX(activity_time) FROM aurora_activity")).scalar()
+    if latest is None:
+        return None
+
+    latest = pd.Timestamp(latest)
+    if latest.tzinfo is None:
+        latest = latest.tz_localize("UTC")
+    return latest.to_pydatetime()
+
+
+def get_feed_state(conn: Connection, feed_url: str) -> tuple[str | None, str | None]:
+    """Returns the ETag and Last-Modified values from the last download of a feed"""
+    row = conn.execute(
+        text("SELECT etag, last_modified FROM aurora_feed_state WHERE feed_url = :feed_url"),
+        {"feed_url": feed_url}
+    ).first()
+    return (row.etag, row.last_modified) if row else (None, None)
+
+
+def ingest_activity(engine: Engine = None, feed_url: str = ACTIVITY_URL) -> int:
+    """Inserts the activity records newer than the stored ones, returning how many were added"""
+    if engine is None:
+        engine = get_engine()
+
+    with engine.connect() as conn:
+        etag, last_modified = get_feed_state(conn, feed_url)
+        high_water_mark = get_high_water_mark(conn)
+
+    response = fetch_activity_document(feed_url, etag, last_modified)
+    if response is None:
+        logging.info("Aurora activity unchanged since the last download")
+        return 0
+
+    with response:
+        new_records = [record for record in iter_activity_records(response.raw)
+                       if high_water_mark is None or record["activity_time"] > high_water_mark]
+
+    with engine.begin() as conn:
+        if new_records:
+            conn.execute(INSERT_ACTIVITY, new_records)
+        conn.execute(UPSERT_FEED_STATE, {
+            "feed_url": feed_url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "checked_at": datetime.now(timezone.utc)
+        })
+
+    logging.info("%s new aurora activity records stored", len(new_records))
+    return len(new_records)
+
+
+def load_recent_activity(engine: Engine, limit: int = RECENT_RECORDS) -> pd.DataFrame:
+    """
+    Returns the most recent stored activity, oldest first, in the same shape as
+    extract_activity_data so find_most_recent_status_info can read it
+    """
+    with engine.connect() as conn:
+        activity = pd.read_sql(
+            text("SELECT activity_time, status_id, value FROM aurora_activity "
+                 "ORDER BY activity_time DESC LIMIT :limit"),
+            conn, params={"limit": limit}, parse_dates={"activity_time": {"utc": True}})
+
+    if activity.empty:
+        raise RuntimeError("No aurora activity stored")
+
+    activity = activity.iloc[::-1].reset_index(drop=True)
+    return pd.DataFrame({
+        "@status_id": activity["status_id"],
+        "datetime": activity["activity_time"].dt.strftime(ACTIVITY_DATETIME_FORMAT),
+        "value": activity["value"]
+    })
+
+
+def handler(event, context):
+    """handler function for lambda function"""
+    try:
+        records_added = ingest_activity()
+        logging.info("%s : Lambda time remaining in MS: %s", event,
+                     context.get_remaining_time_in_millis())
+        return {"statusCode": 200, "records": records_added}
+    except RuntimeError as e:
+        return {"statusCode": 500, "error": str(e)}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(message)s"
+    )
+
+    load_dotenv()
+    ingest_activity()
@@ -1,28 +1,41 @@
-"""Lambda handler script to detect a red status from the aurora API"""
+"""Lambda handler script to detect the aurora status rising to an alerting colour"""
 
-from src.aurora_etl import extract_activity_data, find_most_recent_status_info, is_red_colour_status
+import os
+from datetime import datetime
 
+from src.aurora_alerts import (check_for_alert, parse_alert_cooldowns,
+                               FileStateStore, DatabaseStateStore)
+from src.aurora_etl import ACTIVITY_DATETIME_FORMAT
+from src.aurora_history import load_recent_activity
+from src.database import get_engine
+
+
+def get_state_store(engine) -> FileStateStore | DatabaseStateStore:
+    """Returns the file store at ALERT_STATE_PATH if it is set, otherwise the database store"""
+    state_path = os.getenv("ALERT_STATE_PATH")
+    if state_path:
+        return FileStateStore(state_path)
+    return DatabaseStateStore(engine)
 
 
 def handler(event=None, context=None):
-    """Handler function to check for a red status colour from the aurora API"""
-
-    url = "http://aurorawatch-api.lancs.ac.uk/0.2.5/status/project/awn/sum-activity.xml"
-
-    status_description_dict = {
-        "Green": "No significant activity. Aurora is unlikely to be visible by "
-        "eye or camera from anywhere in the UK.",
-        "Yellow": "Minor geomagnetic activity. Aurora may be visible by eye from Scotland "
-        "and may be visible by camera from Scotland, northern England and Northern Ireland.",
-        "Amber": "Amber alert: possible aurora. Aurora is likely to be visible by eye from "
-        "Scotland, northern England and Northern Ireland possibly visible from elsewhere in "
-        "the UK. Photographs of aurora are likely from anywhere in the UK.",
-        "Red": "Red alert: aurora likely. It is likely that aurora will be visible by eye "
-        "and camera from anywhere in the UK."}
-
-    activity_data = extract_activity_data(url)
-    status_colour = find_most_recent_status_info(status_description_dict, activity_data)[0]
-
-    if is_red_colour_status(status_colour):
-        return {"Result": "True"}
-    return {"Result": "False"}
+    """
+    Handler function returning a True result only when the latest status has just risen to
+    an alerting colour, so a long alert period triggers one email rather than one per run
+    Alerting colours and their cooldowns in hours can be set like "Amber:6,Red:3"
+    with AURORA_ALERT_COOLDOWNS
+    """
+    engine = get_engine()
+    latest_activity = load_recent_activity(engine, limit=1)
+    status_colour = latest_activity["@status_id"].iloc[-1].title()
+    status_time = datetime.strptime(latest_activity["datetime"].iloc[-1],
+                                    ACTIVITY_DATETIME_FORMAT)
+
+    cooldowns_setting = os.getenv("AURORA_ALERT_COOLDOWNS")
+    cooldowns = parse_alert_cooldowns(cooldowns_setting) if cooldowns_setting else None
+
+    result = {"Status": status_colour,
+              "StatusTime": status_time.strftime("%H:%M, %a %d %b")}
+    if check_for_alert(get_state_store(engine), status_colour, status_time, cooldowns):
+        return {"Result": "True", **result}
+    return {"Result": "False", **result}
@@ -0,0 +1,41 @@
+"""
+Formats stored coordinates as the sexagesimal strings the Astronomy API gives with them
+Whole columns are formatted at once, so the strings don't need to be stored alongside the numbers
+"""
+import numpy as np
+import pandas as pd
+
+# Decimal places the Astronomy API gives coordinates to, which its strings are made from
+COORDINATE_DECIMALS = 2
+
+
+def split_sexagesimal(values: pd.Series, truncate: bool) -> tuple[list, list, list]:
+    """
+    Returns the whole units, minutes and seconds of each value, with negative values
+    counting up from the unit below, e.g. -0.27 is -1 unit, 43 minutes and 48 seconds
+    Seconds are truncated or rounded to match the API, which does each for different coordinates
+    """
+    # Undoes any error from storing the values as REAL before splitting them
+    seconds = np.round(values.to_numpy(dtype=float), COORDINATE_DECIMALS) * 3600
+    seconds = np.floor(seconds) if truncate else np.round(seconds)
+    # NaN is kept out of the integer arithmetic and masked again afterwards
+    seconds = np.nan_to_num(seconds).astype(np.int64)
+
+    units, remainder = np.divmod(seconds, 3600)
+    minutes, seconds = np.divmod(remainder, 60)
+    # Python ints format far faster one by one than pandas string columns concatenate
+    return units.tolist(), minutes.tolist(), seconds.tolist()
+
+
+def format_hours(hours: pd.Series) -> pd.Series:
+    """Formats right ascensions in hours like the API, e.g. 9.35 as 09h 21m 00s"""
+    formatted = [f"{whole_hours:02d}h {minutes:02d}m {seconds:02d}s"
+                 for whole_hours, minutes, seconds in zip(*split_sexagesimal(hours, truncate=True))]
+    return pd.Series(formatted, index=hours.index, dtype=object).where(hours.notna(), None)
+
+
+def format_degrees(degrees: pd.Series) -> pd.Series:
+    """Formats angles in degrees like the API, e.g. -12.47 as -13° 31' 48\""""
+    formatted = [f"{whole_degrees}° {minutes}' {seconds}\"" for whole_degrees, minutes, seconds
+                 in zip(*split_sexagesimal(degrees, truncate=False))]
+    return pd.Series(formatted, index=degrees.index, dtype=object).where(degrees.notna(), None)
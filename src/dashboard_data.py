@@ -0,0 +1,200 @@
+"""
+Cached data fetchers for the dashboard
+Streamlit re-executes the dashboard script on every interaction but imported modules persist,
+so these caches are shared by every session in the process
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from functools import lru_cache
+
+import numpy as np
+
+import pandas as pd
+from sqlalchemy import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.apod_archive import load_apod_history
+from src.apod_image_store import ApodImageStore
+from src.astronomy_utils import REGIONS, make_request_headers
+from src.aurora_history import load_recent_activity
+from src.dashboard_queries import get_planetary_body_data
+from src.extract_nasa import get_image_details
+from src.iss_etl import get_iss_lat_long_now, get_iss_ground_track, get_passes
+from src.iss_passes import load_next_passes
+from src.moon_image_cache import MoonImageCache, make_key, round_coordinate
+from src.moon_phase_extract import get_moon_phase_image
+from src.moon_phase_render import render_moon_phase
+from src.neo_feed import load_neos
+from src.stargazing_score import get_best_windows
+from src.ttl_cache import ttl_cache
+from src.weather_snapshot import load_region_weather
+
+MOON_PHASE_URL = "https://api.astronomyapi.com/api/v2/studio/moon-phase"
+# Where moon phase images come from: the Astronomy API, or drawn locally with no external calls
+MOON_IMAGE_SOURCES = ("api", "local")
+MOON_STYLE = "default"
+# UTC hour the locally drawn moon is shown at, in the evening when people are looking
+MOON_RENDER_HOUR = 21
+
+# Shared pool the dashboard submits its independent fetches to, so they run concurrently
+SECTION_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="dashboard-fetch")
+
+# Cache lifetimes in seconds for each data source
+APOD_TTL = 24 * 60 * 60
+APOD_HISTORY_TTL = 60 * 60
+NEO_TTL = 60 * 60
+AURORA_TTL = 5 * 60
+ISS_POSITION_TTL = 5
+ISS_GROUND_TRACK_TTL = 60
+ISS_PASSES_TTL = 10 * 60
+MOON_PHASE_TTL = 24 * 60 * 60
+WEATHER_TTL = 15 * 60
+PLANETARY_DATA_TTL = 15 * 60
+STARGAZING_TTL = 15 * 60
+
+
+@ttl_cache(APOD_TTL, maxsize=8)
+def fetch_apod(url: str, apod_query_params: dict[str, str]) -> tuple[str, str, str]:
+    """Cached get_image_details, refreshed daily"""
+    return get_image_details(url, apod_query_params)
+
+
+@lru_cache
+def get_apod_image_store() -> ApodImageStore:
+    """Returns the process-wide APOD image store, in APOD_IMAGE_STORE_DIR if it is set"""
+    return ApodImageStore()
+
+
+def fetch_apod_image(image_url: str, rendition: str = "web") -> bytes:
+    """APOD image scaled down to a rendition's size, downloaded and scaled only the first time"""
+    return get_apod_image_store().get_rendition(image_url, rendition)
+
+
+@ttl_cache(APOD_HISTORY_TTL, maxsize=4)
+def fetch_apod_history(engine: Engine) -> pd.DataFrame:
+    """Cached latest pictures of the day from the database, refreshed hourly"""
+    return load_apod_history(engine)
+
+
+@ttl_cache(NEO_TTL, maxsize=32)
+def fetch_neos(
+    engine: Engine,
+    approach_date: str,
+    hazardous_only: bool = False,
+    max_miss_distance_km: float = None,
+    min_velocity_kmph: float = None,
+    sort_by: str = "miss_distance_km",
+    descending: bool = False
+) -> list[dict[str, str]]:
+    """Cached filtered and sorted Near-Earth objects from the database, refreshed hourly"""
+    return load_neos(engine, approach_date, hazardous_only, max_miss_distance_km,
+                     min_velocity_kmph, sort_by, descending).to_dict("records")
+
+
+@ttl_cache(AURORA_TTL, maxsize=4)
+def fetch_aurora_activity(engine: Engine) -> pd.DataFrame:
+    """Cached recent aurora activity from the database, refreshed every few minutes"""
+    return load_recent_activity(engine)
+
+
+@ttl_cache(ISS_POSITION_TTL, maxsize=1)
+def fetch_iss_position() -> tuple[float, float]:
+    """Cached get_iss_lat_long_now, refreshed every few seconds"""
+    return get_iss_lat_long_now()
+
+
+@ttl_cache(ISS_GROUND_TRACK_TTL, maxsize=1)
+def fetch_iss_ground_track() -> pd.DataFrame:
+    """Cached get_iss_ground_track, refreshed every minute"""
+    return get_iss_ground_track()
+
+
+@ttl_cache(ISS_PASSES_TTL, maxsize=len(REGIONS))
+def fetch_iss_passes(engine: Engine, region_name: str, n: int = 1) -> dict:
+    """
+    Cached next passes for one region from the stored predictions
+    Predicts them directly if none are stored, e.g. before the pass table is first filled
+    """
+    try:
+        return load_next_passes(engine, region_name, n)
+    except (RuntimeError, SQLAlchemyError):
+        region = REGIONS[region_name]
+        return get_passes(lat=region["lat"], lon=region["lon"], n=n)
+
+
+@lru_cache
+def get_moon_image_cache() -> MoonImageCache:
+    """Returns the process-wide moon image cache, in MOON_IMAGE_CACHE_DIR if it is set"""
+    return MoonImageCache()
+
+
+@ttl_cache(MOON_PHASE_TTL, maxsize=len(REGIONS))
+def fetch_moon_phase_image(latitude: float, longitude: float,
+                           image_date: str) -> bytes | np.ndarray:
+    """
+    Cached moon phase image for one region and date
+    Drawn locally if MOON_IMAGE_SOURCE is "local", otherwise read from the disk cache,
+    which is shared by every region rounding to the same point, or the Astronomy API
+    Raises RuntimeError instead of returning the error message, so failures aren't cached
+    """
+    source = os.getenv("MOON_IMAGE_SOURCE", "api")
+    if source not in MOON_IMAGE_SOURCES:
+        raise ValueError(f"Unknown moon image source {source}, "
+                         f"expected one of {MOON_IMAGE_SOURCES}")
+
+    if source == "local":
+        return render_moon_phase(latitude, longitude, datetime.fromisoformat(image_date).replace(
+            hour=MOON_RENDER_HOUR, tzinfo=timezone.utc))
+
+    cache = get_moon_image_cache()
+    key = make_key(image_date, latitude, longitude, MOON_STYLE)
+    image = cache.get(key)
+    if image is not None:
+        return image
+
+    image = get_moon_phase_image(
+        round_coordinate(latitude),
+        round_coordinate(longitude),
+        image_date,
+        make_request_headers(),
+        MOON_PHASE_URL,
+        MOON_STYLE
+    )
+    if not isinstance(image, bytes):
+        raise RuntimeError(image or "Failed to fetch moon phase image")
+    cache.set(key, image)
+    return image
+
+
+@ttl_cache(WEATHER_TTL, maxsize=len(REGIONS))
+def fetch_region_weather(
+    engine: Engine,
+    region_name: str
+) -> tuple[tuple[float], pd.DataFrame, pd.DataFrame]:
+    """Cached weather snapshot for one region, read from the database rather than Open-Meteo"""
+    return load_region_weather(engine, region_name)
+
+
+@ttl_cache(PLANETARY_DATA_TTL, maxsize=64)
+def fetch_planetary_body_data(
+    engine: Engine,
+    planetary_body_name: str,
+    latitude: float,
+    longitude: float,
+    today: date
+) -> pd.DataFrame:
+    """Cached week of positions for one body, keyed by day so the window moves at midnight"""
+    return get_planetary_body_data(engine, planetary_body_name,
+                                   latitude, longitude, start_date=today)
+
+
+@ttl_cache(STARGAZING_TTL, maxsize=4)
+def fetch_best_windows(engine: Engine, start_hour: datetime) -> pd.DataFrame:
+    """Cached best stargazing windows across the regions, keyed by hour so they move on"""
+    try:
+        aurora_status = fetch_aurora_activity(engine)["@status_id"].iloc[-1].title()
+    except (RuntimeError, SQLAlchemyError):
+        # The windows are still worth showing without the aurora bonus
+        aurora_status = None
+    return get_best_windows(engine, REGIONS, start=start_hour, aurora_status=aurora_status)
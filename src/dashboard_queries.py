@@ -0,0 +1,58 @@
+"""Parameterised queries returning only the rows each dashboard view renders"""
+from datetime import date, timedelta
+
+import pandas as pd
+from sqlalchemy import text, Engine
+
+# Number of days from today shown in the planetary position tables
+WEEK_DAYS = 6
+
+PLANETARY_BODY_QUERY = text("""
+    SELECT
+        planetary_body_name,
+        date,
+        constellation_name,
+        astronomical_units,
+        right_ascension_hours,
+        declination_degrees,
+        altitude_degrees,
+        azimuth_degrees
+    FROM planetary_body_forecast
+    WHERE planetary_body_name = :planetary_body_name
+        AND latitude = :latitude
+        AND longitude = :longitude
+        AND date BETWEEN :start_date AND :end_date
+    ORDER BY date;
+""")
+
+
+def get_planetary_body_data(
+    engine: Engine,
+    planetary_body_name: str,
+    latitude: float,
+    longitude: float,
+    start_date: date = None,
+    end_date: date = None
+) -> pd.DataFrame:
+    """
+    Returns one body's positions and distances seen from one location over a date window
+    The window defaults to today and the following week
+    """
+    if start_date is None:
+        start_date = date.today()
+    if end_date is None:
+        end_date = start_date + timedelta(days=WEEK_DAYS)
+
+    with engine.connect() as conn:
+        return pd.read_sql(
+            PLANETARY_BODY_QUERY,
+            conn,
+            params={
+                "planetary_body_name": planetary_body_name,
+                "start_date": start_date,
+                "end_date": end_date,
+                "latitude": latitude,
+                "longitude": longitude
+            },
+            parse_dates=["date"]
+        )
@@ -0,0 +1,72 @@
+"""
+Shared database connection management for the pipelines and the dashboard
+One pooled engine is created per process and reused by every caller
+"""
+import os
+import logging
+from functools import lru_cache
+
+from sqlalchemy import create_engine, Engine
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 2
+# Recycle connections before RDS or a NAT gateway drops them as idle
+DEFAULT_POOL_RECYCLE_SECONDS = 1800
+
+
+def get_env(name: str) -> str:
+    """
+    Returns a database setting from the environment
+    The pipelines use upper case names (DB_USER) and the dashboard's .env uses
+    lower case ones (db_username), so both are accepted
+    """
+    dashboard_names = {
+        "DB_USER": "db_username",
+        "DB_PASSWORD": "db_password",
+        "DB_NAME": "db_name",
+        "DB_PORT": "db_port",
+        "DB_HOST": "db_host"
+    }
+    return os.getenv(name, os.getenv(dashboard_names.get(name, name.lower())))
+
+
+def get_database_url() -> str:
+    """
+    Builds the connection url for the starwatch RDS database
+    Assumes a .env has been loaded with the appropriate keys
+    DATABASE_URL is used instead if it is set, to point the pipelines at a local database
+    """
+    if os.getenv("DATABASE_URL"):
+        return os.getenv("DATABASE_URL")
+
+    # String concatenation for connection url
+    return (
+        f"postgresql+psycopg2://{get_env('DB_USER')}:{get_env('DB_PASSWORD')}"
+        + f"@{get_env('DB_HOST')}:{get_env('DB_PORT') or 5432}/{get_env('DB_NAME')}"
+    )
+
+
+@lru_cache(maxsize=None)
+def create_pooled_engine(url: str, pool_size: int, max_overflow: int, pre_ping: bool) -> Engine:
+    """Creates an engine once for each distinct set of settings in this process"""
+    logging.info("Creating database engine with a pool of %s", pool_size)
+    return create_engine(
+        url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=pre_ping,
+        pool_recycle=DEFAULT_POOL_RECYCLE_SECONDS
+    )
+
+
+def get_engine(pool_size: int = None, max_overflow: int = None, pre_ping: bool = True) -> Engine:
+    """
+    Returns the process-wide engine for the starwatch RDS database
+    Pool size and overflow default to DB_POOL_SIZE and DB_MAX_OVERFLOW if they are set
+    """
+    if pool_size is None:
+        pool_size = int(os.getenv("DB_POOL_SIZE", str(DEFAULT_POOL_SIZE)))
+    if max_overflow is None:
+        max_overflow = int(os.getenv("DB_MAX_OVERFLOW", str(DEFAULT_MAX_OVERFLOW)))
+
+    return create_pooled_engine(get_database_url(), pool_size, max_overflow, pre_ping)
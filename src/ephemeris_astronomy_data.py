@@ -0,0 +1,251 @@
+'''
+Computes planetary body positions locally with ephem instead of calling the Astronomy API
+Output matches the JSON shape returned by the Astronomy API bodies/positions endpoint
+'''
+import json
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Tuple
+
+import ephem
+import pandas as pd
+
+FIXTURE_PATH = "data/astronomy_test_data.json"
+
+# Bodies in the same order as the Astronomy API response
+BODY_NAMES = ["Sun", "Moon", "Mercury", "Venus", "Earth", "Mars",
+              "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"]
+
+KM_PER_AU = 149597870.7
+EARTH_RADIUS_KM = 6371.0
+
+# ephem constellation names that are spelt differently in the constellation table
+CONSTELLATION_NAMES = {"Bootes": "Boötes"}
+
+
+def split_sexagesimal(value: float) -> Tuple[int, int, int]:
+    '''
+    Splits a value into whole units, minutes and seconds
+    Units are floored so negative values read like the API's e.g. -12.47 is -13° 31' 48"
+    '''
+    total_seconds = round(value * 3600)
+    units, remainder = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return units, minutes, seconds
+
+
+def format_hours(hours: float) -> str:
+    '''Formats hours the way the API does e.g. 09h 21m 00s'''
+    whole_hours, minutes, seconds = split_sexagesimal(hours)
+    return f"{whole_hours:02d}h {minutes:02d}m {seconds:02d}s"
+
+
+def format_degrees(degrees: float) -> str:
+    '''Formats degrees the way the API does e.g. 15° 30' 36"'''
+    whole_degrees, minutes, seconds = split_sexagesimal(degrees)
+    return f"{whole_degrees}° {minutes}' {seconds}\""
+
+
+def make_cell(
+    body_name: str,
+    when: datetime,
+    ra_hours: float,
+    dec_degrees: float,
+    alt_degrees: float,
+    az_degrees: float,
+    distance_au: float,
+    constellation: Tuple[str, str]
+) -> Dict:
+    '''Builds one API-shaped table cell, with values rounded like the API's'''
+    # The API formats its strings from the rounded values
+    ra_hours = round(ra_hours, 2)
+    dec_degrees = round(dec_degrees, 2)
+    alt_degrees = round(alt_degrees, 2)
+    az_degrees = round(az_degrees, 2) % 360
+
+    short_name, name = constellation
+    horizontal = {
+        "altitude": {
+            "degrees": f"{alt_degrees:.2f}",
+            "string": format_degrees(alt_degrees)
+        },
+        "azimuth": {
+            "degrees": f"{az_degrees:.2f}",
+            "string": format_degrees(az_degrees)
+        }
+    }
+
+    return {
+        "date": when.isoformat(timespec="milliseconds"),
+        "id": body_name.lower(),
+        "name": body_name,
+        "distance": {
+            "fromEarth": {
+                "au": f"{distance_au:.5f}",
+                "km": f"{distance_au * KM_PER_AU:.5f}"
+            }
+        },
+        "position": {
+            "horizontal": horizontal,
+            "equatorial": {
+                "rightAscension": {
+                    "hours": f"{ra_hours:.2f}",
+                    "string": format_hours(ra_hours)
+                },
+                "declination": {
+                    "degrees": f"{dec_degrees:.2f}",
+                    "string": format_degrees(dec_degrees)
+                }
+            },
+            "constellation": {
+                "id": short_name.lower(),
+                "short": short_name,
+                "name": CONSTELLATION_NAMES.get(name, name)
+            }
+        }
+    }
+
+
+def compute_cell(body_name: str, observer: ephem.Observer, when: datetime) -> Dict:
+    '''Computes the position of one body for an observer at the given UTC time'''
+    observer.date = when
+
+    if body_name == "Earth":
+        # Seen from the surface, the Earth's centre is straight down at the nadir
+        ra = (observer.sidereal_time() + math.pi) % (2 * math.pi)
+        dec = -float(observer.lat)
+        return make_cell(
+            body_name, when,
+            math.degrees(ra) / 15, math.degrees(dec),
+            -90.0, 0.0,
+            EARTH_RADIUS_KM / KM_PER_AU,
+            ephem.constellation((ra, dec))
+        )
+
+    body = getattr(ephem, body_name)(observer)
+    return make_cell(
+        body_name, when,
+        math.degrees(body.a_ra) / 15, math.degrees(body.a_dec),
+        math.degrees(body.alt), math.degrees(body.az),
+        body.earth_distance,
+        ephem.constellation(body)
+    )
+
+
+def make_observer(coordinates: Dict[str, float]) -> ephem.Observer:
+    '''Returns an ephem observer at sea level for the given lat/lon'''
+    observer = ephem.Observer()
+    observer.lat = str(coordinates["lat"])
+    observer.lon = str(coordinates["lon"])
+    observer.elevation = 0
+    return observer
+
+
+def get_local_planetary_positions(
+    coordinates: Dict[str, float],
+    dates: Dict[str, datetime.date],
+    time: str = str(datetime.now().time().strftime("%H:%M:%S"))
+) -> Dict:
+    '''
+    Computes the planetary positions for each day in the date range at the given UTC time
+    Drop-in replacement for get_planetary_positions that makes no network calls
+    '''
+    observer = make_observer(coordinates)
+    start_time = datetime.strptime(time, "%H:%M:%S").time()
+
+    times = []
+    current = dates["start"]
+    while current <= dates["end"]:
+        times.append(datetime.combine(current, start_time, tzinfo=timezone.utc))
+        current += timedelta(days=1)
+
+    header = [when.isoformat(timespec="milliseconds") for when in times]
+    rows = [
+        {
+            "entry": {"id": body_name.lower(), "name": body_name},
+            "cells": [compute_cell(body_name, observer, when) for when in times]
+        }
+        for body_name in BODY_NAMES
+    ]
+
+    logging.info("Planetary Positions Computed Locally")
+    return {
+        "data": {
+            "dates": {"from": header[0], "to": header[-1]} if header else {},
+            "observer": {
+                "location": {
+                    "longitude": coordinates["lon"],
+                    "latitude": coordinates["lat"],
+                    "elevation": 0
+                }
+            },
+            "table": {"header": header, "rows": rows}
+        }
+    }
+
+
+def angular_separation(lon_1: float, lat_1: float, lon_2: float, lat_2: float) -> float:
+    '''Returns the angle between two points on a sphere, all in degrees'''
+    return math.degrees(ephem.separation(
+        (math.radians(lon_1), math.radians(lat_1)),
+        (math.radians(lon_2), math.radians(lat_2))
+    ))
+
+
+def cross_check(api_data: Dict) -> pd.DataFrame:
+    '''
+    Recomputes every cell of a recorded Astronomy API response locally
+    Returns the angular deviation in degrees of the equatorial and horizontal positions,
+    the distance difference in AU and whether the constellations agree
+    '''
+    location = api_data["data"]["observer"]["location"]
+    observer = make_observer({"lat": location["latitude"],
+                              "lon": location["longitude"]})
+
+    deviations = []
+    for row in api_data["data"]["table"]["rows"]:
+        for api_cell in row["cells"]:
+            when = datetime.fromisoformat(
+                api_cell["date"]).astimezone(timezone.utc)
+            local_cell = compute_cell(row["entry"]["name"], observer, when)
+
+            api_position = api_cell["position"]
+            local_position = local_cell["position"]
+            deviations.append({
+                "date": api_cell["date"].split("T")[0],
+                "planetary_body": row["entry"]["name"],
+                "equatorial_deviation_degrees": angular_separation(
+                    float(api_position["equatorial"]["rightAscension"]["hours"]) * 15,
+                    float(api_position["equatorial"]["declination"]["degrees"]),
+                    float(local_position["equatorial"]["rightAscension"]["hours"]) * 15,
+                    float(local_position["equatorial"]["declination"]["degrees"])
+                ),
+                "horizontal_deviation_degrees": angular_separation(
+                    float(api_position["horizontal"]["azimuth"]["degrees"]),
+                    float(api_position["horizontal"]["altitude"]["degrees"]),
+                    float(local_position["horizontal"]["azimuth"]["degrees"]),
+                    float(local_position["horizontal"]["altitude"]["degrees"])
+                ),
+                "distance_difference_au": abs(
+                    float(api_cell["distance"]["fromEarth"]["au"])
+                    - float(local_cell["distance"]["fromEarth"]["au"])
+                ),
+                "constellation_matches": (api_position["constellation"]["name"]
+                                          == local_position["constellation"]["name"])
+            })
+
+    return pd.DataFrame(deviations)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(message)s"
+    )
+
+    with open(FIXTURE_PATH, "r", encoding="utf-8") as f:
+        report = cross_check(json.load(f))
+
+    print(report.to_string(index=False))
+    print(report.describe().to_string())
@@ -1,31 +1,31 @@
 '''Extracts moon phase and planetary body information from Astronomy API'''
 import logging
-from typing import Dict
-from datetime import datetime, timedelta
-import os
-import json
+from typing import Dict, Iterator, List, Tuple
+from datetime import datetime, timedelta, date
 import requests
 import psycopg2
+from sqlalchemy.exc import OperationalError
 from dotenv import load_dotenv
 from src.astronomy_utils import make_request_headers
+from src.database import get_engine
+from src.transform_astronomy_data import iter_records
+
+# Number of days ahead of today that the backfill keeps complete
+BACKFILL_HORIZON_DAYS = 7
 
 
 def get_db_connection() -> psycopg2.extensions.connection:
     """
-    Returns a connection to the starwatch RDS database
+    Returns a connection to the starwatch RDS database, borrowed from the shared pool
+    Closing it hands it back to the pool for the load step to reuse
     Assumes a .env has been loaded with the appropriate keys
     """
     try:
-        conn_string = f"""
-        host='{os.getenv("DB_HOST")}'
-        dbname='{os.getenv("DB_NAME")}'
-        user='{os.getenv("DB_USER")}'
-        password='{os.getenv("DB_PASSWORD")}'
-        """
+        connection = get_engine().raw_connection()
         logging.info("Connection to RDS Established")
-        return psycopg2.connect(conn_string)
+        return connection
 
-    except psycopg2.OperationalError as e:
+    except OperationalError as e:
         logging.debug("Failed to Connect to RDS")
         raise RuntimeError(f"Database connection failed: {e}") from e
 
@@ -71,20 +71,108 @@ def get_date_range(conn) -> Dict[str, datetime.date]:
     return date_range
 
 
+def find_missing_dates(
+    conn: psycopg2.extensions.connection,
+    locations: List[Dict[str, float]],
+    horizon_days: int = BACKFILL_HORIZON_DAYS,
+    lookback_days: int = 0
+) -> Dict[Tuple[float, float], List[date]]:
+    """
+    Finds the dates in the horizon that are missing a forecast or distance row
+    for any planetary body at each location
+    Returns the missing dates in order for every (lat, lon) pair that has a gap
+    """
+    today = datetime.now().date()
+    cursor = conn.cursor()
+    cursor.execute("""
+        WITH locations AS (
+            SELECT * FROM unnest(%s::float[], %s::float[]) AS loc(latitude, longitude)
+        ),
+        days AS (
+            SELECT generate_series(%s::date, %s::date, interval '1 day')::date AS date
+        ),
+        expected AS (
+            SELECT l.latitude, l.longitude, d.date, pb.planetary_body_id
+            FROM locations l
+            CROSS JOIN days d
+            CROSS JOIN planetary_body pb
+        )
+        SELECT DISTINCT e.latitude, e.longitude, e.date
+        FROM expected e
+        LEFT JOIN forecast f
+            ON f.planetary_body_id = e.planetary_body_id
+            AND f.date = e.date
+            AND f.latitude = e.latitude
+            AND f.longitude = e.longitude
+        LEFT JOIN distance d
+            ON d.planetary_body_id = e.planetary_body_id
+            AND d.date = e.date
+        WHERE f.forecast_id IS NULL OR d.distance_id IS NULL
+        ORDER BY e.latitude, e.longitude, e.date;
+    """, (
+        [location["lat"] for location in locations],
+        [location["lon"] for location in locations],
+        today - timedelta(days=lookback_days),
+        today + timedelta(days=horizon_days)
+    ))
+
+    missing_dates = {}
+    for latitude, longitude, missing_date in cursor.fetchall():
+        missing_dates.setdefault((latitude, longitude), []).append(missing_date)
+    return missing_dates
+
+
+def group_date_ranges(dates: List[date]) -> List[Dict[str, date]]:
+    """Groups dates into the fewest contiguous start/end ranges that cover them"""
+    date_ranges = []
+    for current in sorted(set(dates)):
+        if date_ranges and current - date_ranges[-1]["end"] == timedelta(days=1):
+            date_ranges[-1]["end"] = current
+        else:
+            date_ranges.append({"start": current, "end": current})
+    return date_ranges
+
+
+def get_backfill_requests(
+    conn: psycopg2.extensions.connection,
+    locations: List[Dict[str, float]],
+    horizon_days: int = BACKFILL_HORIZON_DAYS,
+    lookback_days: int = 0
+) -> List[Tuple[Dict[str, float], Dict[str, date]]]:
+    """
+    Determines the Astronomy API requests needed to fill every gap in the tables
+    Returns (coordinates, date range) pairs, one per contiguous run of missing dates
+    """
+    missing_dates = find_missing_dates(
+        conn, locations, horizon_days, lookback_days)
+
+    backfill_requests = [
+        ({"lat": latitude, "lon": longitude}, date_range)
+        for (latitude, longitude), dates in missing_dates.items()
+        for date_range in group_date_ranges(dates)
+    ]
+
+    logging.info("%s backfill requests needed for %s locations with gaps",
+                 len(backfill_requests), len(missing_dates))
+    return backfill_requests
+
+
 def get_planetary_positions(
     coordinates: Dict[str, float],
     dates: Dict[str, datetime.date],
     header: Dict[str, str],
-    time: str = str(datetime.now().time().strftime("%H:%M:%S"))
+    time: str = str(datetime.now().time().strftime("%H:%M:%S")),
+    session: requests.Session = None
 ) -> Dict:
     '''
     Gets information on planetary bodies from current day
     to next 7 days and saves it to a file as JSON
+    Reuses the given session's connection pool if one is provided
     '''
 
     planetary_positions_url = get_positions_url(coordinates, dates, time)
 
-    response = requests.get(
+    response = (session or requests).get(
         planetary_positions_url,
         headers=header,
         timeout=20
@@ -101,6 +189,60 @@ def get_planetary_positions(
     raise RuntimeError(f"Error {response.status_code}, {response.json()}")
 
 
+def stream_planetary_positions(
+    coordinates: Dict[str, float],
+    dates: Dict[str, datetime.date],
+    header: Dict[str, str],
+    time: str = str(datetime.now().time().strftime("%H:%M:%S")),
+    session: requests.Session = None
+) -> Iterator[dict]:
+    '''
+    Streaming version of get_planetary_positions
+    Yields filtered records as the response body arrives instead of parsing it all at once
+    '''
+    planetary_positions_url = get_positions_url(coordinates, dates, time)
+
+    with (session or requests).get(
+        planetary_positions_url,
+        headers=header,
+        timeout=20,
+        stream=True
+    ) as response:
+        if response.status_code != 200:
+            raise RuntimeError(f"Error {response.status_code}, {response.text}")
+
+        logging.info("Streaming Planetary Position Info")
+        # Let urllib3 undo any gzip encoding while ijson reads the body
+        response.raw.decode_content = True
+        yield from iter_records(response.raw)
+
+
+def download_planetary_positions(
+    coordinates: Dict[str, float],
+    dates: Dict[str, datetime.date],
+    header: Dict[str, str],
+    file_path: str,
+    time: str = str(datetime.now().time().strftime("%H:%M:%S"))
+) -> None:
+    '''Saves the raw API response to a file in chunks without parsing it'''
+    planetary_positions_url = get_positions_url(coordinates, dates, time)
+
+    with requests.get(
+        planetary_positions_url,
+        headers=header,
+        timeout=20,
+        stream=True
+    ) as response:
+        if response.status_code != 200:
+            raise RuntimeError(f"Error {response.status_code}, {response.text}")
+
+        with open(file_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=65536):
+                f.write(chunk)
+
+    logging.info("Planetary Position Info Saved to %s", file_path)
+
+
 def get_positions_url(
     coordinates: Dict[str, float],
     dates: Dict[str, datetime.date],
@@ -131,14 +273,12 @@ if __name__ == "__main__":
     load_dotenv()
     connection = get_db_connection()
 
-    data = get_planetary_positions(
+    download_planetary_positions(
         {  # coordinates dict
             "lat": +51.30,
             "lon": -00.05
         },
         get_date_range(connection),
-        make_request_headers()
+        make_request_headers(),
+        'astronomy_test_data.json'
     )
-
-    with open('astronomy_test_data.json', 'w', encoding="utf8") as f:
-        json.dump(data, f, indent=2)
@@ -1,6 +1,7 @@
 """Extracts the Astronomy Picture of the Day and Near-Earth Objects from the NASA API"""
 import os
 from datetime import date
+import pandas as pd
 import requests as reqs
 from dotenv import load_dotenv
 
@@ -29,6 +30,69 @@ def get_image_details(url: str, apod_query_params: dict[str, str]) -> tuple[str,
     return title, explanation, image_url
 
 
+APOD_COLUMNS = ["apod_date", "title", "explanation", "media_type", "image_url", "hd_image_url"]
+
+
+def get_apod_archive(url: str, api_key: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """Retrieves every APOD between two dates, inclusive, in a single request
+
+    Raises:
+        RuntimeError: If the API request fails."""
+    response = reqs.get(url, params={
+        "api_key": api_key,
+        "start_date": start_date,
+        "end_date": end_date
+    }, timeout=60)
+
+    if response.status_code != 200:
+        raise RuntimeError(
+            f"Failed to fetch APOD data: {response.status_code} - {response.text}")
+
+    archive = pd.DataFrame(response.json()).rename(columns={
+        "date": "apod_date", "url": "image_url", "hdurl": "hd_image_url"})
+    return archive.reindex(columns=APOD_COLUMNS)
+
+
+NEO_COLUMNS = ["neo_id", "approach_date", "name", "diameter_min_m", "diameter_max_m",
+               "hazardous", "miss_distance_km", "relative_velocity_kmph"]
+
+
+def parse_neo_feed(data: dict) -> pd.DataFrame:
+    """
+    Returns one row per object per day of a NeoWs feed response, with the close approach
+    data flattened and converted a column at a time rather than an object at a time
+    """
+    neos = [{**neo, "approach_date": approach_date}
+            for approach_date, day_neos in data.get("near_earth_objects", {}).items()
+            for neo in day_neos]
+    if not neos:
+        return pd.DataFrame(columns=NEO_COLUMNS)
+
+    # The feed only lists each object's close approach on the day it's listed under
+    approaches = pd.json_normalize(
+        neos,
+        record_path="close_approach_data",
+        meta=["id", "name", "approach_date", "is_potentially_hazardous_asteroid",
+              ["estimated_diameter", "meters", "estimated_diameter_min"],
+              ["estimated_diameter", "meters", "estimated_diameter_max"]],
+        errors="ignore"
+    )
+
+    return pd.DataFrame({
+        "neo_id": approaches["id"],
+        "approach_date": approaches["approach_date"],
+        "name": approaches["name"].str[1:-1],
+        "diameter_min_m": approaches["estimated_diameter.meters.estimated_diameter_min"]
+        .astype(float).round(1),
+        "diameter_max_m": approaches["estimated_diameter.meters.estimated_diameter_max"]
+        .astype(float).round(1),
+        "hazardous": approaches["is_potentially_hazardous_asteroid"].astype(bool),
+        "miss_distance_km": approaches["miss_distance.kilometers"].astype(float).round(1),
+        "relative_velocity_kmph": approaches["relative_velocity.kilometers_per_hour"]
+        .astype(float).round(1)
+    }, columns=NEO_COLUMNS)
+
+
 def get_neos(url: str, neo_query_params: dict[str, str], today: str) -> list[dict[str, str]]:
     """Retrieves the information of the objects near Earth today
 
@@ -40,33 +104,9 @@ def get_neos(url: str, neo_query_params: dict[str, str], today: str) -> list[dic
         raise RuntimeError(
             f"Failed to fetch NEO data: {response.status_code} - {response.text}")
 
-    data = response.json()
-    neos_today = data.get("near_earth_objects", {}).get(today, [])
-
-    neo_info = []
-    for neo in neos_today:
-        name = neo.get("name")[1:-1]
-        diameter_min = round(neo.get("estimated_diameter", {}).get(
-            "meters", {}).get("estimated_diameter_min"), 1)
-        diameter_max = round(neo.get("estimated_diameter", {}).get(
-            "meters", {}).get("estimated_diameter_max"), 1)
-        hazardous = neo.get("is_potentially_hazardous_asteroid")
-        approach_data = neo.get("close_approach_data", [{}])[0]
-        miss_distance_km = round(float(approach_data.get(
-            "miss_distance", {}).get("kilometers")), 1)
-        relative_velocity_kmph = round(float(approach_data.get(
-            "relative_velocity", {}).get("kilometers_per_hour")), 1)
-
-        neo_info.append({
-            "name": name,
-            "diameter_min_m": diameter_min,
-            "diameter_max_m": diameter_max,
-            "hazardous": hazardous,
-            "miss_distance_km": miss_distance_km,
-            "relative_velocity_kmph": relative_velocity_kmph
-        })
-
-    return neo_info
+    neos = parse_neo_feed(response.json())
+    neos_today = neos[neos["approach_date"] == today]
+    return neos_today.drop(columns=["neo_id", "approach_date"]).to_dict("records")
 
 
 if __name__ == "__main__":
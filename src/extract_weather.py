@@ -1,47 +1,195 @@
 """Extract script for the Open-Meteo API data"""
 
+import os
+import threading
 from datetime import datetime, timezone
+from functools import lru_cache
 
+import numpy as np
 import openmeteo_requests
 from openmeteo_sdk.WeatherApiResponse import WeatherApiResponse
 import pandas as pd
 import requests_cache
+from requests_cache.backends.base import BaseCache, DictStorage
 from retry_requests import retry
 
+# Backends the client can cache responses in, chosen with WEATHER_CACHE_BACKEND
+CACHE_BACKENDS = ("memory", "sqlite", "filesystem")
+DEFAULT_CACHE_BACKEND = "memory"
+CACHE_NAME = ".cache"
+# Most responses kept by the in-process cache, one per region per parameter set is plenty
+MEMORY_CACHE_SIZE = 64
+# Milliseconds a SQLite writer waits for a lock before giving up
+SQLITE_BUSY_TIMEOUT = 5000
+
+
+class LRUDictStorage(DictStorage):
+    """In-process response storage that evicts the least recently used response once full"""
+
+    def __init__(self, maxsize: int = MEMORY_CACHE_SIZE, *args, **kwargs):
+        self.maxsize = maxsize
+        self._lock = threading.RLock()
+        super().__init__(*args, **kwargs)
+
+    def __getitem__(self, key):
+        with self._lock:
+            item = super().__getitem__(key)
+            self.data[key] = self.data.pop(key)
+            return item
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self.data.pop(key, None)
+            self.data[key] = value
+            while len(self.data) > self.maxsize:
+                del self.data[next(iter(self.data))]
+
+
+class CacheStats:
+    """Thread-safe count of the client's cached and uncached responses"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def record(self, response) -> None:
+        """Counts whether a response came from the cache"""
+        with self._lock:
+            if getattr(response, "from_cache", False):
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def as_dict(self) -> dict[str, float]:
+        """Returns the counters and the hit rate"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+
+CACHE_STATS = CacheStats()
+
+
+# CachedSession can't be pickled on purpose, which pylint reads as an abstract method
+class CountingCachedSession(requests_cache.CachedSession):  # pylint: disable=abstract-method
+    """
+    Cached session that records every response it returns in CACHE_STATS
+    Counted in send rather than a response hook, as requests_cache runs the hooks
+    a second time for uncached responses
+    """
+
+    def send(self, request, *args, **kwargs):
+        response = super().send(request, *args, **kwargs)
+        CACHE_STATS.record(response)
+        return response
+
+
+def make_cache_backend(backend: str, cache_name: str = CACHE_NAME) -> BaseCache:
+    """
+    Returns the requests_cache backend for a backend name
+    memory is private to the process, sqlite uses WAL so readers never wait on the writer,
+    and filesystem stores one file per response so workers don't share a lock
+    """
+    if backend == "memory":
+        cache = BaseCache(cache_name)
+        cache.responses = LRUDictStorage()
+        return cache
+    if backend == "sqlite":
+        return requests_cache.SQLiteCache(cache_name, wal=True, busy_timeout=SQLITE_BUSY_TIMEOUT)
+    if backend == "filesystem":
+        return requests_cache.FileCache(cache_name)
+    raise ValueError(f"Unknown cache backend {backend}, expected one of {CACHE_BACKENDS}")
+
+
+@lru_cache(maxsize=None)
+def create_client(cache_expiry: int, backend: str) -> openmeteo_requests.Client:
+    """Creates a client once for each expiry and backend in this process"""
+    cache_session = CountingCachedSession(
+        backend=make_cache_backend(backend), expire_after=cache_expiry
+    )
+    retry_session = retry(cache_session, retries=5, backoff_factor=0.2)
+    return openmeteo_requests.Client(session=retry_session)
+
+
+def get_client(cache_expiry: int, backend: str = None) -> openmeteo_requests.Client:
+    """
+    Returns the process-wide Open-Meteo requests client for a cache expiry
+    The backend defaults to WEATHER_CACHE_BACKEND if it is set, otherwise memory
+    """
+    if backend is None:
+        backend = os.getenv("WEATHER_CACHE_BACKEND", DEFAULT_CACHE_BACKEND)
+    if backend not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown cache backend {backend}, expected one of {CACHE_BACKENDS}")
 
-def get_client(cache_expiry: int) -> openmeteo_requests.Client:
-    """Returns Open-Meteo requests client"""
     try:
-        cache_session = requests_cache.CachedSession(
-            '.cache', expire_after=cache_expiry
-        )
-        retry_session = retry(cache_session, retries=5, backoff_factor=0.2)
-        return openmeteo_requests.Client(session=retry_session)
-    
+        return create_client(cache_expiry, backend)
+
     except Exception:
         raise RuntimeError("Unable to return client")
 
 
+def get_cache_stats() -> dict[str, float]:
+    """Returns the hit/miss counters of every client in the process"""
+    return CACHE_STATS.as_dict()
+
+
+# Number of hours from the current hour returned by process_hourly_data
+HOURS_SHOWN = 24
+
+# Hourly and daily column names against their variable's index in WEATHER_PARAMS
+HOURLY_VARIABLES = {
+    "Temperature (°C)": 0,
+    "Relative Humidity (%)": 1,
+    "Precipitation (mm)": 2,
+    "Wind Speed (km/h)": 3,
+    "Wind Gusts (km/h)": 4,
+    "Visibility (m)": 5,
+    "Cloud Cover (%)": 6
+}
+
+DAILY_VARIABLES = {
+    "Maximum Wind Speed (km/h)": 2,
+    "Maximum Wind Gusts (km/h)": 3,
+    "Maximum Temperature (°C)": 4,
+    "Minimum Temperature (°C)": 5
+}
+
+WEATHER_URL = "https://api.open-meteo.com/v1/forecast"
+
+WEATHER_PARAMS = {
+    "daily": ["sunrise", "sunset", "wind_speed_10m_max", "wind_gusts_10m_max",
+              "temperature_2m_max", "temperature_2m_min"],
+    "hourly": ["temperature_2m", "relative_humidity_2m", "precipitation",
+               "wind_speed_10m", "wind_gusts_10m", "visibility", "cloud_cover",
+               "surface_pressure", "pressure_msl"],
+    "models": "ukmo_seamless",
+    "current": ["temperature_2m", "relative_humidity_2m", "wind_speed_10m",
+                "wind_gusts_10m", "precipitation", "cloud_cover"],
+    "timezone": "GMT",
+    "forecast_days": 7,
+}
+
+
+def get_responses(latitudes: list[float], longitudes: list[float],
+                  client: openmeteo_requests.Client) -> list[WeatherApiResponse]:
+    """Returns one response per location from a single request, in the order given"""
+    params = {"latitude": latitudes, "longitude": longitudes, **WEATHER_PARAMS}
+    try:
+        return client.weather_api(WEATHER_URL, params=params)
+    except Exception as e:
+        raise RuntimeError("Unable to get responses") from e
+
+
 def get_response(latitude: float, longitude: float,
                  client: openmeteo_requests.Client) -> WeatherApiResponse:
     """Returns a response, provided with latitude, longitude, and an Open-Meteo requests client"""
-    url = "https://api.open-meteo.com/v1/forecast"
-    params = {
-        "latitude": latitude,
-        "longitude": longitude,
-        "daily": ["sunrise", "sunset", "wind_speed_10m_max", "wind_gusts_10m_max",
-                  "temperature_2m_max", "temperature_2m_min"],
-        "hourly": ["temperature_2m", "relative_humidity_2m", "precipitation",
-                   "wind_speed_10m", "wind_gusts_10m", "visibility", "cloud_cover",
-                   "surface_pressure", "pressure_msl"],
-        "models": "ukmo_seamless",
-        "current": ["temperature_2m", "relative_humidity_2m", "wind_speed_10m",
-                    "wind_gusts_10m", "precipitation", "cloud_cover"],
-        "timezone": "GMT",
-        "forecast_days": 7,
-    }
     try:
-        return client.weather_api(url, params=params)[0]
+        return get_responses([latitude], [longitude], client)[0]
     except Exception:
         raise RuntimeError("Unable to get response")
 
@@ -64,32 +212,43 @@ def process_current_data(response: WeatherApiResponse) -> tuple[float]:
     except Exception:
         raise RuntimeError("Unable to return current weather data")
 
-def process_hourly_data(response: WeatherApiResponse) -> pd.DataFrame:
+def hourly_window(hourly, now: datetime = None, hours: int = HOURS_SHOWN) -> slice:
+    """
+    Returns the slice of an hourly response's values covering the given hours from now
+    The start is worked out from the response's own GMT timestamps rather than the local hour
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    start = max(int((now.timestamp() - hourly.Time()) // hourly.Interval()), 0)
+    return slice(start, start + hours)
+
+
+def make_hourly_dataframe(response: WeatherApiResponse,
+                          window: slice = slice(None)) -> pd.DataFrame:
+    """
+    Returns a dataframe of the hours of weather information in an API response within the window
+    Each variable's array is sliced before the dataframe is built, so only those rows are copied
+    """
+    hourly = response.Hourly()
+
+    hourly_data = {"Date": pd.date_range(
+        start=pd.to_datetime(hourly.Time(), unit="s", utc=True),
+        end=pd.to_datetime(hourly.TimeEnd(), unit="s", utc=True),
+        freq=pd.Timedelta(seconds=hourly.Interval()),
+        inclusive="left"
+    )[window]}
+    for column, index in HOURLY_VARIABLES.items():
+        hourly_data[column] = np.asarray(hourly.Variables(index).ValuesAsNumpy())[window]
+
+    return pd.DataFrame(data=hourly_data, copy=False)
+
+
+def process_hourly_data(response: WeatherApiResponse, now: datetime = None) -> pd.DataFrame:
     """Returns a dataframe containing 24 hours of weather information starting from 
     the current hour, from an API response.
     """
     try:
-        hourly = response.Hourly()
-
-        hourly_data = {"Date": pd.date_range(
-            start=pd.to_datetime(hourly.Time(), unit="s", utc=True),
-            end=pd.to_datetime(hourly.TimeEnd(), unit="s", utc=True),
-            freq=pd.Timedelta(seconds=hourly.Interval()),
-            inclusive="left"
-        )}
-        hourly_data["Temperature (°C)"]      = hourly.Variables(0).ValuesAsNumpy()
-        hourly_data["Relative Humidity (%)"] = hourly.Variables(1).ValuesAsNumpy()
-        hourly_data["Precipitation (mm)"]    = hourly.Variables(2).ValuesAsNumpy()
-        hourly_data["Wind Speed (km/h)"]     = hourly.Variables(3).ValuesAsNumpy()
-        hourly_data["Wind Gusts (km/h)"]     = hourly.Variables(4).ValuesAsNumpy()
-        hourly_data["Visibility (m)"]        = hourly.Variables(5).ValuesAsNumpy()
-        hourly_data["Cloud Cover (%)"]       = hourly.Variables(6).ValuesAsNumpy()
-
-        hourly_dataframe = pd.DataFrame(data=hourly_data)
-
-        # Determines current hour and slices the df from this point +24 hours
-        current_hour = datetime.now().hour
-        return hourly_dataframe.iloc[current_hour:current_hour+24]
+        return make_hourly_dataframe(response, hourly_window(response.Hourly(), now))
     
     except Exception:
         raise RuntimeError("Unable to return hourly weather data")
@@ -100,6 +259,12 @@ def convert_unix_timestamp(unix_timestamp: int) -> str:
     return datetime.fromtimestamp(unix_timestamp, timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
 
 
+def convert_unix_timestamps(unix_timestamps: np.ndarray) -> pd.Index:
+    """Returns an array of unix timestamps as datetime strings, like convert_unix_timestamp"""
+    return pd.to_datetime(np.asarray(unix_timestamps), unit="s", utc=True).strftime(
+        '%Y-%m-%d %H:%M:%S')
+
+
 def process_daily_data(response: WeatherApiResponse) -> pd.DataFrame:
     """Returns a dataframe for daily averages of weather data from an API response"""
     try:
@@ -110,18 +275,12 @@ def process_daily_data(response: WeatherApiResponse) -> pd.DataFrame:
             freq=pd.Timedelta(seconds=daily.Interval()),
             inclusive="left"
         )}
-        daily_data["Sunrise"]                   = daily.Variables(0).ValuesInt64AsNumpy()
-        daily_data["Sunset"]                    = daily.Variables(1).ValuesInt64AsNumpy()
-        daily_data["Maximum Wind Speed (km/h)"] = daily.Variables(2).ValuesAsNumpy()
-        daily_data["Maximum Wind Gusts (km/h)"] = daily.Variables(3).ValuesAsNumpy()
-        daily_data["Maximum Temperature (°C)"]  = daily.Variables(4).ValuesAsNumpy()
-        daily_data["Minimum Temperature (°C)"]  = daily.Variables(5).ValuesAsNumpy()
-
-        df = pd.DataFrame(data=daily_data)
-        df["Sunrise"] = df["Sunrise"].apply(convert_unix_timestamp)
-        df["Sunset"] = df["Sunset"].apply(convert_unix_timestamp)
-
-        return df
+        daily_data["Sunrise"] = convert_unix_timestamps(daily.Variables(0).ValuesInt64AsNumpy())
+        daily_data["Sunset"]  = convert_unix_timestamps(daily.Variables(1).ValuesInt64AsNumpy())
+        for column, index in DAILY_VARIABLES.items():
+            daily_data[column] = np.asarray(daily.Variables(index).ValuesAsNumpy())
+
+        return pd.DataFrame(data=daily_data, copy=False)
     
     except Exception:
         raise RuntimeError("Unable to return daily weather data")
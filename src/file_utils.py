@@ -0,0 +1,19 @@
+"""Helpers for the on-disk image caches shared by the dashboard"""
+import os
+import tempfile
+from pathlib import Path
+
+
+def write_atomically(path: Path, content: bytes) -> None:
+    """
+    Writes a temporary file first and moves it into place, so readers never see half a file
+    Each write has its own temporary file, so concurrent writes of the same path don't clash
+    """
+    descriptor, temporary_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as temporary_file:
+            temporary_file.write(content)
+        os.replace(temporary_path, path)
+    except BaseException:
+        Path(temporary_path).unlink(missing_ok=True)
+        raise
@@ -1,45 +1,93 @@
 """Module to quickly & easily get the current position of the ISS in lat/long"""
+import logging
+import threading
+import time
 from calendar import timegm
 from datetime import datetime, timezone
+from typing import Dict
 
 import requests
 import ephem
+import pandas as pd
+
+from src.iss_propagation import ground_track, predict_passes_on_grid, GROUND_TRACK_MINUTES
+
+TLE_URL = "https://live.ariss.org/iss.txt"
+# Seconds before the TLE is downloaded again, it is only updated a few times a day
+TLE_MAX_AGE = 6 * 60 * 60
+
+# Most recently downloaded TLE lines and when they were downloaded, shared by every caller
+TLE_CACHE = {"lines": None, "fetched_at": None}
+TLE_LOCK = threading.Lock()
+
+# Ways of predicting passes: ephem one pass at a time, or SGP4 over a time grid
+PASS_METHODS = ("ephem", "sgp4")
 
 def get_iss_lat_long_now() -> tuple[float, float]:
-    """Returns the current lat/long of the ISS as a float tuple"""
-    req = requests.get("http://api.open-notify.org/iss-now.json", timeout=30)
-    if req.status_code == 200:
-        pos = req.json()["iss_position"]
-        return (pos["latitude"], pos["longitude"])
-    raise RuntimeError(f"Error from ISS API: {req}")
+    """Returns the current lat/long of the ISS as a float tuple, propagated from the cached TLE"""
+    position = ground_track(get_tle(), datetime.now(timezone.utc), minutes=0).iloc[0]
+    return (round(float(position["latitude"]), 4), round(float(position["longitude"]), 4))
 
-def get_passes(lon, lat, n=1, alt=0):
+
+def get_iss_ground_track(minutes: int = GROUND_TRACK_MINUTES,
+                         start: datetime = None) -> pd.DataFrame:
+    """Returns the latitude and longitude below the ISS each minute over its next orbit"""
+    if start is None:
+        start = datetime.now(timezone.utc)
+    return ground_track(get_tle(), start, minutes=minutes)
+
+
+def fetch_tle() -> tuple[str, str, str]:
+    """Downloads the latest ISS TLE from Ariss, returning its three lines"""
+    tle_req = requests.get(TLE_URL, timeout=30)
+    if tle_req.status_code != 200:
+        raise RuntimeError("Failed to get the TLE required for ISS orbit calculation")
+    tle = tle_req.text.split("\n")
+    return str(tle[0]), str(tle[1]), str(tle[2])
+
+
+def get_tle(max_age: float = TLE_MAX_AGE) -> tuple[str, str, str]:
     """
-    Compute n number of passes of the ISS for a given location
-    This code is from https://github.com/open-notify/Open-Notify-API/blob/master/iss.py
-    It used to be hosted on a the Open Notify API but now is not so we calculate it locally instead
-    To be clear, *the StarWatch team did not write this code!*
-    StarWatch has adapted it to work in a useful way for the project
-    Adaptations:
-        - Updated TLE source from private redis to public API
-        - Updated code overall from Python 2.x to 3.13
-        - Updated outdated library references to modern ones
-        - Added some basic error checking against bad inputs
+    Returns the ISS TLE, downloading it only if the cached copy is older than max_age seconds
+    If a refresh fails, the stale copy is used rather than failing outright
     """
+    with TLE_LOCK:
+        fetched_at = TLE_CACHE["fetched_at"]
+        if fetched_at is not None and time.monotonic() - fetched_at < max_age:
+            return TLE_CACHE["lines"]
+
+        try:
+            TLE_CACHE["lines"] = fetch_tle()
+            TLE_CACHE["fetched_at"] = time.monotonic()
+        except (RuntimeError, requests.RequestException):
+            if TLE_CACHE["lines"] is None:
+                raise
+            logging.warning("Unable to refresh the ISS TLE, using the cached copy")
+        return TLE_CACHE["lines"]
+
+
+def clear_tle_cache() -> None:
+    """Forgets the cached TLE, so the next call downloads it again"""
+    with TLE_LOCK:
+        TLE_CACHE.update({"lines": None, "fetched_at": None})
+
+
+def get_iss_body() -> ephem.EarthSatellite:
+    """Returns an ephem body for the ISS from the cached TLE"""
+    return ephem.readtle(*get_tle())
+
+
+def check_coordinates(lat: float, lon: float) -> None:
+    """Raises a ValueError for a latitude or longitude out of range"""
     if lat < -90 or lat > 90:
         raise ValueError(f"Latitude out of expected range: -90 < lat < 90. Got {lat}")
     if lon < -180 or lon > 180:
         raise ValueError(f"Longitude out of expected range: -180 < lon < 180. Got {lon}")
 
-    # Get latest TLE from Ariss
-    tle_req = requests.get("https://live.ariss.org/iss.txt", timeout=30)
-    if tle_req.status_code == 200:
-        tle_raw = tle_req.text
-    else:
-        raise RuntimeError("Failed to get the TLE required for ISS orbit calculation")
-    tle = tle_raw.split("\n")
-    iss = ephem.readtle(str(tle[0]), str(tle[1]), str(tle[2]))
 
+def predict_passes(iss: ephem.EarthSatellite, lat: float, lon: float, n: int,
+                   start: datetime, alt: float = 0) -> list[dict[str, int]]:
+    """Returns the ISS passes over a location from n pass predictions after the start time"""
     # Set location
     location = ephem.Observer()
     location.lat = str(lat)
@@ -50,9 +98,7 @@ def get_passes(lon, lat, n=1, alt=0):
     location.pressure = 0
     location.horizon = '10:00'
 
-    # Set time now
-    now = datetime.now(timezone.utc)
-    location.date = now
+    location.date = start
 
     # Predict passes
     passes = []
@@ -68,6 +114,29 @@ def get_passes(lon, lat, n=1, alt=0):
         # Increase the time by more than a pass and less than an orbit
         location.date = tr + 25*ephem.minute
 
+    return passes
+
+
+def get_passes(lon, lat, n=1, alt=0):
+    """
+    Compute n number of passes of the ISS for a given location
+    This code is from https://github.com/open-notify/Open-Notify-API/blob/master/iss.py
+    It used to be hosted on a the Open Notify API but now is not so we calculate it locally instead
+    To be clear, *the StarWatch team did not write this code!*
+    StarWatch has adapted it to work in a useful way for the project
+    Adaptations:
+        - Updated TLE source from private redis to public API
+        - Updated code overall from Python 2.x to 3.13
+        - Updated outdated library references to modern ones
+        - Added some basic error checking against bad inputs
+        - Cached the TLE between calls and split out the pass prediction
+    """
+    check_coordinates(lat, lon)
+
+    # Set time now
+    now = datetime.now(timezone.utc)
+    passes = predict_passes(get_iss_body(), lat, lon, n, now, alt)
+
     # Return object
     obj = {"request": {
         "datetime": timegm(now.timetuple()),
@@ -82,6 +151,37 @@ def get_passes(lon, lat, n=1, alt=0):
     return obj
 
 
+def predict_passes_for_locations(locations: Dict[str, Dict[str, float]], n: int,
+                                 start: datetime = None, method: str = "ephem") -> pd.DataFrame:
+    """
+    Returns the ISS passes from n pass predictions for every location from one TLE
+    The ephem method shares one ephem body between the locations, the sgp4 method
+    propagates the orbit once over a time grid and finds every location's passes at once
+    """
+    if method not in PASS_METHODS:
+        raise ValueError(f"Unknown pass prediction method {method}, expected one of {PASS_METHODS}")
+    if start is None:
+        start = datetime.now(timezone.utc)
+    for coordinates in locations.values():
+        check_coordinates(coordinates["lat"], coordinates["lon"])
+
+    if method == "sgp4":
+        return predict_passes_on_grid(get_tle(), locations, n, start)
+
+    iss = get_iss_body()
+
+    rows = []
+    for name, coordinates in locations.items():
+        for iss_pass in predict_passes(iss, coordinates["lat"], coordinates["lon"], n, start):
+            rows.append({
+                "location": name,
+                "rise_time": datetime.fromtimestamp(iss_pass["risetime"], tz=timezone.utc),
+                "duration_seconds": iss_pass["duration"]
+            })
+
+    return pd.DataFrame(rows, columns=["location", "rise_time", "duration_seconds"])
+
+
 def present_iss_passes(passes_obj) -> list[tuple[str, int]]:
     """
     Converts the calculated ISS passes to human formats
@@ -0,0 +1,97 @@
+"""
+Predicts the next ISS passes over every region and stores them for the dashboard to read
+Each dashboard view is then a lookup, rather than a TLE download and an orbit propagation
+"""
+import logging
+from datetime import datetime, timezone
+
+import pandas as pd
+from dotenv import load_dotenv
+from sqlalchemy import Engine, text
+
+from src.astronomy_utils import REGIONS
+from src.database import get_engine
+from src.iss_etl import predict_passes_for_locations
+
+# Number of pass predictions made for each region, covering a few days of passes
+PASSES_PREDICTED = 20
+# Every region's passes are found from one propagation of the orbit
+PASS_METHOD = "sgp4"
+
+
+def save_passes(engine: Engine, passes: pd.DataFrame) -> None:
+    """Replaces the stored passes of every region in the predictions in a single transaction"""
+    region_names = [{"region_name": name} for name in passes["location"].unique()]
+
+    with engine.begin() as conn:
+        if region_names:
+            conn.execute(text("DELETE FROM iss_pass WHERE region_name = :region_name"),
+                         region_names)
+        passes.rename(columns={"location": "region_name"}).to_sql(
+            "iss_pass", conn, if_exists="append", index=False, method="multi")
+
+    logging.info("%s ISS passes saved for %s regions", len(passes), len(region_names))
+
+
+def load_next_passes(engine: Engine, region_name: str, n: int = 1, now: datetime = None) -> dict:
+    """
+    Returns a region's next n stored passes in the shape get_passes returns,
+    so present_iss_passes can read them
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    region = REGIONS[region_name]
+
+    with engine.connect() as conn:
+        passes = pd.read_sql(
+            text("SELECT rise_time, duration_seconds FROM iss_pass "
+                 "WHERE region_name = :region_name AND rise_time >= :now "
+                 "ORDER BY rise_time LIMIT :n"),
+            conn, params={"region_name": region_name, "now": now, "n": n},
+            parse_dates={"rise_time": {"utc": True}})
+
+    if passes.empty:
+        raise RuntimeError(f"No upcoming ISS passes stored for {region_name}")
+
+    return {"request": {
+        "datetime": int(now.timestamp()),
+        "latitude": region["lat"],
+        "longitude": region["lon"],
+        "altitude": 0,
+        "passes": n,
+        },
+        "response": [{"risetime": int(rise_time.timestamp()), "duration": int(duration)}
+                     for rise_time, duration in zip(passes["rise_time"],
+                                                    passes["duration_seconds"])],
+    }
+
+
+def refresh_passes(engine: Engine = None, n: int = PASSES_PREDICTED) -> int:
+    """Predicts every region's passes and replaces the stored ones, returning the pass count"""
+    if engine is None:
+        engine = get_engine()
+
+    passes = predict_passes_for_locations(REGIONS, n, method=PASS_METHOD)
+    save_passes(engine, passes)
+    return len(passes)
+
+
+def handler(event, context):
+    """handler function for lambda function"""
+    try:
+        passes_saved = refresh_passes()
+        logging.info("%s : Lambda time remaining in MS: %s", event,
+                     context.get_remaining_time_in_millis())
+        return {"statusCode": 200, "passes": passes_saved}
+    except RuntimeError as e:
+        return {"statusCode": 500, "error": str(e)}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(message)s"
+    )
+
+    load_dotenv()
+    refresh_passes()
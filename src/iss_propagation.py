@@ -0,0 +1,220 @@
+"""
+Propagates the ISS orbit over a dense time grid with SGP4
+Positions for every time step are computed in one call, and rises and sets are found for
+many observers at once from the elevation of the ISS over the observers x times grid
+"""
+from datetime import datetime, timedelta
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+from sgp4.api import Satrec
+
+UNIX_EPOCH_JULIAN_DATE = 2440587.5
+J2000_JULIAN_DATE = 2451545.0
+
+# WGS84 Earth radius in km and flattening
+EARTH_RADIUS = 6378.137
+EARTH_FLATTENING = 1 / 298.257223563
+EARTH_ECCENTRICITY_SQUARED = EARTH_FLATTENING * (2 - EARTH_FLATTENING)
+
+# Seconds between time steps, short enough that no pass longer than a minute is missed
+GRID_STEP = 30
+# Degrees above the horizon a pass starts and ends
+# ephem's next_pass ignores the observer's horizon, so its passes run from rise to set too
+PASS_HORIZON = 0.0
+# Passes visible for this many seconds or fewer are ignored
+MIN_PASS_DURATION = 60
+# Days searched for passes, several times the longest gap between passes over the UK
+PASS_SEARCH_DAYS = 10
+# Observers whose elevations are held in memory at once
+OBSERVER_CHUNK = 64
+
+# One orbit of the ISS
+GROUND_TRACK_MINUTES = 90
+GROUND_TRACK_STEP = 60
+
+
+def make_satellite(tle: tuple[str, str, str]) -> Satrec:
+    """Returns an SGP4 satellite from the three lines of a TLE"""
+    return Satrec.twoline2rv(tle[1].strip(), tle[2].strip())
+
+
+def make_time_grid(start: datetime, duration: timedelta, step: int = GRID_STEP) -> pd.DatetimeIndex:
+    """Returns UTC times every step seconds over the duration from the start"""
+    return pd.date_range(pd.Timestamp(start).tz_convert("UTC"),
+                         pd.Timestamp(start).tz_convert("UTC") + duration,
+                         freq=pd.Timedelta(seconds=step))
+
+
+def split_julian_dates(times: pd.DatetimeIndex) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the whole and fractional parts of each time's Julian date, as SGP4 takes them"""
+    days_since_epoch = np.asarray((times - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(days=1),
+                                  dtype=float)
+    whole_days = np.floor(days_since_epoch)
+    return whole_days + UNIX_EPOCH_JULIAN_DATE, days_since_epoch - whole_days
+
+
+def greenwich_sidereal_time(julian_date: np.ndarray, fraction: np.ndarray) -> np.ndarray:
+    """Returns the IAU-82 Greenwich mean sidereal time in radians, which SGP4's frame is tied to"""
+    centuries = ((julian_date - J2000_JULIAN_DATE) + fraction) / 36525.0
+    seconds = (67310.54841 + (876600.0 * 3600 + 8640184.812866) * centuries
+               + 0.093104 * centuries ** 2 - 6.2e-6 * centuries ** 3)
+    return np.radians(seconds / 240.0) % (2 * np.pi)
+
+
+def propagate(satellite: Satrec, times: pd.DatetimeIndex) -> np.ndarray:
+    """Returns the Earth-fixed position of the satellite in km at each time, as a times x 3 array"""
+    julian_date, fraction = split_julian_dates(times)
+    errors, position, _ = satellite.sgp4_array(julian_date, fraction)
+    if errors.any():
+        raise RuntimeError(f"SGP4 propagation failed with error code {errors.max()}")
+
+    # Rotates from the true equator, mean equinox frame into the Earth-fixed frame
+    sidereal = greenwich_sidereal_time(julian_date, fraction)
+    cos_sidereal, sin_sidereal = np.cos(sidereal), np.sin(sidereal)
+    return np.column_stack((cos_sidereal * position[:, 0] + sin_sidereal * position[:, 1],
+                            cos_sidereal * position[:, 1] - sin_sidereal * position[:, 0],
+                            position[:, 2]))
+
+
+def subsatellite_points(position: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the geodetic latitude and longitude in degrees below each Earth-fixed position"""
+    x, y, z = position[:, 0], position[:, 1], position[:, 2]
+    distance = np.hypot(x, y)
+
+    latitude = np.arctan2(z, distance * (1 - EARTH_ECCENTRICITY_SQUARED))
+    for _ in range(3):
+        prime_vertical = EARTH_RADIUS / np.sqrt(1 - EARTH_ECCENTRICITY_SQUARED
+                                                * np.sin(latitude) ** 2)
+        latitude = np.arctan2(z + EARTH_ECCENTRICITY_SQUARED * prime_vertical
+                              * np.sin(latitude), distance)
+
+    return np.degrees(latitude), np.degrees(np.arctan2(y, x))
+
+
+def observer_positions(
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    altitudes: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the Earth-fixed positions in km and the local up directions of observers
+    at geodetic latitudes and longitudes in degrees and altitudes in metres
+    """
+    lat, lon = np.radians(latitudes), np.radians(longitudes)
+    prime_vertical = EARTH_RADIUS / np.sqrt(1 - EARTH_ECCENTRICITY_SQUARED * np.sin(lat) ** 2)
+    height = np.asarray(altitudes, dtype=float) / 1000
+
+    up = np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+    position = np.column_stack((
+        (prime_vertical + height) * np.cos(lat) * np.cos(lon),
+        (prime_vertical + height) * np.cos(lat) * np.sin(lon),
+        (prime_vertical * (1 - EARTH_ECCENTRICITY_SQUARED) + height) * np.sin(lat)
+    ))
+    return position, up
+
+
+def elevations(
+    satellite_position: np.ndarray,
+    observer_position: np.ndarray,
+    observer_up: np.ndarray
+) -> np.ndarray:
+    """Returns the elevation in degrees of the satellite over the observers x times grid"""
+    # Expanded into matrix products so the observers x times x 3 offsets are never built
+    height_above = satellite_position @ observer_up.T - np.sum(observer_position * observer_up,
+                                                               axis=1)
+    range_squared = (np.sum(satellite_position ** 2, axis=1)[:, np.newaxis]
+                     - 2 * satellite_position @ observer_position.T
+                     + np.sum(observer_position ** 2, axis=1))
+    return np.degrees(np.arcsin(np.clip(height_above / np.sqrt(range_squared), -1, 1))).T
+
+
+def find_passes(
+    elevation: np.ndarray,
+    times: pd.DatetimeIndex,
+    names: list[str],
+    n: int,
+    horizon: float = PASS_HORIZON,
+    min_duration: int = MIN_PASS_DURATION
+) -> pd.DataFrame:
+    """
+    Returns the passes from each observer's first n rises over the elevation grid,
+    with rises and sets interpolated between time steps
+    Passes already in progress at the first time or not over by the last are left out
+    """
+    above = elevation >= horizon
+    # Passes in progress at the start have no rise to measure from
+    above &= ~np.logical_and.accumulate(above, axis=1)
+
+    step = (times[1] - times[0]).total_seconds()
+    rise_observer, rise_index = np.nonzero(~above[:, :-1] & above[:, 1:])
+    set_observer, set_index = np.nonzero(above[:, :-1] & ~above[:, 1:])
+
+    before_rise = elevation[rise_observer, rise_index]
+    rise_offset = step * (rise_index + (horizon - before_rise)
+                          / (elevation[rise_observer, rise_index + 1] - before_rise))
+    before_set = elevation[set_observer, set_index]
+    set_offset = step * (set_index + (before_set - horizon)
+                         / (before_set - elevation[set_observer, set_index + 1]))
+
+    rises = pd.DataFrame({"observer": rise_observer, "rise_offset": rise_offset})
+    sets = pd.DataFrame({"observer": set_observer, "set_offset": set_offset})
+    rises["number"] = rises.groupby("observer").cumcount()
+    sets["number"] = sets.groupby("observer").cumcount()
+
+    passes = rises[rises["number"] < n].merge(sets, on=["observer", "number"])
+    passes["duration_seconds"] = (passes["set_offset"] - passes["rise_offset"]).astype(int)
+    passes = passes[passes["duration_seconds"] > min_duration]
+
+    return pd.DataFrame({
+        "location": np.asarray(names, dtype=object)[passes["observer"].to_numpy()],
+        "rise_time": times[0] + pd.to_timedelta(passes["rise_offset"].to_numpy(), unit="s")
+                                  .floor("s"),
+        "duration_seconds": passes["duration_seconds"].to_numpy()
+    })
+
+
+def predict_passes_on_grid(
+    tle: tuple[str, str, str],
+    locations: Dict[str, Dict[str, float]],
+    n: int,
+    start: datetime,
+    days: float = PASS_SEARCH_DAYS,
+    step: int = GRID_STEP
+) -> pd.DataFrame:
+    """
+    Returns the passes from n rises over every location, with the orbit propagated once
+    for all of them and the observers' elevations computed a chunk at a time
+    """
+    times = make_time_grid(start, timedelta(days=days), step)
+    satellite_position = propagate(make_satellite(tle), times)
+
+    names = list(locations)
+    latitudes = np.array([locations[name]["lat"] for name in names], dtype=float)
+    longitudes = np.array([locations[name]["lon"] for name in names], dtype=float)
+    altitudes = np.array([locations[name].get("alt", 0) for name in names], dtype=float)
+
+    passes = []
+    for first in range(0, len(names), OBSERVER_CHUNK):
+        chunk = slice(first, first + OBSERVER_CHUNK)
+        observer_position, observer_up = observer_positions(
+            latitudes[chunk], longitudes[chunk], altitudes[chunk])
+        passes.append(find_passes(elevations(satellite_position, observer_position, observer_up),
+                                  times, names[chunk], n))
+
+    if not passes:
+        return pd.DataFrame(columns=["location", "rise_time", "duration_seconds"])
+    return pd.concat(passes, ignore_index=True)
+
+
+def ground_track(
+    tle: tuple[str, str, str],
+    start: datetime,
+    minutes: int = GROUND_TRACK_MINUTES,
+    step: int = GROUND_TRACK_STEP
+) -> pd.DataFrame:
+    """Returns the latitude and longitude below the ISS every step seconds from the start"""
+    times = make_time_grid(start, timedelta(minutes=minutes), step)
+    latitude, longitude = subsatellite_points(propagate(make_satellite(tle), times))
+    return pd.DataFrame({"time": times, "latitude": latitude, "longitude": longitude})
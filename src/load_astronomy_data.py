@@ -4,33 +4,40 @@ Gets planetary body, and constellation ids from the RDS and maps this to the cor
 Transforms data into 2 dataframes, one for each table insertion in RDS
 Loads these tables into forecast and distance tables in RDS
 '''
+import io
 import os
-from typing import Tuple
+import time
+from typing import Dict, List, Tuple
 
 import logging
-from sqlalchemy import create_engine, text, Engine
+import psycopg2
+from sqlalchemy import text, Engine
 import pandas as pd
 from dotenv import load_dotenv
 from src.transform_astronomy_data import get_json_data, filter_data
+from src.database import get_engine
 
 FILE_PATH = "../data/planetary_data.json"
 
+# Columns identifying a row in each table, used to upsert instead of failing on duplicates
+CONFLICT_KEYS = {
+    "forecast": ["planetary_body_id", "latitude", "longitude", "date"],
+    "distance": ["planetary_body_id", "date"]
+}
+
+# Materialised view of the joined forecast and distance rows that the dashboard reads
+PLANETARY_BODY_VIEW = "planetary_body_forecast"
+
+# "numeric" stores only the coordinates' numbers, which the dashboard formats as it reads them,
+# "full" also stores the API's strings
+FORECAST_STORAGE_MODES = ("numeric", "full")
+
 
 def get_db_connection() -> Engine:
-    '''Establish and returns connection to DB'''
-    db_username = os.getenv("DB_USER")
-    db_password = os.getenv("DB_PASSWORD")
-    db_name = os.getenv("DB_NAME")
-    db_port = os.getenv("DB_PORT")
-    db_host = os.getenv("DB_HOST")
-
-    # String concatenation for connection url
-    url = (
-        f"postgresql+psycopg2://{db_username}:{db_password}"
-        + f"@{db_host}:{db_port}/{db_name}"
-    )
+    '''Returns the shared, pooled engine for the DB'''
+    engine = get_engine()
     logging.info("Connection Established for RDS")
-    return create_engine(url)
+    return engine
 
 
 def get_transformed_data() -> pd.DataFrame:
@@ -88,8 +95,23 @@ def convert_types(data: pd.DataFrame) -> pd.DataFrame:
     return data
 
 
-def make_forecast_dataframe(data: pd.DataFrame) -> pd.DataFrame:
-    '''Create forecast table dataframe for database insertion and returns'''
+def get_forecast_storage() -> str:
+    '''Returns the forecast storage mode set by FORECAST_STORAGE, full if it isn't set'''
+    storage = os.getenv("FORECAST_STORAGE", "full")
+    if storage not in FORECAST_STORAGE_MODES:
+        raise ValueError(f"Unknown forecast storage mode {storage}, "
+                         f"expected one of {FORECAST_STORAGE_MODES}")
+    return storage
+
+
+def make_forecast_dataframe(data: pd.DataFrame, storage: str = None) -> pd.DataFrame:
+    '''
+    Create forecast table dataframe for database insertion and returns
+    The coordinate strings are NULL when only the numbers are stored, so upserting a row
+    first loaded in full mode clears strings that would no longer match its numbers
+    '''
+    if storage is None:
+        storage = get_forecast_storage()
     df = data.copy()
 
     # Creates a new df that has all columns relevant to 'forecast' table in RDS
@@ -112,6 +134,10 @@ def make_forecast_dataframe(data: pd.DataFrame) -> pd.DataFrame:
         ]
     ]
 
+    if storage == "numeric":
+        forecast_dataframe = forecast_dataframe.assign(**{
+            col: None for col in forecast_dataframe.columns if col.endswith('_string')})
+
     return forecast_dataframe
 
 
@@ -129,33 +155,124 @@ def make_distance_dataframe(data: pd.DataFrame) -> pd.DataFrame:
 
     df['astronomical_units'] = df['astronomical_units'].astype(
         float)
+
+    # Distance from Earth doesn't depend on the observer,
+    # so keep one row per body per day when several locations are loaded
+    df = df.drop_duplicates(subset=['planetary_body_id', 'date'])
     return df
 
 
-def upload_to_db(forecast_df: pd.DataFrame, distance_df: pd.DataFrame, engine: Engine) -> None:
-    '''Upload forecast and distance dataframes to the RDS'''
+def dataframe_to_csv(data: pd.DataFrame) -> io.StringIO:
+    '''Writes a dataframe to an in-memory CSV buffer ready for COPY FROM STDIN'''
+    data = data.copy()
+    for col in data.columns:
+        if col.endswith('_id'):
+            # Nullable ints so unmapped ids are written as NULL rather than as floats
+            data[col] = data[col].astype('Int64')
+
+    buffer = io.StringIO()
+    data.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    return buffer
+
+
+def bulk_upsert(cursor, data: pd.DataFrame, table_name: str, key: List[str]) -> int:
+    '''
+    Copies a dataframe into a temporary staging table then upserts it into the given table
+    Rows sharing a key within the batch are collapsed to the last one copied, like
+    drop_duplicates(keep='last'), so the upsert touches each row once
+    Returns the number of rows inserted or updated
+    '''
+    columns = ", ".join(data.columns)
+    key_columns = ", ".join(key)
+    updates = ", ".join(f"{col} = EXCLUDED.{col}"
+                        for col in data.columns if col not in key)
+    staging_table = f"staging_{table_name}"
+
+    # staging_row numbers the rows in the order they're copied, to pick between duplicates
+    cursor.execute(f"""
+        CREATE TEMP TABLE {staging_table} ON COMMIT DROP AS
+        SELECT {columns} FROM {table_name} WITH NO DATA;
+        ALTER TABLE {staging_table} ADD COLUMN staging_row BIGINT GENERATED ALWAYS AS IDENTITY;
+    """)
+    cursor.copy_expert(
+        f"COPY {staging_table} ({columns}) FROM STDIN WITH (FORMAT csv)",
+        dataframe_to_csv(data)
+    )
+    cursor.execute(f"""
+        INSERT INTO {table_name} ({columns})
+        SELECT DISTINCT ON ({key_columns}) {columns}
+        FROM {staging_table}
+        ORDER BY {key_columns}, staging_row DESC
+        ON CONFLICT ({key_columns}) DO UPDATE SET {updates};
+    """)
+    return cursor.rowcount
+
+
+def get_forecast_months(data: pd.DataFrame) -> List[str]:
+    '''Returns the first day of every month the forecast rows fall in, in order'''
+    return sorted(pd.to_datetime(data['date']).dt.strftime('%Y-%m-01').unique())
+
+
+def create_forecast_partitions(cursor, data: pd.DataFrame) -> None:
+    '''Creates any monthly forecast partitions the rows need that don't exist yet'''
+    for month in get_forecast_months(data):
+        cursor.execute("SELECT create_forecast_partition(%s::date);", (month,))
+
+
+def refresh_planetary_body_view(cursor) -> float:
+    '''
+    Rebuilds the dashboard's view from the forecast and distance tables
+    Returns the time taken, the refresh is concurrent so the dashboard can keep reading
+    '''
+    start = time.perf_counter()
+    cursor.execute(
+        f"REFRESH MATERIALIZED VIEW CONCURRENTLY {PLANETARY_BODY_VIEW};")
+    return time.perf_counter() - start
+
+
+def upload_to_db(
+        forecast_df: pd.DataFrame,
+        distance_df: pd.DataFrame,
+        engine: Engine
+) -> Dict[str, Dict[str, float]]:
+    '''
+    Bulk loads the forecast and distance dataframes into the RDS in a single transaction,
+    then refreshes the dashboard's view of them in the same transaction
+    Returns the row count and time taken for each table
+    '''
+    stats = {}
+    connection = engine.raw_connection()
     try:
-        forecast_df.to_sql(
-            name='forecast',
-            con=engine,
-            if_exists='append',
-            index=False
-        )
-        distance_df.to_sql(
-            name='distance',
-            con=engine,
-            if_exists='append',
-            index=False
-        )
-    except Exception:
-        logging.info('[ERROR] Could Not Insert Into Database')
-        
-    engine.connection.close()
-
-   
-
-
-def main(data: pd.DataFrame) -> None:
+        cursor = connection.cursor()
+        create_forecast_partitions(cursor, forecast_df)
+        for table_name, data in (("forecast", forecast_df), ("distance", distance_df)):
+            start = time.perf_counter()
+            rows = bulk_upsert(cursor, data, table_name,
+                               CONFLICT_KEYS[table_name])
+            stats[table_name] = {
+                "rows": rows,
+                "seconds": time.perf_counter() - start
+            }
+        refresh_seconds = refresh_planetary_body_view(cursor)
+        connection.commit()
+
+    except psycopg2.Error as e:
+        connection.rollback()
+        logging.error('[ERROR] Could Not Insert Into Database: %s', e)
+        raise RuntimeError(f"Database load failed: {e}") from e
+
+    finally:
+        connection.close()
+
+    for table_name, table_stats in stats.items():
+        logging.info("Loaded %s rows into %s in %.3fs",
+                     table_stats["rows"], table_name, table_stats["seconds"])
+    logging.info("Refreshed %s in %.3fs", PLANETARY_BODY_VIEW, refresh_seconds)
+    return stats
+
+
+def main(data: pd.DataFrame) -> Dict[str, Dict[str, float]]:
     '''Bundles all functions together for one function call'''
     logging.basicConfig(
         level=logging.INFO,
@@ -184,6 +301,4 @@ def main(data: pd.DataFrame) -> None:
 
     distance_df = make_distance_dataframe(data)
 
-    upload_to_db(forecast_df, distance_df, engine)
-
-    return True
+    return upload_to_db(forecast_df, distance_df, engine)
@@ -0,0 +1,111 @@
+-- Moves an existing database onto the schema in src/schema.sql without losing any rows
+-- Forecasts become keyed by location and partitioned by month, distances are keyed by
+-- body and date, and the dashboard reads the joined rows from a materialised view
+-- Run once against the RDS: psql -f src/migrations/001_forecast_location_partitions.sql
+BEGIN;
+
+-- Moves the current forecast table aside, freeing its constraint and sequence names
+ALTER TABLE forecast RENAME TO forecast_unpartitioned;
+ALTER TABLE forecast_unpartitioned DROP CONSTRAINT forecast_pkey;
+ALTER TABLE forecast_unpartitioned DROP CONSTRAINT forecast_date_planetary_body_id_key;
+ALTER TABLE forecast_unpartitioned DROP CONSTRAINT forecast_planetary_body_id_fkey;
+ALTER TABLE forecast_unpartitioned DROP CONSTRAINT forecast_constellation_id_fkey;
+ALTER TABLE forecast_unpartitioned ALTER COLUMN forecast_id DROP IDENTITY;
+
+CREATE TABLE forecast (
+    forecast_id INT GENERATED ALWAYS AS IDENTITY NOT NULL,
+    date TIMESTAMP NOT NULL,
+    longitude FLOAT NOT NULL,
+    latitude FLOAT NOT NULL,
+    planetary_body_id INT NOT NULL,
+    constellation_id INT,
+    right_ascension_hours FLOAT,
+    right_ascension_string TEXT,
+    declination_degrees FLOAT,
+    declination_string TEXT,
+    altitude_degrees FLOAT,
+    altitude_string TEXT,
+    azimuth_degrees FLOAT,
+    azimuth_string TEXT,
+    PRIMARY KEY (forecast_id, date),
+    FOREIGN KEY (planetary_body_id) REFERENCES planetary_body(planetary_body_id),
+    FOREIGN KEY (constellation_id) REFERENCES constellation(constellation_id),
+    UNIQUE(planetary_body_id, latitude, longitude, date)
+) PARTITION BY RANGE (date);
+
+CREATE FUNCTION create_forecast_partition(month DATE) RETURNS VOID AS $$
+DECLARE
+    month_start DATE := date_trunc('month', month)::DATE;
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF forecast FOR VALUES FROM (%L) TO (%L)',
+        'forecast_' || to_char(month_start, 'YYYY_MM'),
+        month_start,
+        (month_start + INTERVAL '1 month')::DATE
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- A partition for every month already forecast, and for this month and the next
+SELECT create_forecast_partition(month::DATE)
+FROM (
+    SELECT DISTINCT date_trunc('month', date) AS month FROM forecast_unpartitioned
+    UNION
+    SELECT date_trunc('month', CURRENT_DATE)
+    UNION
+    SELECT date_trunc('month', CURRENT_DATE + INTERVAL '1 month')
+) months;
+
+-- Keeps the existing ids, and carries on numbering from the highest of them
+INSERT INTO forecast (
+    forecast_id, date, longitude, latitude, planetary_body_id, constellation_id,
+    right_ascension_hours, right_ascension_string, declination_degrees, declination_string,
+    altitude_degrees, altitude_string, azimuth_degrees, azimuth_string
+)
+OVERRIDING SYSTEM VALUE
+SELECT
+    forecast_id, date, longitude, latitude, planetary_body_id, constellation_id,
+    right_ascension_hours, right_ascension_string, declination_degrees, declination_string,
+    altitude_degrees, altitude_string, azimuth_degrees, azimuth_string
+FROM forecast_unpartitioned;
+
+SELECT setval(pg_get_serial_sequence('forecast', 'forecast_id'),
+              COALESCE(MAX(forecast_id), 0) + 1, false)
+FROM forecast;
+
+DROP TABLE forecast_unpartitioned;
+
+-- Same key with the body first, so the index also serves joins from the forecast
+ALTER TABLE distance DROP CONSTRAINT distance_date_planetary_body_id_key;
+ALTER TABLE distance ADD CONSTRAINT distance_planetary_body_id_date_key
+    UNIQUE (planetary_body_id, date);
+
+CREATE MATERIALIZED VIEW planetary_body_forecast AS
+SELECT
+    pb.planetary_body_name,
+    f.latitude,
+    f.longitude,
+    f.date,
+    c.constellation_name,
+    d.astronomical_units,
+    f.right_ascension_hours,
+    f.right_ascension_string,
+    f.declination_degrees,
+    f.declination_string,
+    f.altitude_degrees,
+    f.altitude_string,
+    f.azimuth_degrees,
+    f.azimuth_string
+FROM forecast f
+JOIN planetary_body pb
+    ON pb.planetary_body_id = f.planetary_body_id
+JOIN distance d
+    ON d.planetary_body_id = f.planetary_body_id
+    AND d.date = f.date
+JOIN constellation c
+    ON c.constellation_id = f.constellation_id;
+
+CREATE UNIQUE INDEX planetary_body_forecast_lookup
+    ON planetary_body_forecast (planetary_body_name, latitude, longitude, date);
+
+COMMIT;
@@ -0,0 +1,41 @@
+-- Moves a database on 001_forecast_location_partitions.sql onto numeric-only coordinates
+-- The coordinates are stored as REAL and the dashboard's view no longer copies their strings,
+-- which the dashboard now formats from the numbers as it reads them
+-- The string columns are kept and stay nullable, loads with FORECAST_STORAGE=numeric set them NULL
+-- Run once against the RDS: psql -f src/migrations/002_numeric_forecast_coordinates.sql
+BEGIN;
+
+-- The view depends on the columns whose types change, so it is rebuilt afterwards
+DROP MATERIALIZED VIEW planetary_body_forecast;
+
+ALTER TABLE forecast
+    ALTER COLUMN right_ascension_hours TYPE REAL,
+    ALTER COLUMN declination_degrees TYPE REAL,
+    ALTER COLUMN altitude_degrees TYPE REAL,
+    ALTER COLUMN azimuth_degrees TYPE REAL;
+
+CREATE MATERIALIZED VIEW planetary_body_forecast AS
+SELECT
+    pb.planetary_body_name,
+    f.latitude,
+    f.longitude,
+    f.date,
+    c.constellation_name,
+    d.astronomical_units,
+    f.right_ascension_hours,
+    f.declination_degrees,
+    f.altitude_degrees,
+    f.azimuth_degrees
+FROM forecast f
+JOIN planetary_body pb
+    ON pb.planetary_body_id = f.planetary_body_id
+JOIN distance d
+    ON d.planetary_body_id = f.planetary_body_id
+    AND d.date = f.date
+JOIN constellation c
+    ON c.constellation_id = f.constellation_id;
+
+CREATE UNIQUE INDEX planetary_body_forecast_lookup
+    ON planetary_body_forecast (planetary_body_name, latitude, longitude, date);
+
+COMMIT;
@@ -0,0 +1,93 @@
+"""
+Keeps moon phase images on local disk, so a region and date's image is only generated once
+Images are stored by the hash of their content and looked up by the hash of their key,
+and the least recently used images are removed once the cache grows past its size cap
+"""
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+
+from src.file_utils import write_atomically
+
+DEFAULT_CACHE_DIRECTORY = ".moon_image_cache"
+# Astronomy API images are around 100 KB, so this keeps a few hundred of them
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+# Degrees the coordinates are rounded to, the moon looks the same from anywhere in the UK
+COORDINATE_ROUNDING = 5.0
+
+
+def round_coordinate(coordinate: float, rounding: float = COORDINATE_ROUNDING) -> float:
+    """Rounds a coordinate to the nearest multiple of the rounding, in degrees"""
+    return float(round(float(coordinate) / rounding) * rounding)
+
+
+def make_key(image_date: str, latitude: float, longitude: float, style: str) -> str:
+    """Returns the cache key for an image, shared by every location rounding to the same point"""
+    key = f"{image_date}|{round_coordinate(latitude)}|{round_coordinate(longitude)}|{style}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class MoonImageCache:
+    """A size-capped, least recently used cache of images in a local directory"""
+
+    def __init__(self, directory: str | Path = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        if directory is None:
+            directory = os.getenv("MOON_IMAGE_CACHE_DIR", DEFAULT_CACHE_DIRECTORY)
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        (self.directory / "keys").mkdir(parents=True, exist_ok=True)
+        (self.directory / "images").mkdir(parents=True, exist_ok=True)
+
+    def key_path(self, key: str) -> Path:
+        """Returns the path of the file naming the image stored for a key"""
+        return self.directory / "keys" / key
+
+    def image_path(self, content_hash: str) -> Path:
+        """Returns the path of an image stored by the hash of its content"""
+        return self.directory / "images" / content_hash
+
+    def get(self, key: str) -> bytes | None:
+        """Returns the image stored for a key, or None if there isn't one"""
+        with self.lock:
+            key_path = self.key_path(key)
+            if not key_path.exists():
+                return None
+
+            image_path = self.image_path(key_path.read_text(encoding="utf-8"))
+            if not image_path.exists():
+                # The image was evicted, so the key no longer names anything
+                key_path.unlink(missing_ok=True)
+                return None
+
+            # Marks the image as recently used for eviction
+            os.utime(image_path)
+            return image_path.read_bytes()
+
+    def set(self, key: str, image: bytes) -> None:
+        """Stores an image for a key, then evicts the least recently used images over the cap"""
+        content_hash = hashlib.sha256(image).hexdigest()
+        with self.lock:
+            image_path = self.image_path(content_hash)
+            if image_path.exists():
+                os.utime(image_path)
+            else:
+                write_atomically(image_path, image)
+            write_atomically(self.key_path(key), content_hash.encode("utf-8"))
+            self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used images until the cache is within its size cap"""
+        images = sorted(((path.stat().st_mtime, path.stat().st_size, path)
+                         for path in (self.directory / "images").iterdir()),
+                        key=lambda image: image[0])
+        total_bytes = sum(size for _, size, _ in images)
+
+        for _, size, path in images:
+            if total_bytes <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+            logging.info("Evicted moon image %s from the cache", path.name)
@@ -16,6 +16,7 @@ def get_moon_phase_image(
         date: str,
         headers: dict,
         url: str,
+        moon_style: str = "default",
 ) -> None:
     '''
     Uses the Astronomy API to generate a moon phase image using given coordinates
@@ -32,7 +33,7 @@ def get_moon_phase_image(
             "orientation": "north-up"
         },
         "style": {
-            "moonStyle": "default",
+            "moonStyle": moon_style,
             "backgroundStyle": "solid",
             "backgroundColor": "black",
             "headingColor": "white",
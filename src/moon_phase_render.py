@@ -0,0 +1,64 @@
+"""
+Draws the phase of the Moon locally from ephem, as an alternative to the Astronomy API image
+The lit part of the disc is found from the Moon's illumination and the position angle of
+its bright limb, so the drawing is north-up like the Astronomy API's
+"""
+from datetime import datetime
+
+import ephem
+import numpy as np
+
+IMAGE_SIZE = 300
+# Fraction of the image the disc fills across
+DISC_FRACTION = 0.9
+# Grey levels of the sunlit surface at its centre and edge, and of the earthshine on the dark side
+LIT_CENTRE = 235
+LIT_EDGE = 170
+EARTHSHINE = 28
+
+
+def moon_geometry(latitude: float, longitude: float, when: datetime) -> tuple[float, float]:
+    """
+    Returns the Moon's phase angle and the position angle of its bright limb in radians,
+    as seen from a location
+    The position angle is measured from north through east, following Meeus 48.5
+    """
+    observer = ephem.Observer()
+    observer.lat, observer.lon = str(latitude), str(longitude)
+    observer.date = when
+    moon, sun = ephem.Moon(observer), ephem.Sun(observer)
+
+    phase_angle = np.arccos(np.clip(2 * moon.moon_phase - 1, -1, 1))
+    position_angle = np.arctan2(
+        np.cos(sun.dec) * np.sin(sun.ra - moon.ra),
+        np.sin(sun.dec) * np.cos(moon.dec)
+        - np.cos(sun.dec) * np.sin(moon.dec) * np.cos(sun.ra - moon.ra))
+    return float(phase_angle), float(position_angle)
+
+
+def render_phase(phase_angle: float, position_angle: float, size: int = IMAGE_SIZE) -> np.ndarray:
+    """
+    Returns a size x size RGB image of the Moon's disc lit at the given phase angle,
+    with its bright limb at the given position angle
+    """
+    # Pixel centres from -1 to 1 across the disc, with y up and x to the west on the right
+    coordinates = (np.arange(size) + 0.5) / size * 2 / DISC_FRACTION - 1 / DISC_FRACTION
+    x, y = np.meshgrid(coordinates, -coordinates)
+    on_disc = x ** 2 + y ** 2 <= 1
+    depth = np.sqrt(np.clip(1 - x ** 2 - y ** 2, 0, 1))
+
+    # Direction of the Sun from the Moon, with east to the left of a north-up view
+    sun_direction = (-np.sin(position_angle) * np.sin(phase_angle),
+                     np.cos(position_angle) * np.sin(phase_angle),
+                     np.cos(phase_angle))
+    lit = x * sun_direction[0] + y * sun_direction[1] + depth * sun_direction[2] > 0
+
+    brightness = np.where(lit, LIT_EDGE + (LIT_CENTRE - LIT_EDGE) * depth, EARTHSHINE)
+    image = np.where(on_disc, brightness, 0).astype(np.uint8)
+    return np.repeat(image[:, :, np.newaxis], 3, axis=2)
+
+
+def render_moon_phase(latitude: float, longitude: float, when: datetime,
+                      size: int = IMAGE_SIZE) -> np.ndarray:
+    """Returns an image of the Moon's phase as seen from a location at a time"""
+    return render_phase(*moon_geometry(latitude, longitude, when), size=size)
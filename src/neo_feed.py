@@ -0,0 +1,139 @@
+"""
+Keeps the Near-Earth objects approaching over the coming week in the database
+Each run pulls the NeoWs feed in 7-day windows and upserts every object's approach, so the
+dashboard can filter and sort the day's objects in one query without calling the API
+"""
+import logging
+import os
+from datetime import date, timedelta
+
+import pandas as pd
+import requests as reqs
+from dotenv import load_dotenv
+from sqlalchemy import Engine, text
+
+from src.database import get_engine
+from src.extract_nasa import parse_neo_feed, NEO_COLUMNS
+
+NEO_FEED_URL = "https://api.nasa.gov/neo/rest/v1/feed"
+# The longest window the feed serves in one request
+FEED_WINDOW_DAYS = 7
+
+# Columns the stored objects can be sorted by
+NEO_SORT_COLUMNS = ("miss_distance_km", "relative_velocity_kmph", "diameter_max_m", "name")
+
+UPSERT_NEO = text("""
+    INSERT INTO near_earth_object (neo_id, approach_date, name, diameter_min_m, diameter_max_m,
+                                   hazardous, miss_distance_km, relative_velocity_kmph)
+    VALUES (:neo_id, :approach_date, :name, :diameter_min_m, :diameter_max_m,
+            :hazardous, :miss_distance_km, :relative_velocity_kmph)
+    ON CONFLICT (neo_id, approach_date) DO UPDATE SET
+        name = EXCLUDED.name,
+        diameter_min_m = EXCLUDED.diameter_min_m,
+        diameter_max_m = EXCLUDED.diameter_max_m,
+        hazardous = EXCLUDED.hazardous,
+        miss_distance_km = EXCLUDED.miss_distance_km,
+        relative_velocity_kmph = EXCLUDED.relative_velocity_kmph;
+""")
+
+
+def feed_windows(start: date, days: int) -> list[tuple[date, date]]:
+    """Returns the (start date, end date) windows, at most a week long, covering the days"""
+    return [(start + timedelta(days=offset),
+             start + timedelta(days=min(offset + FEED_WINDOW_DAYS, days) - 1))
+            for offset in range(0, days, FEED_WINDOW_DAYS)]
+
+
+def fetch_neo_window(start: date, end: date, api_key: str, url: str = NEO_FEED_URL) -> pd.DataFrame:
+    """Returns the approaches from one window of the NeoWs feed
+
+    Raises:
+        RuntimeError: If the API request fails."""
+    response = reqs.get(url, params={
+        "start_date": str(start),
+        "end_date": str(end),
+        "api_key": api_key
+    }, timeout=30)
+
+    if response.status_code != 200:
+        raise RuntimeError(
+            f"Failed to fetch NEO data: {response.status_code} - {response.text}")
+
+    return parse_neo_feed(response.json())
+
+
+def ingest_neos(engine: Engine = None, start: date = None, days: int = FEED_WINDOW_DAYS) -> int:
+    """Upserts the approaches over the days from the start, returning how many were stored"""
+    if engine is None:
+        engine = get_engine()
+    if start is None:
+        start = date.today()
+    api_key = os.environ.get("API_KEY")
+
+    neos = pd.concat([fetch_neo_window(window_start, window_end, api_key)
+                      for window_start, window_end in feed_windows(start, days)],
+                     ignore_index=True)
+
+    if not neos.empty:
+        with engine.begin() as conn:
+            conn.execute(UPSERT_NEO, neos.to_dict("records"))
+
+    logging.info("%s Near-Earth object approaches stored", len(neos))
+    return len(neos)
+
+
+def load_neos(
+    engine: Engine,
+    approach_date: str,
+    hazardous_only: bool = False,
+    max_miss_distance_km: float = None,
+    min_velocity_kmph: float = None,
+    sort_by: str = "miss_distance_km",
+    descending: bool = False
+) -> pd.DataFrame:
+    """Returns the stored objects approaching on a date, filtered and sorted in one query"""
+    if sort_by not in NEO_SORT_COLUMNS:
+        raise ValueError(f"Can't sort Near-Earth objects by {sort_by}, "
+                         f"expected one of {NEO_SORT_COLUMNS}")
+
+    conditions = ["approach_date = :approach_date"]
+    params = {"approach_date": approach_date}
+    if hazardous_only:
+        conditions.append("hazardous")
+    if max_miss_distance_km is not None:
+        conditions.append("miss_distance_km <= :max_miss_distance_km")
+        params["max_miss_distance_km"] = max_miss_distance_km
+    if min_velocity_kmph is not None:
+        conditions.append("relative_velocity_kmph >= :min_velocity_kmph")
+        params["min_velocity_kmph"] = min_velocity_kmph
+
+    query = text(f"SELECT {', '.join(NEO_COLUMNS)} FROM near_earth_object "
+                 f"WHERE {' AND '.join(conditions)} "
+                 f"ORDER BY {sort_by} {'DESC' if descending else 'ASC'}")
+
+    with engine.connect() as conn:
+        neos = pd.read_sql(query, conn, params=params)
+
+    neos["hazardous"] = neos["hazardous"].astype(bool)
+    return neos
+
+
+def handler(event, context):
+    """handler function for lambda function"""
+    try:
+        neos_stored = ingest_neos()
+        logging.info("%s : Lambda time remaining in MS: %s", event,
+                     context.get_remaining_time_in_millis())
+        return {"statusCode": 200, "neos": neos_stored}
+    except RuntimeError as e:
+        return {"statusCode": 500, "error": str(e)}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(message)s"
+    )
+
+    load_dotenv()
+    ingest_neos()
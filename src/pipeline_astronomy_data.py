@@ -1,18 +1,107 @@
 """Module to pull together the full ETL pipeline for the astronomy data"""
 import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
 
 import logging
+import requests
+import pandas as pd
 from dotenv import load_dotenv
 
-from src.extract_astronomy_data import get_db_connection, get_planetary_positions, get_date_range
-from src.transform_astronomy_data import filter_data
+from src.extract_astronomy_data import (get_db_connection, stream_planetary_positions,
+                                        get_date_range, get_backfill_requests)
+from src.transform_astronomy_data import filter_data_columnar, iter_record_frames
 from src.load_astronomy_data import main
-from src.astronomy_utils import make_request_headers
+from src.astronomy_utils import make_request_headers, REGIONS
+
+# Upper bound on concurrent Astronomy API requests
+MAX_WORKERS = 4
+
+
+def stream_location(
+    coordinates: Dict[str, float],
+    dates: Dict[str, datetime.date],
+    headers: Dict[str, str],
+    session: requests.Session = None
+) -> pd.DataFrame:
+    """
+    Streams the planetary positions for one request straight into a dataframe
+    Records are filtered as the response arrives, so its full JSON is never held in memory
+    """
+    frames = list(iter_record_frames(
+        stream_planetary_positions(coordinates, dates, headers, session=session)))
+
+    if not frames:
+        raise ValueError(f"No planetary positions returned for {coordinates}")
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def extract_requests(
+    requests_to_make: List[Tuple[Dict[str, float], Dict[str, datetime.date]]],
+    headers: Dict[str, str],
+    max_workers: int = MAX_WORKERS
+) -> List[pd.DataFrame]:
+    """
+    Streams the planetary positions for every (coordinates, date range) pair concurrently
+    All requests share one HTTP session so connections are reused between requests
+    Returns the filtered records of each response in the same order as the requests
+    """
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(stream_location, coordinates,
+                            dates, headers, session=session)
+            for coordinates, dates in requests_to_make
+        ]
+        return [future.result() for future in futures]
+
+
+def extract_locations(
+    locations: List[Dict[str, float]],
+    dates: Dict[str, datetime.date],
+    headers: Dict[str, str],
+    max_workers: int = MAX_WORKERS
+) -> List[pd.DataFrame]:
+    """Streams the same date range for every observer location concurrently"""
+    return extract_requests(
+        [(coordinates, dates) for coordinates in locations],
+        headers,
+        max_workers
+    )
+
+
+def transform_locations(location_data: List[Dict]) -> pd.DataFrame:
+    """Filters the API response for each location and combines them into one dataframe"""
+    frames = []
+    for data in location_data:
+        if not isinstance(data, dict):
+            raise TypeError(f"Expected to receive a dict, got {type(data)}")
+        if len(data) == 0:
+            raise ValueError(
+                f"Data dict (type {type(data)}) appears to be empty: {data}")
+        frames.append(filter_data_columnar(data))
+
+    if not frames:
+        raise ValueError("No locations were extracted")
+
+    return pd.concat(frames, ignore_index=True)
+
 
+def run_pipeline(
+    locations: List[Dict[str, float]] = None,
+    backfill_horizon: int = None,
+    local_ephemeris: bool = False
+):
+    """
+    Runs the astronomy pipeline from start to finish
+    Defaults to every region of the UK when no observer locations are given
+    If a backfill horizon (in days) is given, only the missing dates in it are fetched
+    If local_ephemeris is set, positions are computed with ephem instead of the API
+    """
+    if locations is None:
+        locations = list(REGIONS.values())
 
-def run_pipeline():
-    """Runs the astronomy pipeline from start to finish"""
-    logging.info("Starting pipeline")
+    logging.info("Starting pipeline for %s locations", len(locations))
 
     # extract
     logging.info("Starting extract")
@@ -20,32 +109,43 @@ def run_pipeline():
 
     connection = get_db_connection()
 
-    data = get_planetary_positions(
-        {  # coordinates dict
-            "lat": +51.30,
-            "lon": -00.05
-        },
-        get_date_range(connection),
-        make_request_headers()
-    )
-    extract_end = datetime.datetime.now()
-    logging.info("Extract done in %s", extract_end-extract_start)
+    if backfill_horizon is None:
+        date_range = get_date_range(connection)
+        requests_to_make = [(coordinates, date_range)
+                            for coordinates in locations]
+    else:
+        requests_to_make = get_backfill_requests(
+            connection, locations, backfill_horizon)
+    # Returns the connection to the shared pool, where the load step picks it back up
     connection.close()
 
-    # transform
-    logging.info("Starting transform")
-    transform_start = datetime.datetime.now()
+    if not requests_to_make:
+        logging.info("No missing data to backfill, pipeline finished")
+        return
 
-    if not isinstance(data, dict):
-        raise TypeError(f"Expected to receive a dict, got {type(data)}")
-    if len(data) > 0:
-        transformed_data = filter_data(data)
-    else:
-        raise ValueError(
-            f"Data dict (type {type(data)}) appears to be empty: {data}")
+    if local_ephemeris:
+        # Only imported when asked for, so runs against the API don't need ephem
+        # pylint: disable-next=import-outside-toplevel
+        from src.ephemeris_astronomy_data import get_local_planetary_positions
+        data = [get_local_planetary_positions(coordinates, dates)
+                for coordinates, dates in requests_to_make]
+        extract_end = datetime.datetime.now()
+        logging.info("Extract done in %s", extract_end-extract_start)
 
-    transform_end = datetime.datetime.now()
-    logging.info("Transform done in %s", transform_end-transform_start)
+        # transform
+        logging.info("Starting transform")
+        transform_start = datetime.datetime.now()
+
+        transformed_data = transform_locations(data)
+
+        transform_end = datetime.datetime.now()
+        logging.info("Transform done in %s", transform_end-transform_start)
+    else:
+        # API responses are filtered as they stream in, so extract and transform are one step
+        transformed_data = pd.concat(
+            extract_requests(requests_to_make, make_request_headers()), ignore_index=True)
+        logging.info("Extract and transform done in %s",
+                     datetime.datetime.now()-extract_start)
 
     # load
     logging.info("Starting load")
@@ -62,7 +162,11 @@ def run_pipeline():
 def handler(event, context):
     """handler function for lambda function"""
     try:
-        run_pipeline()
+        event = event or {}
+        run_pipeline(
+            backfill_horizon=event.get("backfill_horizon"),
+            local_ephemeris=event.get("local_ephemeris", False)
+        )
         logging.info("%s : Lambda time remaining in MS:", event,
                      context.get_remaining_time_in_millis())
         return {"statusCode": 200}
@@ -1,8 +1,19 @@
 -- Drop tables
+DROP MATERIALIZED VIEW IF EXISTS planetary_body_forecast;
+DROP FUNCTION IF EXISTS create_forecast_partition(DATE);
 DROP TABLE IF EXISTS constellation CASCADE;
 DROP TABLE IF EXISTS planetary_body CASCADE;
 DROP TABLE IF EXISTS distance CASCADE;
 DROP TABLE IF EXISTS forecast CASCADE;
+DROP TABLE IF EXISTS weather_current CASCADE;
+DROP TABLE IF EXISTS weather_hourly CASCADE;
+DROP TABLE IF EXISTS weather_daily CASCADE;
+DROP TABLE IF EXISTS aurora_activity CASCADE;
+DROP TABLE IF EXISTS aurora_feed_state CASCADE;
+DROP TABLE IF EXISTS aurora_alert_state CASCADE;
+DROP TABLE IF EXISTS iss_pass CASCADE;
+DROP TABLE IF EXISTS near_earth_object CASCADE;
+DROP TABLE IF EXISTS apod CASCADE;
 
 -- Constellation table
 CREATE TABLE constellation (
@@ -26,10 +37,11 @@ CREATE TABLE distance (
     date TIMESTAMP NOT NULL,
     PRIMARY KEY (distance_id),
     FOREIGN KEY (planetary_body_id) REFERENCES planetary_body(planetary_body_id),
-    UNIQUE(date, planetary_body_id)
+    -- Distance from Earth is the same from every location, so it is keyed by body and date
+    UNIQUE(planetary_body_id, date)
 );
 
--- Forecast table
+-- Forecast table, partitioned by month so old months can be detached and dropped
 CREATE TABLE forecast (
     forecast_id INT GENERATED ALWAYS AS IDENTITY NOT NULL,
     date TIMESTAMP NOT NULL,
@@ -37,18 +49,157 @@ CREATE TABLE forecast (
     latitude FLOAT NOT NULL,
     planetary_body_id INT NOT NULL,
     constellation_id INT,
-    right_ascension_hours FLOAT,
+    -- Coordinates come to 2 decimal places, well within REAL's precision,
+    -- and their strings are only stored when FORECAST_STORAGE is full, numeric loads set them NULL
+    right_ascension_hours REAL,
     right_ascension_string TEXT,
-    declination_degrees FLOAT,
+    declination_degrees REAL,
     declination_string TEXT,
-    altitude_degrees FLOAT,
+    altitude_degrees REAL,
     altitude_string TEXT,
-    azimuth_degrees FLOAT,
+    azimuth_degrees REAL,
     azimuth_string TEXT,
-    PRIMARY KEY (forecast_id),
+    PRIMARY KEY (forecast_id, date),
     FOREIGN KEY (planetary_body_id) REFERENCES planetary_body(planetary_body_id),
     FOREIGN KEY (constellation_id) REFERENCES constellation(constellation_id),
-    UNIQUE(date, planetary_body_id)
+    -- Ordered so the dashboard's body and location lookup over a date window is one index range
+    UNIQUE(planetary_body_id, latitude, longitude, date)
+) PARTITION BY RANGE (date);
+
+-- Creates the forecast partition holding a month, the pipeline calls this before each load
+CREATE FUNCTION create_forecast_partition(month DATE) RETURNS VOID AS $$
+DECLARE
+    month_start DATE := date_trunc('month', month)::DATE;
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF forecast FOR VALUES FROM (%L) TO (%L)',
+        'forecast_' || to_char(month_start, 'YYYY_MM'),
+        month_start,
+        (month_start + INTERVAL '1 month')::DATE
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Positions and distances joined with their names, as the dashboard reads them
+-- The dashboard formats the coordinates itself, so their strings aren't copied in here
+-- Refreshed by the astronomy pipeline after every load
+CREATE MATERIALIZED VIEW planetary_body_forecast AS
+SELECT
+    pb.planetary_body_name,
+    f.latitude,
+    f.longitude,
+    f.date,
+    c.constellation_name,
+    d.astronomical_units,
+    f.right_ascension_hours,
+    f.declination_degrees,
+    f.altitude_degrees,
+    f.azimuth_degrees
+FROM forecast f
+JOIN planetary_body pb
+    ON pb.planetary_body_id = f.planetary_body_id
+JOIN distance d
+    ON d.planetary_body_id = f.planetary_body_id
+    AND d.date = f.date
+JOIN constellation c
+    ON c.constellation_id = f.constellation_id;
+
+-- Unique so the view can be refreshed concurrently, without blocking the dashboard's reads
+CREATE UNIQUE INDEX planetary_body_forecast_lookup
+    ON planetary_body_forecast (planetary_body_name, latitude, longitude, date);
+
+-- Weather snapshot tables, refreshed for every region at once by src/weather_snapshot.py
+CREATE TABLE weather_current (
+    region_name TEXT NOT NULL,
+    fetched_at TIMESTAMPTZ NOT NULL,
+    temperature REAL,
+    relative_humidity REAL,
+    wind_speed REAL,
+    wind_gusts REAL,
+    precipitation REAL,
+    cloud_cover REAL,
+    PRIMARY KEY (region_name)
+);
+
+CREATE TABLE weather_hourly (
+    region_name TEXT NOT NULL,
+    forecast_time TIMESTAMPTZ NOT NULL,
+    temperature REAL,
+    relative_humidity REAL,
+    precipitation REAL,
+    wind_speed REAL,
+    wind_gusts REAL,
+    visibility REAL,
+    cloud_cover REAL,
+    PRIMARY KEY (region_name, forecast_time)
+);
+
+CREATE TABLE weather_daily (
+    region_name TEXT NOT NULL,
+    date DATE NOT NULL,
+    sunrise TIMESTAMP,
+    sunset TIMESTAMP,
+    max_wind_speed REAL,
+    max_wind_gusts REAL,
+    max_temperature REAL,
+    min_temperature REAL,
+    PRIMARY KEY (region_name, date)
+);
+
+-- Aurora activity history, appended to by src/aurora_history.py
+CREATE TABLE aurora_activity (
+    activity_time TIMESTAMPTZ NOT NULL,
+    status_id TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (activity_time)
+);
+
+-- Validators from the last download of each feed, for conditional requests
+CREATE TABLE aurora_feed_state (
+    feed_url TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    checked_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (feed_url)
+);
+
+-- Last status seen and alerted on by the status check, as JSON
+CREATE TABLE aurora_alert_state (
+    alert_key TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (alert_key)
+);
+
+-- Predicted ISS passes over each region, replaced on a schedule
+CREATE TABLE iss_pass (
+    region_name TEXT NOT NULL,
+    rise_time TIMESTAMPTZ NOT NULL,
+    duration_seconds INT NOT NULL,
+    PRIMARY KEY (region_name, rise_time)
+);
+
+-- Near-Earth object close approaches from the NeoWs feed, one row per object per day
+CREATE TABLE near_earth_object (
+    neo_id TEXT NOT NULL,
+    approach_date DATE NOT NULL,
+    name TEXT NOT NULL,
+    diameter_min_m REAL,
+    diameter_max_m REAL,
+    hazardous BOOLEAN NOT NULL,
+    miss_distance_km DOUBLE PRECISION,
+    relative_velocity_kmph DOUBLE PRECISION,
+    PRIMARY KEY (neo_id, approach_date)
+);
+
+-- Astronomy Picture of the Day archive, images are served from the dashboard's image store
+CREATE TABLE apod (
+    apod_date DATE NOT NULL,
+    title TEXT NOT NULL,
+    explanation TEXT,
+    media_type TEXT NOT NULL,
+    image_url TEXT,
+    hd_image_url TEXT,
+    PRIMARY KEY (apod_date)
 );
 
 
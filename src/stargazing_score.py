@@ -0,0 +1,262 @@
+"""
+Scores how good each hour of the coming week is for stargazing at each location
+Every input is an array over the locations x hours grid, so the whole grid is scored at once
+"""
+from datetime import datetime, timezone
+from typing import Dict
+
+import ephem
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from sqlalchemy import Engine, text
+
+from src.astronomy_utils import REGIONS
+from src.database import get_engine
+
+HOURS_AHEAD = 7 * 24
+
+# Bright planets that make a night worth going out for
+BRIGHT_PLANETS = ["Venus", "Mars", "Jupiter", "Saturn"]
+# Degrees above the horizon a planet needs to clear trees and buildings
+PLANET_MIN_ALTITUDE = 10.0
+# Score bonus for each bright planet in view, and the most the planets can add together
+PLANET_BONUS = 0.05
+MAX_PLANET_BONUS = 0.15
+
+# Score bonus for the current aurora status, title case as aurora_etl returns it
+AURORA_BONUS = {"Green": 0.0, "Yellow": 0.05, "Amber": 0.1, "Red": 0.2}
+
+# The sky is fully dark once the Sun is this far below the horizon (astronomical twilight)
+FULL_DARKNESS_SUN_ALTITUDE = -18.0
+# Visibility in metres beyond which the air counts as perfectly transparent
+CLEAR_VISIBILITY = 20000.0
+# Relative humidity above which dew and haze start to spoil the view
+DAMP_HUMIDITY = 70.0
+# The most a full Moon overhead can take off the score
+MAX_MOON_PENALTY = 0.5
+
+# Minimum score for an hour to be part of a good stargazing window
+GOOD_SCORE = 60.0
+
+J2000_JULIAN_DATE = 2451545.0
+UNIX_EPOCH_JULIAN_DATE = 2440587.5
+
+
+def make_hours(start: datetime, hours: int = HOURS_AHEAD) -> pd.DatetimeIndex:
+    """Returns each UTC hour from the start of the given hour"""
+    return pd.date_range(pd.Timestamp(start).tz_convert("UTC").floor("h"),
+                         periods=hours, freq="h")
+
+
+def julian_dates(times: pd.DatetimeIndex) -> np.ndarray:
+    """Returns the Julian date of each time"""
+    days_since_epoch = (times - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(days=1)
+    return np.asarray(days_since_epoch, dtype=float) + UNIX_EPOCH_JULIAN_DATE
+
+
+def body_positions(body_name: str, times: pd.DatetimeIndex) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns a body's geocentric right ascension and declination in radians at each time
+    These don't depend on the observer, so ephem is only called once per hour, not per location
+    """
+    body = getattr(ephem, body_name)()
+    ra, dec = np.empty(len(times)), np.empty(len(times))
+    for i, when in enumerate(times):
+        body.compute(when.to_pydatetime())
+        ra[i], dec[i] = body.g_ra, body.g_dec
+    return ra, dec
+
+
+def moon_illumination(times: pd.DatetimeIndex) -> np.ndarray:
+    """Returns the fraction of the Moon's disc that is lit at each time"""
+    moon = ephem.Moon()
+    illumination = np.empty(len(times))
+    for i, when in enumerate(times):
+        moon.compute(when.to_pydatetime())
+        illumination[i] = moon.moon_phase
+    return illumination
+
+
+def altitudes(
+    ra: np.ndarray,
+    dec: np.ndarray,
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    julian_date: np.ndarray
+) -> np.ndarray:
+    """
+    Returns the altitude in degrees of a body over the locations x hours grid
+    ra, dec and julian_date are per hour and latitudes and longitudes are per location in degrees
+    """
+    # Earth rotation angle, which is Greenwich sidereal time to well within a degree
+    sidereal = 2 * np.pi * (0.7790572732640
+                            + 1.00273781191135448 * (julian_date - J2000_JULIAN_DATE))
+    hour_angle = sidereal[np.newaxis, :] + np.radians(longitudes)[:, np.newaxis] - ra
+    lat = np.radians(latitudes)[:, np.newaxis]
+
+    sin_altitude = (np.sin(lat) * np.sin(dec)
+                    + np.cos(lat) * np.cos(dec) * np.cos(hour_angle))
+    return np.degrees(np.arcsin(np.clip(sin_altitude, -1, 1)))
+
+
+def score_grid(
+    cloud_cover: np.ndarray,
+    visibility: np.ndarray,
+    humidity: np.ndarray,
+    sun_altitude: np.ndarray,
+    moon_altitude: np.ndarray,
+    moon_lit: np.ndarray,
+    planets_up: np.ndarray,
+    aurora_status: str = None
+) -> np.ndarray:
+    """
+    Returns an observability score from 0 to 100 for every cell of the locations x hours grid
+    Darkness and clear skies are required, then transparency, damp and moonlight reduce the
+    score and bright planets and aurora activity add to it
+    Missing weather values score 0
+    """
+    darkness = np.clip(sun_altitude / FULL_DARKNESS_SUN_ALTITUDE, 0, 1)
+    clear_sky = 1 - np.clip(cloud_cover / 100, 0, 1)
+    transparency = 0.7 + 0.3 * np.clip(visibility / CLEAR_VISIBILITY, 0, 1)
+    dryness = 1 - 0.5 * np.clip((humidity - DAMP_HUMIDITY) / (100 - DAMP_HUMIDITY), 0, 1)
+    moonlight = moon_lit * np.sin(np.radians(np.clip(moon_altitude, 0, 90)))
+
+    sky = darkness * clear_sky
+    score = sky * transparency * dryness * (1 - MAX_MOON_PENALTY * moonlight)
+    score += sky * np.minimum(planets_up * PLANET_BONUS, MAX_PLANET_BONUS)
+    score += sky * AURORA_BONUS.get(aurora_status, 0.0)
+
+    return np.nan_to_num(100 * np.clip(score, 0, 1))
+
+
+def compute_scores(
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    weather: Dict[str, np.ndarray],
+    times: pd.DatetimeIndex,
+    aurora_status: str = None
+) -> np.ndarray:
+    """
+    Returns the locations x hours score grid for the given weather
+    weather holds cloud_cover, visibility and relative_humidity arrays over the same grid
+    """
+    latitudes, longitudes = np.asarray(latitudes), np.asarray(longitudes)
+    julian_date = julian_dates(times)
+
+    def altitude_of(body_name: str) -> np.ndarray:
+        return altitudes(*body_positions(body_name, times), latitudes, longitudes, julian_date)
+
+    planets_up = sum((altitude_of(planet) > PLANET_MIN_ALTITUDE).astype(int)
+                     for planet in BRIGHT_PLANETS)
+
+    return score_grid(
+        weather["cloud_cover"],
+        weather["visibility"],
+        weather["relative_humidity"],
+        altitude_of("Sun"),
+        altitude_of("Moon"),
+        moon_illumination(times)[np.newaxis, :],
+        planets_up,
+        aurora_status
+    )
+
+
+def best_windows(
+    scores: np.ndarray,
+    location_names: list[str],
+    times: pd.DatetimeIndex,
+    min_score: float = GOOD_SCORE,
+    top: int = 5
+) -> pd.DataFrame:
+    """
+    Returns the best runs of consecutive hours scoring at least min_score,
+    with their start and end times and mean and peak scores, best first
+    """
+    good = scores >= min_score
+    # Runs start where a good hour follows a bad one and end where a bad hour follows a good one
+    edges = np.diff(np.pad(good.astype(np.int8), ((0, 0), (1, 1))), axis=1)
+    run_locations, run_starts = np.nonzero(edges == 1)
+    _, run_ends = np.nonzero(edges == -1)
+
+    # Sums over each run via cumulative sums, so no run is looped over
+    cumulative = np.pad(np.cumsum(scores, axis=1), ((0, 0), (1, 0)))
+    lengths = run_ends - run_starts
+    means = (cumulative[run_locations, run_ends] - cumulative[run_locations, run_starts]) / lengths
+    peaks = np.empty(0)
+    if len(run_starts):
+        # Maximum over each [start, end) run of the flattened grid, with a sentinel for the last
+        flat_starts = run_locations * scores.shape[1] + run_starts
+        bounds = np.column_stack([flat_starts, flat_starts + lengths]).ravel()
+        peaks = np.maximum.reduceat(np.append(scores.ravel(), 0), bounds)[::2]
+
+    windows = pd.DataFrame({
+        "location": np.asarray(location_names, dtype=object)[run_locations],
+        "start": times[run_starts],
+        "end": times[run_ends - 1] + pd.Timedelta(hours=1),
+        "hours": lengths,
+        "mean_score": np.round(means, 1),
+        "peak_score": np.round(peaks, 1)
+    })
+    return windows.sort_values(["mean_score", "hours"], ascending=False).head(top) \
+        .reset_index(drop=True)
+
+
+def load_weather_grid(
+    engine: Engine,
+    region_names: list[str],
+    times: pd.DatetimeIndex
+) -> Dict[str, np.ndarray]:
+    """
+    Returns the regions x hours cloud cover, visibility and humidity from the weather snapshot
+    Hours the snapshot doesn't cover are NaN, so they score 0, as is every hour
+    when the snapshot is empty after a missed weather run
+    """
+    # The snapshot only holds a week per region, so it is read whole and aligned to the hours
+    with engine.connect() as conn:
+        hourly = pd.read_sql(
+            text("SELECT region_name, forecast_time, cloud_cover, visibility, relative_humidity "
+                 "FROM weather_hourly"),
+            conn,
+            parse_dates={"forecast_time": {"utc": True}}
+        )
+
+    grid = hourly.pivot_table(index="region_name", columns="forecast_time",
+                              values=["cloud_cover", "visibility", "relative_humidity"])
+    # pivot_table leaves out variables with no values at all, as well as an empty snapshot
+    stored = set(grid.columns.get_level_values(0))
+    return {
+        column: (grid[column].reindex(index=region_names, columns=times).to_numpy(dtype=float)
+                 if column in stored else np.full((len(region_names), len(times)), np.nan))
+        for column in ("cloud_cover", "visibility", "relative_humidity")
+    }
+
+
+def get_best_windows(
+    engine: Engine,
+    regions: Dict[str, Dict[str, float]] = None,
+    start: datetime = None,
+    aurora_status: str = None,
+    top: int = 5
+) -> pd.DataFrame:
+    """Returns the best stargazing windows across the regions over the coming week"""
+    if regions is None:
+        regions = REGIONS
+    if start is None:
+        start = datetime.now(timezone.utc)
+    times = make_hours(start)
+    region_names = list(regions)
+
+    scores = compute_scores(
+        [regions[name]["lat"] for name in region_names],
+        [regions[name]["lon"] for name in region_names],
+        load_weather_grid(engine, region_names, times),
+        times,
+        aurora_status
+    )
+    return best_windows(scores, region_names, times, top=top)
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    print(get_best_windows(get_engine(), top=10).to_string(index=False))
@@ -2,10 +2,22 @@
 
 import json
 import logging
+from typing import IO, Iterable, Iterator
+
+import ijson
+from ijson.common import ObjectBuilder
+import numpy as np
 import pandas as pd
 
 FILE_PATH = "../data/planetary_data.json"
 
+# ijson prefixes for the parts of the API response the transform needs
+LONGITUDE_PREFIX = "data.observer.location.longitude"
+LATITUDE_PREFIX = "data.observer.location.latitude"
+ROW_PREFIX = "data.table.rows.item"
+BODY_NAME_PREFIX = "data.table.rows.item.entry.name"
+CELL_PREFIX = "data.table.rows.item.cells.item"
+
 
 def get_json_data(file_path: str) -> dict:
     '''Gets JSON from file and returns'''
@@ -43,9 +55,72 @@ def filter_data(json_data: dict) -> pd.DataFrame:
     return pd.DataFrame(records)
 
 
+def filter_data_columnar(json_data: dict) -> pd.DataFrame:
+    '''
+    Columnar equivalent of filter_data for large responses
+    Pulls each field out of the cells into its own array instead of building a dict per cell
+    Planetary body and constellation are returned as categoricals
+    '''
+    longitude = json_data['data']['observer']['location']['longitude']
+    latitude = json_data['data']['observer']['location']['latitude']
+    data_of_planetary_bodies = json_data['data']['table']['rows']
+
+    names = [planetary_body['entry']['name']
+             for planetary_body in data_of_planetary_bodies]
+    cell_counts = [len(planetary_body['cells'])
+                   for planetary_body in data_of_planetary_bodies]
+    cells = [record
+             for planetary_body in data_of_planetary_bodies
+             for record in planetary_body['cells']]
+
+    positions = [record['position'] for record in cells]
+    equatorial = [position['equatorial'] for position in positions]
+    horizontal = [position['horizontal'] for position in positions]
+    right_ascension = [coords['rightAscension'] for coords in equatorial]
+    declination = [coords['declination'] for coords in equatorial]
+    altitude = [coords['altitude'] for coords in horizontal]
+    azimuth = [coords['azimuth'] for coords in horizontal]
+
+    # Bodies come in blocks of cells, so their codes are just repeated
+    body_codes = np.repeat(np.arange(len(names)), cell_counts)
+
+    # Every body shares the same dates, so only split each distinct date once
+    date_codes, unique_dates = pd.factorize(
+        np.array([record['date'] for record in cells], dtype=object))
+    # Gets date in YYYY-MM-DD
+    dates = pd.Series(unique_dates, dtype=object).str.partition("T")[0]
+
+    filtered_data = pd.DataFrame({
+        "date": dates.to_numpy()[date_codes],
+        "latitude": latitude,
+        "longitude": longitude,
+        "planetary_body": pd.Categorical.from_codes(
+            body_codes, categories=names),
+        "constellation": pd.Categorical(
+            [position['constellation']['name'] for position in positions]),
+        "right_ascension_hours": [coords['hours'] for coords in right_ascension],
+        "right_ascension_string": [coords['string'] for coords in right_ascension],
+        "declination_degrees": [coords['degrees'] for coords in declination],
+        "declination_string": [coords['string'] for coords in declination],
+        "astronomical_units": [record['distance']['fromEarth']['au'] for record in cells],
+        "altitude_degrees": [coords['degrees'] for coords in altitude],
+        "altitude_string": [coords['string'] for coords in altitude],
+        "azimuth_degrees": [coords['degrees'] for coords in azimuth],
+        "azimuth_string": [coords['string'] for coords in azimuth]
+    })
+
+    logging.info('JSON Data Filtered')
+    return filtered_data
+
+
 def add_record(longitude, latitude, records, name, record):
     """Wrapper around append line for modularisation of script"""
-    records.append({
+    records.append(make_record(longitude, latitude, name, record))
+
+
+def make_record(longitude, latitude, name, record) -> dict:
+    """Picks the relevant data for one body on one date out of an API table cell"""
+    return {
         # Gets date in YYYY-MM-DD
         "date":
             record['date'].split("T")[0],
@@ -75,7 +150,78 @@ def add_record(longitude, latitude, records, name, record):
             record['position']['horizontal']['azimuth']['degrees'],
         "azimuth_string":
             record['position']['horizontal']['azimuth']['string']
-    })
+    }
+
+
+def iter_records(stream: IO) -> Iterator[dict]:
+    '''
+    Incrementally parses an API response from a file-like object
+    Yields one filtered record per body per date without loading the whole response
+    The API sends the observer before the table and each body's entry before its cells,
+    which keeps memory flat, but cells that arrive before either are held until they're known
+    '''
+    longitude = latitude = name = None
+    builder = None
+    # Cells of the current body waiting on its name, and finished bodies waiting on the location
+    row_cells = []
+    waiting_rows = []
+
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            # The cell is complete once its own map closes
+            if prefix == CELL_PREFIX and event == "end_map":
+                if name is None or latitude is None or longitude is None:
+                    row_cells.append(builder.value)
+                else:
+                    yield make_record(longitude, latitude, name, builder.value)
+                builder = None
+        elif prefix == CELL_PREFIX and event == "start_map":
+            builder = ObjectBuilder()
+            builder.event(event, value)
+        elif prefix == BODY_NAME_PREFIX:
+            name = value
+        elif prefix == ROW_PREFIX and event == "end_map":
+            if latitude is None or longitude is None:
+                waiting_rows.append((name, row_cells))
+            else:
+                for cell in row_cells:
+                    yield make_record(longitude, latitude, name, cell)
+            name = None
+            row_cells = []
+        elif prefix == LONGITUDE_PREFIX:
+            longitude = value
+        elif prefix == LATITUDE_PREFIX:
+            latitude = value
+
+    for row_name, cells in waiting_rows:
+        for cell in cells:
+            yield make_record(longitude, latitude, row_name, cell)
+
+
+def iter_json_file_records(file_path: str) -> Iterator[dict]:
+    '''Streams filtered records from a saved API response'''
+    with open(file_path, 'rb') as file:
+        yield from iter_records(file)
+
+
+def iter_record_frames(records: Iterable[dict], chunk_size: int = 10000) -> Iterator[pd.DataFrame]:
+    '''Groups streamed records into dataframes of at most chunk_size rows'''
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == chunk_size:
+            yield pd.DataFrame(chunk)
+            chunk = []
+    if chunk:
+        yield pd.DataFrame(chunk)
+
+
+def filter_records(records: Iterable[dict]) -> pd.DataFrame:
+    '''Builds the same dataframe as filter_data from streamed records'''
+    frame = pd.DataFrame(list(records))
+    logging.info('JSON Data Filtered')
+    return frame
 
 
 if __name__ == "__main__":
@@ -84,9 +230,4 @@ if __name__ == "__main__":
         format="%(asctime)s - %(message)s"
     )
 
-    data = get_json_data(FILE_PATH)
-
-    if not isinstance(data, dict):
-        raise TypeError(f"Expected to receive a dict, got {type(data)}")
-    if len(data) > 0:
-        transformed_data = filter_data(data)
+    transformed_data = filter_records(iter_json_file_records(FILE_PATH))
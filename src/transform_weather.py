@@ -1,5 +1,6 @@
 """Transform script for the Open-Meteo API data"""
 
+import numpy as np
 import pandas as pd
 
 
@@ -19,45 +20,39 @@ def transform_current_data(data: tuple[float]) -> tuple[str]:
             f"{current_precipitation} mm", f"{current_cloud_cover}%")
 
 
-def transform_hourly_data(data: pd.DataFrame) -> pd.DataFrame:
-    """Returns transformed hourly data dataframe"""
-
-    # Rounds each measurement to 1 d.p.
-    data["Temperature (°C)"] = data["Temperature (°C)"].astype(float).round(1)
-    data["Wind Speed (km/h)"] = data["Wind Speed (km/h)"].astype(float).round(1)
-    data["Wind Gusts (km/h)"] = data["Wind Gusts (km/h)"].astype(float).round(1)
+def round_to_one_dp(column: pd.Series) -> np.ndarray:
+    """Returns a column's values as floats rounded to 1 d.p."""
+    return np.round(column.to_numpy(dtype=float), 1)
 
-    # Converts to integers as all values end with '.0'
-    data["Relative Humidity (%)"] = data["Relative Humidity (%)"].astype(int)
-    data["Cloud Cover (%)"] = data["Cloud Cover (%)"].astype(int)
 
-    # Converts visibility units from metres to kilometres
-    data["Visibility (m)"] = data["Visibility (m)"]
-    data["Visibility (km)"] = (data["Visibility (m)"] /
-                               1000).astype(float).round(1)
-
-    return data[["Date", "Temperature (°C)", "Relative Humidity (%)",
-                 "Wind Speed (km/h)", "Wind Gusts (km/h)",
-                 "Visibility (km)", "Cloud Cover (%)"]]
+def transform_hourly_data(data: pd.DataFrame) -> pd.DataFrame:
+    """Returns transformed hourly data dataframe, built in one pass without altering the input"""
+
+    return pd.DataFrame({
+        "Date": data["Date"].array,
+        # Rounds each measurement to 1 d.p.
+        "Temperature (°C)": round_to_one_dp(data["Temperature (°C)"]),
+        # Converts to integers as all values end with '.0'
+        "Relative Humidity (%)": data["Relative Humidity (%)"].to_numpy(dtype=int),
+        "Wind Speed (km/h)": round_to_one_dp(data["Wind Speed (km/h)"]),
+        "Wind Gusts (km/h)": round_to_one_dp(data["Wind Gusts (km/h)"]),
+        # Converts visibility units from metres to kilometres
+        "Visibility (km)": np.round(data["Visibility (m)"].to_numpy(dtype=float) / 1000, 1),
+        "Cloud Cover (%)": data["Cloud Cover (%)"].to_numpy(dtype=int)
+    }, index=data.index, copy=False)
 
 
 def transform_daily_data(data: pd.DataFrame) -> pd.DataFrame:
-    """Returns transformed daily data dataframe"""
-
-    data["Date"] = pd.to_datetime(data["Date"]).dt.date
-
-    # Converts string to datetime then extracts time without seconds
-    data["Sunrise"] = pd.to_datetime(data["Sunrise"]).dt.strftime("%H:%M")
-    data["Sunset"] = pd.to_datetime(data["Sunset"]).dt.strftime("%H:%M")
-
-    # Rounds each measurement to 1 d.p.
-    data["Maximum Wind Speed (km/h)"] = data["Maximum Wind Speed (km/h)"].astype(
-        float).round(1)
-    data["Maximum Wind Gusts (km/h)"] = data["Maximum Wind Gusts (km/h)"].astype(
-        float).round(1)
-    data["Maximum Temperature (°C)"] = data["Maximum Temperature (°C)"].astype(
-        float).round(1)
-    data["Minimum Temperature (°C)"] = data["Minimum Temperature (°C)"].astype(
-        float).round(1)
-
-    return data
+    """Returns transformed daily data dataframe, built in one pass without altering the input"""
+
+    return pd.DataFrame({
+        "Date": pd.DatetimeIndex(data["Date"]).date,
+        # Converts string to datetime then extracts time without seconds
+        "Sunrise": pd.DatetimeIndex(data["Sunrise"]).strftime("%H:%M"),
+        "Sunset": pd.DatetimeIndex(data["Sunset"]).strftime("%H:%M"),
+        # Rounds each measurement to 1 d.p.
+        "Maximum Wind Speed (km/h)": round_to_one_dp(data["Maximum Wind Speed (km/h)"]),
+        "Maximum Wind Gusts (km/h)": round_to_one_dp(data["Maximum Wind Gusts (km/h)"]),
+        "Maximum Temperature (°C)": round_to_one_dp(data["Maximum Temperature (°C)"]),
+        "Minimum Temperature (°C)": round_to_one_dp(data["Minimum Temperature (°C)"])
+    }, index=data.index, copy=False)
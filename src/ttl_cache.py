@@ -0,0 +1,118 @@
+"""
+Time-to-live result cache for the dashboard's data fetchers
+Caches live at module level, so every Streamlit session in the process shares them
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable
+
+DEFAULT_MAXSIZE = 128
+
+# Every cache created by ttl_cache, by function name, for reporting
+CACHE_REGISTRY: Dict[str, "TTLCache"] = {}
+
+
+class TTLCache:
+    """
+    Thread-safe mapping whose entries expire after ttl seconds
+    Once maxsize entries are stored, the least recently used one is evicted
+    """
+
+    def __init__(self, ttl: float, maxsize: int = DEFAULT_MAXSIZE):
+        if ttl <= 0:
+            raise ValueError(f"TTL must be positive, got {ttl}")
+        if maxsize <= 0:
+            raise ValueError(f"Cache size must be positive, got {maxsize}")
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Returns (True, value) if the key is cached and fresh, otherwise (False, None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Stores a value, evicting the least recently used entry if the cache is full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Empties the cache and resets its counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Returns the hit/miss counters and current size of the cache"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl
+            }
+
+
+def freeze(value: Any) -> Hashable:
+    """Turns dicts and lists in the arguments into tuples so they can key the cache"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def ttl_cache(ttl: float, maxsize: int = DEFAULT_MAXSIZE) -> Callable:
+    """
+    Decorator caching a function's results by its arguments for ttl seconds
+    Exceptions are not cached, so a failed fetch is retried on the next call
+    The wrapper exposes cache_stats() and cache_clear()
+    """
+    def decorator(func: Callable) -> Callable:
+        cache = TTLCache(ttl, maxsize)
+        name = getattr(func, "__qualname__", repr(func))
+        CACHE_REGISTRY[f"{getattr(func, '__module__', '')}.{name}"] = cache
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (freeze(args), freeze(kwargs))
+            found, value = cache.get(key)
+            if found:
+                return value
+            value = func(*args, **kwargs)
+            cache.set(key, value)
+            return value
+
+        wrapper.cache = cache
+        wrapper.cache_stats = cache.stats
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+def cache_stats() -> Dict[str, Dict[str, float]]:
+    """Returns the counters of every registered cache"""
+    return {name: cache.stats() for name, cache in CACHE_REGISTRY.items()}
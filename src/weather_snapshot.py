@@ -0,0 +1,195 @@
+"""
+Fetches the weather for every region in one Open-Meteo request and stores it as a snapshot
+The dashboard reads a region's weather from the snapshot, so switching regions costs no API calls
+"""
+import logging
+from datetime import datetime, timezone
+from typing import Dict
+
+import pandas as pd
+from dotenv import load_dotenv
+from sqlalchemy import Engine, text
+from openmeteo_sdk.WeatherApiResponse import WeatherApiResponse
+
+from src.astronomy_utils import REGIONS
+from src.database import get_engine
+from src.extract_weather import (get_client, get_responses, process_current_data,
+                                 make_hourly_dataframe, process_daily_data, get_cache_stats)
+
+# The snapshot is refreshed on a schedule, so the client only needs a short-lived cache
+SNAPSHOT_CACHE_EXPIRY = 15 * 60
+
+# Number of hours from the current hour shown in the hourly forecast
+HOURS_SHOWN = 24
+
+# Order of the values in the tuple returned by process_current_data
+CURRENT_COLUMNS = ["temperature", "relative_humidity", "wind_speed",
+                   "wind_gusts", "precipitation", "cloud_cover"]
+
+# Dashboard column names against the snapshot tables' column names
+HOURLY_COLUMNS = {
+    "Date": "forecast_time",
+    "Temperature (°C)": "temperature",
+    "Relative Humidity (%)": "relative_humidity",
+    "Precipitation (mm)": "precipitation",
+    "Wind Speed (km/h)": "wind_speed",
+    "Wind Gusts (km/h)": "wind_gusts",
+    "Visibility (m)": "visibility",
+    "Cloud Cover (%)": "cloud_cover"
+}
+
+DAILY_COLUMNS = {
+    "Date": "date",
+    "Sunrise": "sunrise",
+    "Sunset": "sunset",
+    "Maximum Wind Speed (km/h)": "max_wind_speed",
+    "Maximum Wind Gusts (km/h)": "max_wind_gusts",
+    "Maximum Temperature (°C)": "max_temperature",
+    "Minimum Temperature (°C)": "min_temperature"
+}
+
+
+def extract_region_weather(
+    client,
+    regions: Dict[str, Dict[str, float]] = None
+) -> Dict[str, WeatherApiResponse]:
+    """Returns each region's weather response, fetched together in a single request"""
+    if regions is None:
+        regions = REGIONS
+
+    region_names = list(regions)
+    responses = get_responses([regions[name]["lat"] for name in region_names],
+                              [regions[name]["lon"] for name in region_names],
+                              client)
+
+    if len(responses) != len(region_names):
+        raise RuntimeError(
+            f"Expected {len(region_names)} weather responses, got {len(responses)}")
+
+    logging.info("Weather fetched for %s regions", len(region_names))
+    return dict(zip(region_names, responses))
+
+
+def make_snapshot(
+    responses: Dict[str, WeatherApiResponse],
+    fetched_at: datetime = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Processes each region's response into rows for the three snapshot tables
+    The full hourly forecast is kept so the dashboard can slice it from the current hour
+    """
+    if fetched_at is None:
+        fetched_at = datetime.now(timezone.utc)
+
+    current_rows, hourly_frames, daily_frames = [], [], []
+    for region_name, response in responses.items():
+        current_rows.append({
+            "region_name": region_name,
+            "fetched_at": fetched_at,
+            **dict(zip(CURRENT_COLUMNS, process_current_data(response)))
+        })
+
+        hourly = make_hourly_dataframe(response).rename(columns=HOURLY_COLUMNS)
+        hourly.insert(0, "region_name", region_name)
+        hourly_frames.append(hourly)
+
+        daily = process_daily_data(response).rename(columns=DAILY_COLUMNS)
+        daily["date"] = daily["date"].dt.date
+        daily.insert(0, "region_name", region_name)
+        daily_frames.append(daily)
+
+    return {
+        "weather_current": pd.DataFrame(current_rows),
+        "weather_hourly": pd.concat(hourly_frames, ignore_index=True),
+        "weather_daily": pd.concat(daily_frames, ignore_index=True)
+    }
+
+
+def save_snapshot(engine: Engine, snapshot: Dict[str, pd.DataFrame]) -> None:
+    """Replaces the stored weather of every region in the snapshot in a single transaction"""
+    region_names = [{"region_name": name}
+                    for name in snapshot["weather_current"]["region_name"]]
+
+    with engine.begin() as conn:
+        for table_name, data in snapshot.items():
+            conn.execute(text(f"DELETE FROM {table_name} WHERE region_name = :region_name"),
+                         region_names)
+            data.to_sql(table_name, conn, if_exists="append", index=False, method="multi")
+
+    logging.info("Weather snapshot saved for %s regions", len(region_names))
+
+
+def load_region_weather(
+    engine: Engine,
+    region_name: str,
+    now: datetime = None
+) -> tuple[tuple[float], pd.DataFrame, pd.DataFrame]:
+    """
+    Returns a region's stored weather in the shapes process_current_data,
+    process_hourly_data and process_daily_data return, so it can be transformed the same way
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    params = {"region_name": region_name}
+
+    with engine.connect() as conn:
+        current = pd.read_sql(
+            text("SELECT * FROM weather_current WHERE region_name = :region_name"),
+            conn, params=params)
+        hourly = pd.read_sql(
+            text("SELECT * FROM weather_hourly WHERE region_name = :region_name "
+                 "ORDER BY forecast_time"),
+            conn, params=params, parse_dates={"forecast_time": {"utc": True}})
+        daily = pd.read_sql(
+            text("SELECT * FROM weather_daily WHERE region_name = :region_name ORDER BY date"),
+            conn, params=params, parse_dates={"date": {"utc": True}})
+
+    if current.empty:
+        raise RuntimeError(f"No weather snapshot stored for {region_name}")
+
+    current_data = tuple(current.iloc[0][CURRENT_COLUMNS])
+
+    # Starts the hourly forecast from the current hour, however old the snapshot is
+    current_hour = pd.Timestamp(now).tz_convert("UTC").floor("h")
+    hourly = hourly[hourly["forecast_time"] >= current_hour].head(HOURS_SHOWN)
+    hourly = hourly.rename(columns={v: k for k, v in HOURLY_COLUMNS.items()})
+
+    daily = daily.rename(columns={v: k for k, v in DAILY_COLUMNS.items()})
+
+    return (current_data,
+            hourly[list(HOURLY_COLUMNS)].reset_index(drop=True),
+            daily[list(DAILY_COLUMNS)])
+
+
+def refresh_snapshot(engine: Engine = None, client=None) -> int:
+    """Fetches every region's weather and replaces the stored snapshot, returns the count"""
+    if engine is None:
+        engine = get_engine()
+    if client is None:
+        client = get_client(cache_expiry=SNAPSHOT_CACHE_EXPIRY)
+
+    snapshot = make_snapshot(extract_region_weather(client))
+    save_snapshot(engine, snapshot)
+    logging.info("Weather client cache: %s", get_cache_stats())
+    return len(snapshot["weather_current"])
+
+
+def handler(event, context):
+    """handler function for lambda function"""
+    try:
+        regions_saved = refresh_snapshot()
+        logging.info("%s : Lambda time remaining in MS: %s", event,
+                     context.get_remaining_time_in_millis())
+        return {"statusCode": 200, "regions": regions_saved}
+    except RuntimeError as e:
+        return {"statusCode": 500, "error": str(e)}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(message)s"
+    )
+
+    load_dotenv()
+    refresh_snapshot()
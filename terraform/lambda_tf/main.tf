@@ -64,6 +64,144 @@ resource "aws_lambda_function" "image_lambda" {
       DB_SCHEMA           = var.DB_SCHEMA
       APPLICATION_ID      = var.APPLICATION_ID
       APPLICATION_SECRET  = var.APPLICATION_SECRET
+      FORECAST_STORAGE    = "numeric"
+    }
+  }
+  vpc_config {
+    subnet_ids         = [var.private_subnet_id]
+    security_group_ids = [aws_security_group.lambda_sg.id]
+  }
+}
+
+# Lambda refreshing the weather snapshot for every region at once
+resource "aws_lambda_function" "weather_lambda" {
+  function_name = "c18-starwatch-weather-lambda"
+  role          = aws_iam_role.lambda_exec_role.arn
+  package_type  = "Image"
+
+  image_uri     = "129033205317.dkr.ecr.eu-west-2.amazonaws.com/c18-starwatch-ecr:weather_snapshot"
+  timeout       = 60
+  memory_size   = 256
+
+  architectures = ["arm64"]
+
+  environment {
+    variables = {
+      DB_HOST     = var.DB_HOST
+      DB_PORT     = var.DB_PORT
+      DB_USER     = var.DB_USER
+      DB_PASSWORD = var.DB_PASSWORD
+      DB_NAME     = var.DB_NAME
+    }
+  }
+  vpc_config {
+    subnet_ids         = [var.private_subnet_id]
+    security_group_ids = [aws_security_group.lambda_sg.id]
+  }
+}
+
+# Lambda appending new aurora activity to the history table
+resource "aws_lambda_function" "aurora_history_lambda" {
+  function_name = "c18-starwatch-aurora-history-lambda"
+  role          = aws_iam_role.lambda_exec_role.arn
+  package_type  = "Image"
+
+  image_uri     = "129033205317.dkr.ecr.eu-west-2.amazonaws.com/c18-starwatch-ecr:aurora_history"
+  timeout       = 60
+  memory_size   = 256
+
+  architectures = ["arm64"]
+
+  environment {
+    variables = {
+      DB_HOST     = var.DB_HOST
+      DB_PORT     = var.DB_PORT
+      DB_USER     = var.DB_USER
+      DB_PASSWORD = var.DB_PASSWORD
+      DB_NAME     = var.DB_NAME
+    }
+  }
+  vpc_config {
+    subnet_ids         = [var.private_subnet_id]
+    security_group_ids = [aws_security_group.lambda_sg.id]
+  }
+}
+
+# Lambda predicting the next ISS passes over every region
+resource "aws_lambda_function" "iss_passes_lambda" {
+  function_name = "c18-starwatch-iss-passes-lambda"
+  role          = aws_iam_role.lambda_exec_role.arn
+  package_type  = "Image"
+
+  image_uri     = "129033205317.dkr.ecr.eu-west-2.amazonaws.com/c18-starwatch-ecr:iss_passes"
+  timeout       = 60
+  memory_size   = 256
+
+  architectures = ["arm64"]
+
+  environment {
+    variables = {
+      DB_HOST     = var.DB_HOST
+      DB_PORT     = var.DB_PORT
+      DB_USER     = var.DB_USER
+      DB_PASSWORD = var.DB_PASSWORD
+      DB_NAME     = var.DB_NAME
+    }
+  }
+  vpc_config {
+    subnet_ids         = [var.private_subnet_id]
+    security_group_ids = [aws_security_group.lambda_sg.id]
+  }
+}
+
+# Lambda storing the Near-Earth objects approaching over the coming week
+resource "aws_lambda_function" "neo_feed_lambda" {
+  function_name = "c18-starwatch-neo-feed-lambda"
+  role          = aws_iam_role.lambda_exec_role.arn
+  package_type  = "Image"
+
+  image_uri     = "129033205317.dkr.ecr.eu-west-2.amazonaws.com/c18-starwatch-ecr:neo_feed"
+  timeout       = 60
+  memory_size   = 256
+
+  architectures = ["arm64"]
+
+  environment {
+    variables = {
+      DB_HOST     = var.DB_HOST
+      DB_PORT     = var.DB_PORT
+      DB_USER     = var.DB_USER
+      DB_PASSWORD = var.DB_PASSWORD
+      DB_NAME     = var.DB_NAME
+      API_KEY     = var.NASA_API_KEY
+    }
+  }
+  vpc_config {
+    subnet_ids         = [var.private_subnet_id]
+    security_group_ids = [aws_security_group.lambda_sg.id]
+  }
+}
+
+# Lambda adding the latest pictures of the day to the archive
+resource "aws_lambda_function" "apod_archive_lambda" {
+  function_name = "c18-starwatch-apod-archive-lambda"
+  role          = aws_iam_role.lambda_exec_role.arn
+  package_type  = "Image"
+
+  image_uri     = "129033205317.dkr.ecr.eu-west-2.amazonaws.com/c18-starwatch-ecr:apod_archive"
+  timeout       = 60
+  memory_size   = 256
+
+  architectures = ["arm64"]
+
+  environment {
+    variables = {
+      DB_HOST     = var.DB_HOST
+      DB_PORT     = var.DB_PORT
+      DB_USER     = var.DB_USER
+      DB_PASSWORD = var.DB_PASSWORD
+      DB_NAME     = var.DB_NAME
+      API_KEY     = var.NASA_API_KEY
     }
   }
   vpc_config {
@@ -97,7 +235,14 @@ resource "aws_iam_role_policy" "scheduler_invoke_lambda" {
     Statement = [{
       Effect   = "Allow"
       Action   = "lambda:InvokeFunction"
-      Resource = aws_lambda_function.image_lambda.arn
+      Resource = [
+        aws_lambda_function.image_lambda.arn,
+        aws_lambda_function.weather_lambda.arn,
+        aws_lambda_function.aurora_history_lambda.arn,
+        aws_lambda_function.iss_passes_lambda.arn,
+        aws_lambda_function.neo_feed_lambda.arn,
+        aws_lambda_function.apod_archive_lambda.arn
+      ]
     }]
   })
 }
@@ -121,6 +266,96 @@ resource "aws_scheduler_schedule" "lambda_every_day" {
   }
 }
 
+# The weather snapshot follows the hourly forecast, so it refreshes more often
+resource "aws_scheduler_schedule" "weather_every_half_hour" {
+  name       = "c18-starwatch-weather-schedule"
+  group_name = "default"
+
+  schedule_expression = "rate(30 minutes)"
+  state               = "ENABLED"
+
+  flexible_time_window {
+    mode = "OFF"
+  }
+
+  target {
+    arn      = aws_lambda_function.weather_lambda.arn
+    role_arn = aws_iam_role.eventbridge_scheduler_role.arn
+  }
+}
+
+# AuroraWatch UK updates every few minutes, unchanged documents aren't downloaded again
+resource "aws_scheduler_schedule" "aurora_history_every_ten_minutes" {
+  name       = "c18-starwatch-aurora-history-schedule"
+  group_name = "default"
+
+  schedule_expression = "rate(10 minutes)"
+  state               = "ENABLED"
+
+  flexible_time_window {
+    mode = "OFF"
+  }
+
+  target {
+    arn      = aws_lambda_function.aurora_history_lambda.arn
+    role_arn = aws_iam_role.eventbridge_scheduler_role.arn
+  }
+}
+
+# Predictions drift as the orbit decays, so they're redone with a fresh TLE a few times a day
+resource "aws_scheduler_schedule" "iss_passes_every_six_hours" {
+  name       = "c18-starwatch-iss-passes-schedule"
+  group_name = "default"
+
+  schedule_expression = "rate(6 hours)"
+  state               = "ENABLED"
+
+  flexible_time_window {
+    mode = "OFF"
+  }
+
+  target {
+    arn      = aws_lambda_function.iss_passes_lambda.arn
+    role_arn = aws_iam_role.eventbridge_scheduler_role.arn
+  }
+}
+
+# The feed's approach data is revised as orbits are refined, so the week ahead is pulled daily
+resource "aws_scheduler_schedule" "neo_feed_every_day" {
+  name       = "c18-starwatch-neo-feed-schedule"
+  group_name = "default"
+
+  schedule_expression = "cron(0 6 * * ? *)"
+  state               = "ENABLED"
+
+  flexible_time_window {
+    mode = "OFF"
+  }
+
+  target {
+    arn      = aws_lambda_function.neo_feed_lambda.arn
+    role_arn = aws_iam_role.eventbridge_scheduler_role.arn
+  }
+}
+
+# NASA publishes the new picture of the day around midnight US Eastern time
+resource "aws_scheduler_schedule" "apod_archive_every_day" {
+  name       = "c18-starwatch-apod-archive-schedule"
+  group_name = "default"
+
+  schedule_expression = "cron(0 7 * * ? *)"
+  state               = "ENABLED"
+
+  flexible_time_window {
+    mode = "OFF"
+  }
+
+  target {
+    arn      = aws_lambda_function.apod_archive_lambda.arn
+    role_arn = aws_iam_role.eventbridge_scheduler_role.arn
+  }
+}
+
 # Getting Lambda internet access
 data "aws_internet_gateway" "existing_igw" {
   filter {
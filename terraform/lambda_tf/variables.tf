@@ -63,4 +63,10 @@ variable "APPLICATION_SECRET" {
     description = "Application Secret secret for Astronomy API"
     type = string
     sensitive = true
-}
\ No newline at end of file
+}
+
+variable "NASA_API_KEY" {
+    description = "API key for the NASA APIs"
+    type = string
+    sensitive = true
+}
@@ -0,0 +1,68 @@
+# pylint: skip-file
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.apod_archive import backfill_apod, load_apod_history, APOD_URL
+
+
+def make_apod(apod_date, media_type="image"):
+    apod = {"date": apod_date, "title": f"Picture {apod_date}", "explanation": "Stars",
+            "media_type": media_type, "url": f"https://apod.nasa.gov/{apod_date}.jpg"}
+    if media_type == "image":
+        apod["hdurl"] = f"https://apod.nasa.gov/{apod_date}_hd.jpg"
+    return apod
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE apod (
+                apod_date DATE PRIMARY KEY, title TEXT, explanation TEXT, media_type TEXT,
+                image_url TEXT, hd_image_url TEXT)"""))
+    return engine
+
+
+def test_backfill_apod_one_request(engine, requests_mock):
+    requests_mock.get(APOD_URL, json=[make_apod("2025-05-21"),
+                                      make_apod("2025-05-22", "video"),
+                                      make_apod("2025-05-23")])
+
+    assert backfill_apod(engine, date(2025, 5, 21), date(2025, 5, 23)) == 3
+    assert requests_mock.call_count == 1
+    assert requests_mock.last_request.qs["start_date"] == ["2025-05-21"]
+    assert requests_mock.last_request.qs["end_date"] == ["2025-05-23"]
+
+    with engine.connect() as conn:
+        assert conn.execute(text(
+            "SELECT hd_image_url FROM apod WHERE media_type = 'video'")).scalar() is None
+
+
+def test_backfill_apod_upserts(engine, requests_mock):
+    requests_mock.get(APOD_URL, json=[make_apod("2025-05-23")])
+    backfill_apod(engine, date(2025, 5, 23), date(2025, 5, 23))
+
+    updated = make_apod("2025-05-23")
+    updated["title"] = "Corrected"
+    requests_mock.get(APOD_URL, json=[updated])
+    backfill_apod(engine, date(2025, 5, 23), date(2025, 5, 23))
+
+    assert list(load_apod_history(engine)["title"]) == ["Corrected"]
+
+
+def test_load_apod_history_newest_images_first(engine, requests_mock):
+    requests_mock.get(APOD_URL, json=[make_apod("2025-05-21"),
+                                      make_apod("2025-05-22", "video"),
+                                      make_apod("2025-05-23")])
+    backfill_apod(engine, date(2025, 5, 21), date(2025, 5, 23))
+
+    assert list(load_apod_history(engine)["apod_date"]) == ["2025-05-23", "2025-05-21"]
+    assert list(load_apod_history(engine, before="2025-05-23")["apod_date"]) == ["2025-05-21"]
+
+
+def test_load_apod_history_none_stored(engine):
+    with pytest.raises(RuntimeError):
+        load_apod_history(engine)
@@ -0,0 +1,84 @@
+# pylint: skip-file
+import threading
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+import src.apod_image_store as apod_image_store
+from src.apod_image_store import ApodImageStore
+
+IMAGE_URL = "https://apod.nasa.gov/apod/image/2505/galaxy.jpg"
+SLOW_IMAGE_URL = "https://apod.nasa.gov/apod/image/2505/nebula.jpg"
+
+
+@pytest.fixture
+def original():
+    output = BytesIO()
+    Image.new("RGB", (4000, 2000), "navy").save(output, format="JPEG")
+    return output.getvalue()
+
+
+@pytest.mark.parametrize(
+    'rendition, size',
+    (
+        ("thumbnail", (320, 160)),
+        ("web", (1280, 640))
+    )
+)
+def test_get_rendition_scales_down(tmp_path, requests_mock, original, rendition, size):
+    requests_mock.get(IMAGE_URL, content=original)
+    store = ApodImageStore(tmp_path)
+
+    image = store.get_rendition(IMAGE_URL, rendition)
+    assert Image.open(BytesIO(image)).size == size
+    assert len(image) < len(original)
+
+
+def test_get_rendition_downloads_once(tmp_path, requests_mock, original):
+    requests_mock.get(IMAGE_URL, content=original)
+    store = ApodImageStore(tmp_path)
+
+    thumbnail = store.get_rendition(IMAGE_URL, "thumbnail")
+    store.get_rendition(IMAGE_URL, "web")
+    assert store.get_rendition(IMAGE_URL, "thumbnail") == thumbnail
+    assert requests_mock.call_count == 1
+
+
+def test_get_rendition_not_held_up_by_another_download(tmp_path, monkeypatch, original):
+    started, release = threading.Event(), threading.Event()
+
+    def fake_get(url, timeout):
+        if url == SLOW_IMAGE_URL:
+            started.set()
+            release.wait(timeout=10)
+        return SimpleNamespace(status_code=200, content=original)
+
+    monkeypatch.setattr(apod_image_store.reqs, "get", fake_get)
+    store = ApodImageStore(tmp_path)
+
+    slow = threading.Thread(target=store.get_rendition, args=(SLOW_IMAGE_URL,))
+    fast = threading.Thread(target=store.get_rendition, args=(IMAGE_URL,))
+    slow.start()
+    try:
+        assert started.wait(timeout=10)
+        fast.start()
+        fast.join(timeout=5)
+        # Finishes while the other image is still downloading
+        assert not fast.is_alive()
+    finally:
+        release.set()
+        slow.join()
+        fast.join()
+
+
+def test_get_rendition_download_fails(tmp_path, requests_mock):
+    requests_mock.get(IMAGE_URL, status_code=404)
+    with pytest.raises(RuntimeError):
+        ApodImageStore(tmp_path).get_rendition(IMAGE_URL)
+
+
+def test_get_rendition_unknown(tmp_path):
+    with pytest.raises(ValueError):
+        ApodImageStore(tmp_path).get_rendition(IMAGE_URL, "poster")
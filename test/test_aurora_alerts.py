@@ -0,0 +1,82 @@
+# pylint: skip-file
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.aurora_alerts import (evaluate_alert, parse_alert_cooldowns, check_for_alert,
+                               FileStateStore, DatabaseStateStore)
+
+START = datetime(2025, 8, 3, 16, tzinfo=timezone.utc)
+
+
+def poll(statuses, cooldowns=None, state=None):
+    """Runs each (status, hours after START) poll through the state machine"""
+    alerts = []
+    for status, hours in statuses:
+        alert, state = evaluate_alert(state, status, START + timedelta(hours=hours), cooldowns)
+        alerts.append(alert)
+    return alerts, state
+
+
+def test_evaluate_alert_fires_on_transition_only():
+    alerts, _ = poll([("Amber", 0), ("Red", 1), ("Red", 2), ("Red", 3)])
+    assert alerts == [False, True, False, False]
+
+
+def test_evaluate_alert_coalesces_repeated_polls():
+    alerts, state = poll([("Amber", 0), ("Red", 1)])
+    alert, same_state = evaluate_alert(state, "Red", START + timedelta(hours=1))
+    assert not alert
+    assert same_state == state
+
+
+def test_evaluate_alert_cooldown_suppresses_flapping():
+    alerts, _ = poll([("Amber", 0), ("Red", 1), ("Amber", 2), ("Red", 3), ("Amber", 4), ("Red", 5)],
+                     cooldowns={"Red": 3})
+    assert alerts == [False, True, False, False, False, True]
+
+
+def test_evaluate_alert_configurable_colours():
+    alerts, _ = poll([("Green", 0), ("Amber", 1), ("Red", 2), ("Amber", 3)],
+                     cooldowns={"Amber": 0, "Red": 0})
+    assert alerts == [False, True, True, False]
+
+
+def test_evaluate_alert_first_poll_red_alerts():
+    alerts, state = poll([("Red", 0)])
+    assert alerts == [True]
+    assert state["alerted_status"] == "Red"
+
+
+def test_evaluate_alert_unknown_status():
+    with pytest.raises(ValueError):
+        evaluate_alert(None, "Purple", START)
+
+
+def test_parse_alert_cooldowns():
+    assert parse_alert_cooldowns("amber:6, Red:3") == {"Amber": 6.0, "Red": 3.0}
+    assert parse_alert_cooldowns("Red") == {"Red": 0.0}
+    with pytest.raises(ValueError):
+        parse_alert_cooldowns("Blue:1")
+
+
+def test_file_state_store_round_trip(tmp_path):
+    store = FileStateStore(tmp_path / "alert_state.json")
+    assert store.load() is None
+
+    assert check_for_alert(store, "Red", START)
+    assert not check_for_alert(store, "Red", START + timedelta(hours=1))
+    assert store.load()["status_time"] == (START + timedelta(hours=1)).isoformat()
+
+
+def test_database_state_store_round_trip():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE aurora_alert_state (alert_key TEXT PRIMARY KEY, state TEXT)"))
+    store = DatabaseStateStore(engine)
+
+    assert check_for_alert(store, "Red", START)
+    assert not check_for_alert(store, "Red", START)
+    assert not check_for_alert(store, "Red", START + timedelta(hours=1))
+    assert store.load()["alerted_at"] == START.isoformat()
@@ -0,0 +1,116 @@
+# pylint: skip-file
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+import src.aurora_email_lambda as email_lambda
+from src.aurora_email_lambda import render_email, handler, FALLBACK_REGION
+
+HOUR = datetime(2025, 8, 4, 21, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def clear_rendered_emails():
+    email_lambda.RENDERED_EMAILS.clear()
+
+
+@pytest.fixture
+def context(monkeypatch):
+    calls = {"windows": 0}
+
+    def fake_best_windows(engine, regions, start, aurora_status, top):
+        calls["windows"] += 1
+        return pd.DataFrame({
+            "location": ["Scotland"],
+            "start": [pd.Timestamp("2025-08-04 22:00", tz="UTC")],
+            "hours": [4],
+            "mean_score": [87.4]
+        })
+
+    monkeypatch.setattr(email_lambda, "get_engine", lambda: None)
+    monkeypatch.setattr(email_lambda, "get_best_windows", fake_best_windows)
+    monkeypatch.setattr(email_lambda, "load_next_passes", lambda engine, region_name, n: {
+        "response": [{"risetime": 1754345400, "duration": 360}]})
+    return calls
+
+
+def test_render_email_per_status_content(context):
+    email = render_email("Amber", "21:00, Mon 04 Aug", HOUR)
+
+    assert "Amber alert: possible aurora." in email
+    assert "Likely" in email
+    assert "21:00, Mon 04 Aug" in email
+    assert "Scotland, from 22:00 on Mon 04 Aug for 4 hours (stargazing score 87/100)." in email
+    assert "visible for 6 minutes" in email
+
+
+def test_render_email_memoised_per_status_and_hour(context):
+    first = render_email("Red", "21:00, Mon 04 Aug", HOUR)
+    assert render_email("Red", "21:00, Mon 04 Aug", HOUR) is first
+    assert context["windows"] == 1
+
+    render_email("Amber", "21:00, Mon 04 Aug", HOUR)
+    assert context["windows"] == 2
+
+
+def test_render_email_shows_each_status_time_in_the_hour(context):
+    first = render_email("Red", "21:00, Mon 04 Aug", HOUR)
+    later = render_email("Red", "21:30, Mon 04 Aug", HOUR)
+
+    assert "21:00, Mon 04 Aug" in first
+    assert "21:30, Mon 04 Aug" in later
+    assert "21:00, Mon 04 Aug" not in later
+
+
+def test_render_email_fallback_not_memoised(monkeypatch):
+    def failing_best_windows(*args, **kwargs):
+        raise RuntimeError("No database")
+
+    monkeypatch.setattr(email_lambda, "get_engine", lambda: None)
+    monkeypatch.setattr(email_lambda, "get_best_windows", failing_best_windows)
+    monkeypatch.setattr(email_lambda, "load_next_passes", lambda engine, region_name, n: {
+        "response": []})
+
+    email = render_email("Red", "21:00, Mon 04 Aug", HOUR)
+
+    assert FALLBACK_REGION in email
+    assert email_lambda.RENDERED_EMAILS.get(("Red", "21:00, Mon 04 Aug", HOUR)) == (False, None)
+
+
+def test_describe_next_iss_pass_reads_stored_pass(context, monkeypatch):
+    def failing_get_passes(*args, **kwargs):
+        raise AssertionError("The stored pass should be used")
+
+    monkeypatch.setattr(email_lambda, "get_passes", failing_get_passes)
+
+    assert email_lambda.describe_next_iss_pass("Scotland") == \
+        "Over Scotland at 22:10 UTC on Mon 04 Aug, visible for 6 minutes."
+
+
+def test_describe_next_iss_pass_predicts_without_stored_pass(context, monkeypatch):
+    def no_stored_passes(engine, region_name, n):
+        raise RuntimeError(f"No upcoming ISS passes stored for {region_name}")
+
+    predicted = []
+
+    def fake_get_passes(lon, lat, n):
+        predicted.append((lon, lat, n))
+        return {"response": [{"risetime": 1754345400, "duration": 360}]}
+
+    monkeypatch.setattr(email_lambda, "load_next_passes", no_stored_passes)
+    monkeypatch.setattr(email_lambda, "get_passes", fake_get_passes)
+
+    assert "Over Scotland at 22:10 UTC" in email_lambda.describe_next_iss_pass("Scotland")
+    assert len(predicted) == 1
+
+
+def test_render_email_unknown_status():
+    with pytest.raises(ValueError):
+        render_email("Purple", "21:00, Mon 04 Aug", HOUR)
+
+
+def test_handler_returns_html(context):
+    result = handler({"Status": "Red", "StatusTime": "21:00, Mon 04 Aug"})
+    assert result["html"].lstrip().startswith("<!DOCTYPE html>")
+    assert "Aurora Alert!" in result["html"]
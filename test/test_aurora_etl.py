@@ -5,7 +5,11 @@ import pandas as pd
 from unittest.mock import MagicMock
 
 
-from src.aurora_etl import extract_activity_data, find_most_recent_status_info, is_red_colour_status
+import io
+from datetime import datetime, timezone
+
+from src.aurora_etl import (extract_activity_data, find_most_recent_status_info, is_red_colour_status,
+                            fetch_activity_document, iter_activity_records)
 
 
 def test_extract_activity_data_returns_df_correct_len(requests_mock):
@@ -115,3 +119,49 @@ def test_is_red_colour_status_false():
 
 def test_is_red_colour_status_wrong_type():
     assert is_red_colour_status(0) == False
+
+
+ACTIVITY_XML = b"""<site_activity api_version="0.2.5" project_id="project: AWN">
+    <updated>
+        <datetime>2025-08-04T15:12:32+0000</datetime>
+    </updated>
+    <activity status_id="green">
+        <datetime>2025-08-03T16:00:00+0000</datetime>
+        <value>18.9</value>
+    </activity>
+    <activity status_id="yellow">
+        <datetime>2025-08-03T17:00:00+0000</datetime>
+        <value>52.5</value>
+    </activity>
+    </site_activity>
+    """
+
+
+def test_iter_activity_records_parses_each_activity():
+    records = list(iter_activity_records(io.BytesIO(ACTIVITY_XML)))
+
+    assert records == [
+        {"activity_time": datetime(2025, 8, 3, 16, tzinfo=timezone.utc),
+         "status_id": "green", "value": 18.9},
+        {"activity_time": datetime(2025, 8, 3, 17, tzinfo=timezone.utc),
+         "status_id": "yellow", "value": 52.5}
+    ]
+
+
+def test_fetch_activity_document_sends_validators(requests_mock):
+    url = "http://aurorawatch-api.lancs.ac.uk/0.2.5/status/project/awn/sum-activity.xml"
+    requests_mock.get(url, status_code=304)
+
+    response = fetch_activity_document(url, etag='"abc"', last_modified="Mon, 04 Aug 2025")
+
+    assert response is None
+    assert requests_mock.last_request.headers["If-None-Match"] == '"abc"'
+    assert requests_mock.last_request.headers["If-Modified-Since"] == "Mon, 04 Aug 2025"
+
+
+def test_fetch_activity_document_raises_runtime_error(requests_mock):
+    url = "http://aurorawatch-api.lancs.ac.uk/0.2.5/status/project/awn/sum-activity.xml"
+    requests_mock.get(url, status_code=500)
+
+    with pytest.raises(RuntimeError):
+        fetch_activity_document(url)
@@ -0,0 +1,75 @@
+# pylint: skip-file
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.aurora_etl import find_most_recent_status_info
+from src.aurora_history import ingest_activity, load_recent_activity
+
+URL = "http://aurorawatch-api.lancs.ac.uk/0.2.5/status/project/awn/sum-activity.xml"
+
+
+def make_activity_xml(*activities):
+    rows = "".join(
+        f'<activity status_id="{status}"><datetime>{when}</datetime><value>{value}</value></activity>'
+        for status, when, value in activities)
+    return f'<site_activity api_version="0.2.5">{rows}</site_activity>'.encode("utf-8")
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE aurora_activity (
+                activity_time TIMESTAMP PRIMARY KEY, status_id TEXT, value REAL)"""))
+        conn.execute(text("""
+            CREATE TABLE aurora_feed_state (
+                feed_url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, checked_at TIMESTAMP)"""))
+    return engine
+
+
+def test_ingest_activity_only_inserts_newer_records(engine, requests_mock):
+    requests_mock.get(URL, content=make_activity_xml(
+        ("green", "2025-08-03T16:00:00+0000", 18.9),
+        ("green", "2025-08-03T17:00:00+0000", 22.5)), headers={"ETag": '"v1"'})
+    assert ingest_activity(engine, URL) == 2
+
+    requests_mock.get(URL, content=make_activity_xml(
+        ("green", "2025-08-03T16:00:00+0000", 18.9),
+        ("green", "2025-08-03T17:00:00+0000", 22.5),
+        ("amber", "2025-08-03T18:00:00+0000", 110.0)), headers={"ETag": '"v2"'})
+    assert ingest_activity(engine, URL) == 1
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM aurora_activity")).scalar() == 3
+    assert requests_mock.last_request.headers["If-None-Match"] == '"v1"'
+
+
+def test_ingest_activity_skips_unchanged_document(engine, requests_mock):
+    requests_mock.get(URL, content=make_activity_xml(
+        ("green", "2025-08-03T16:00:00+0000", 18.9)),
+        headers={"Last-Modified": "Sun, 03 Aug 2025 16:05:00 GMT"})
+    ingest_activity(engine, URL)
+
+    requests_mock.get(URL, status_code=304)
+    assert ingest_activity(engine, URL) == 0
+    assert requests_mock.last_request.headers["If-Modified-Since"] == "Sun, 03 Aug 2025 16:05:00 GMT"
+
+
+def test_load_recent_activity_matches_extract_shape(engine, requests_mock):
+    requests_mock.get(URL, content=make_activity_xml(
+        ("green", "2025-08-03T16:00:00+0000", 18.9),
+        ("red", "2025-08-03T17:00:00+0000", 220.0)))
+    ingest_activity(engine, URL)
+
+    activity = load_recent_activity(engine)
+
+    assert list(activity.columns) == ["@status_id", "datetime", "value"]
+    assert list(activity["datetime"]) == ["2025-08-03T16:00:00+0000", "2025-08-03T17:00:00+0000"]
+    assert find_most_recent_status_info({"Red": "Aurora likely"}, activity) == \
+        ("Red", "Aurora likely", "17:00 PM, Sun 03 Aug")
+
+
+def test_load_recent_activity_empty(engine):
+    with pytest.raises(RuntimeError):
+        load_recent_activity(engine)
@@ -0,0 +1,45 @@
+# pylint: skip-file
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.coordinate_format import format_hours, format_degrees
+
+
+@pytest.fixture
+def positions():
+    with open("data/astronomy_test_data.json", encoding="utf-8") as f:
+        rows = json.load(f)["data"]["table"]["rows"]
+    return [cell["position"] for row in rows for cell in row["cells"]]
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_format_hours_matches_api_strings(positions, dtype):
+    right_ascension = [position["equatorial"]["rightAscension"] for position in positions]
+    hours = pd.Series([float(coords["hours"]) for coords in right_ascension], dtype=dtype)
+
+    assert format_hours(hours).tolist() == [coords["string"] for coords in right_ascension]
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_format_degrees_matches_api_strings(positions, dtype):
+    angles = [position["equatorial"]["declination"] for position in positions]
+    angles += [position["horizontal"][name] for position in positions
+               for name in ("altitude", "azimuth")]
+    degrees = pd.Series([float(coords["degrees"]) for coords in angles], dtype=dtype)
+
+    assert format_degrees(degrees).tolist() == [coords["string"] for coords in angles]
+
+
+def test_format_degrees_negative_counts_from_degree_below():
+    assert format_degrees(pd.Series([-0.27, -89.81])).tolist() == [
+        "-1° 43' 48\"", "-90° 11' 24\""]
+
+
+def test_format_keeps_missing_values_missing():
+    result = format_hours(pd.Series([np.nan, 0.12]))
+
+    assert pd.isna(result.iloc[0])
+    assert result.iloc[1] == "00h 07m 12s"
@@ -0,0 +1,71 @@
+# pylint: skip-file
+from datetime import date
+
+import pytest
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from src.dashboard_queries import get_planetary_body_data
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE planetary_body (planetary_body_id INT, planetary_body_name TEXT)"))
+        conn.execute(text("CREATE TABLE constellation (constellation_id INT, constellation_name TEXT)"))
+        conn.execute(text("CREATE TABLE distance (planetary_body_id INT, date TEXT, astronomical_units FLOAT)"))
+        conn.execute(text("""
+            CREATE TABLE forecast (
+                date TEXT, latitude FLOAT, longitude FLOAT,
+                planetary_body_id INT, constellation_id INT,
+                right_ascension_hours FLOAT, right_ascension_string TEXT,
+                declination_degrees FLOAT, declination_string TEXT,
+                altitude_degrees FLOAT, altitude_string TEXT,
+                azimuth_degrees FLOAT, azimuth_string TEXT
+            )"""))
+        # Stands in for the materialised view, which SQLite doesn't have
+        conn.execute(text("""
+            CREATE VIEW planetary_body_forecast AS
+            SELECT pb.planetary_body_name, f.latitude, f.longitude, f.date,
+                   c.constellation_name, d.astronomical_units,
+                   f.right_ascension_hours, f.declination_degrees,
+                   f.altitude_degrees, f.azimuth_degrees
+            FROM forecast f
+            JOIN planetary_body pb ON pb.planetary_body_id = f.planetary_body_id
+            JOIN distance d ON d.planetary_body_id = f.planetary_body_id AND d.date = f.date
+            JOIN constellation c ON c.constellation_id = f.constellation_id"""))
+        conn.execute(text("INSERT INTO planetary_body VALUES (1, 'Sun'), (2, 'Moon')"))
+        conn.execute(text("INSERT INTO constellation VALUES (1, 'Cancer')"))
+        for day in ("2025-08-10", "2025-08-11", "2025-08-30"):
+            for body in (1, 2):
+                conn.execute(text("INSERT INTO distance VALUES (:b, :d, 1.0)"), {"b": body, "d": day})
+                for lat, lon in ((51.3, -0.05), (55.57, -3.11)):
+                    conn.execute(text("""
+                        INSERT INTO forecast VALUES
+                        (:d, :lat, :lon, :b, 1, 9.35, '09h 21m 00s', 15.51, '15° 30'' 36"',
+                         54.09, '54° 5'' 24"', 177.44, '177° 26'' 24"')
+                    """), {"d": day, "lat": lat, "lon": lon, "b": body})
+    return engine
+
+
+def test_get_planetary_body_data_filters_in_sql(engine):
+    result = get_planetary_body_data(
+        engine, "Sun", 51.3, -0.05, start_date=date(2025, 8, 10))
+
+    assert len(result) == 2
+    assert (result["planetary_body_name"] == "Sun").all()
+    assert list(result["date"]) == [pd.Timestamp("2025-08-10"), pd.Timestamp("2025-08-11")]
+    assert list(result.columns) == [
+        "planetary_body_name", "date", "constellation_name", "astronomical_units",
+        "right_ascension_hours", "declination_degrees",
+        "altitude_degrees", "azimuth_degrees"
+    ]
+
+
+def test_get_planetary_body_data_empty_window(engine):
+    result = get_planetary_body_data(
+        engine, "Moon", 51.3, -0.05,
+        start_date=date(2025, 9, 1), end_date=date(2025, 9, 7))
+
+    assert result.empty
@@ -0,0 +1,77 @@
+# pylint: skip-file
+import json
+from datetime import date
+
+import pytest
+
+from src.ephemeris_astronomy_data import (format_hours, format_degrees,
+                                          get_local_planetary_positions, cross_check)
+from src.transform_astronomy_data import filter_data
+
+
+@pytest.fixture
+def raw_data():
+    with open("data/astronomy_test_data.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def local_data():
+    return get_local_planetary_positions(
+        {"lat": +51.30, "lon": -00.05},
+        {"start": date(2025, 8, 10), "end": date(2025, 8, 12)},
+        "11:59:19"
+    )
+
+
+@pytest.mark.parametrize(
+    'hours, expected',
+    (
+        (9.35, "09h 21m 00s"),
+        (22.33, "22h 19m 48s"),
+        (0.12, "00h 07m 12s")
+    )
+)
+def test_format_hours(hours, expected):
+    assert format_hours(hours) == expected
+
+
+@pytest.mark.parametrize(
+    'degrees, expected',
+    (
+        (15.51, '15° 30\' 36"'),
+        (-12.47, '-13° 31\' 48"'),
+        (-0.27, '-1° 43\' 48"'),
+        (0.00, '0° 0\' 0"')
+    )
+)
+def test_format_degrees(degrees, expected):
+    assert format_degrees(degrees) == expected
+
+
+def test_local_positions_shape(local_data):
+    rows = local_data["data"]["table"]["rows"]
+
+    assert [row["entry"]["name"] for row in rows] == [
+        "Sun", "Moon", "Mercury", "Venus", "Earth", "Mars",
+        "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"]
+    assert all(len(row["cells"]) == 3 for row in rows)
+    assert local_data["data"]["observer"]["location"]["latitude"] == 51.3
+
+
+def test_local_positions_filter_like_api_data(local_data, raw_data):
+    local_frame = filter_data(local_data)
+    api_frame = filter_data(raw_data)
+
+    assert list(local_frame.columns) == list(api_frame.columns)
+    assert len(local_frame) == 33
+    assert local_frame["date"].iloc[0] == "2025-08-10"
+
+
+def test_cross_check_against_fixture(raw_data):
+    report = cross_check(raw_data)
+
+    assert len(report) == 22
+    assert report["equatorial_deviation_degrees"].max() < 1
+    assert report["horizontal_deviation_degrees"].max() < 1
+    assert report["constellation_matches"].all()
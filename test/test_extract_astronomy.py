@@ -1,4 +1,5 @@
 # pylint: skip-file
+import io
 import os
 import base64
 from datetime import datetime, timedelta
@@ -8,7 +9,9 @@ import pytest
 from unittest.mock import MagicMock, Mock, patch
 import pandas as pd
 
-from src.extract_astronomy_data import get_positions_url, get_planetary_positions, get_date_range
+from src.extract_astronomy_data import (get_positions_url, get_planetary_positions, get_date_range,
+                                        find_missing_dates, group_date_ranges, get_backfill_requests,
+                                        stream_planetary_positions)
 
 
 @pytest.fixture
@@ -116,3 +119,93 @@ def test_get_planetary_positions_api_down(mocker, data):
             data["time"]
         )
         assert mock_api.call_count == 1
+
+
+def test_group_date_ranges_merges_contiguous_dates():
+    dates = [
+        datetime(2025, 8, 12).date(),
+        datetime(2025, 8, 10).date(),
+        datetime(2025, 8, 11).date(),
+        datetime(2025, 8, 15).date(),
+        datetime(2025, 8, 11).date()
+    ]
+
+    assert group_date_ranges(dates) == [
+        {"start": datetime(2025, 8, 10).date(), "end": datetime(2025, 8, 12).date()},
+        {"start": datetime(2025, 8, 15).date(), "end": datetime(2025, 8, 15).date()}
+    ]
+
+
+def test_group_date_ranges_empty():
+    assert group_date_ranges([]) == []
+
+
+@patch('src.extract_astronomy_data.datetime')
+def test_find_missing_dates_groups_by_location(mock_datetime):
+    mock_datetime.now.return_value = datetime(2025, 8, 10)
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = [
+        (51.3, -0.05, datetime(2025, 8, 11).date()),
+        (51.3, -0.05, datetime(2025, 8, 12).date()),
+        (55.57, -3.11, datetime(2025, 8, 17).date())
+    ]
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+    locations = [{"lat": 51.3, "lon": -0.05}, {"lat": 55.57, "lon": -3.11}]
+
+    missing = find_missing_dates(mock_conn, locations, horizon_days=7)
+
+    params = mock_cursor.execute.call_args.args[1]
+    assert params == ([51.3, 55.57], [-0.05, -3.11],
+                      datetime(2025, 8, 10).date(), datetime(2025, 8, 17).date())
+    assert missing == {
+        (51.3, -0.05): [datetime(2025, 8, 11).date(), datetime(2025, 8, 12).date()],
+        (55.57, -3.11): [datetime(2025, 8, 17).date()]
+    }
+
+
+@patch('src.extract_astronomy_data.find_missing_dates')
+def test_get_backfill_requests_one_request_per_gap(mock_missing):
+    mock_missing.return_value = {
+        (51.3, -0.05): [datetime(2025, 8, 11).date(),
+                        datetime(2025, 8, 12).date(),
+                        datetime(2025, 8, 14).date()]
+    }
+
+    backfill_requests = get_backfill_requests(MagicMock(), [])
+
+    assert backfill_requests == [
+        ({"lat": 51.3, "lon": -0.05},
+         {"start": datetime(2025, 8, 11).date(), "end": datetime(2025, 8, 12).date()}),
+        ({"lat": 51.3, "lon": -0.05},
+         {"start": datetime(2025, 8, 14).date(), "end": datetime(2025, 8, 14).date()})
+    ]
+
+
+def test_stream_planetary_positions_yields_records(data):
+    with open("data/astronomy_test_data.json", "rb") as f:
+        raw = io.BytesIO(f.read())
+    response = MagicMock()
+    response.status_code = 200
+    response.raw = raw
+    session = MagicMock()
+    session.get.return_value.__enter__.return_value = response
+
+    records = list(stream_planetary_positions(
+        data["coordinates"], data["dates"], {}, "00:00:00", session=session))
+
+    assert len(records) == 22
+    assert records[0]["planetary_body"] == "Sun"
+    assert records[0]["date"] == "2025-08-10"
+    assert session.get.call_args.kwargs["stream"] is True
+
+
+def test_stream_planetary_positions_api_down(data):
+    response = MagicMock()
+    response.status_code = 400
+    session = MagicMock()
+    session.get.return_value.__enter__.return_value = response
+
+    with pytest.raises(RuntimeError):
+        list(stream_planetary_positions(
+            data["coordinates"], data["dates"], {}, "00:00:00", session=session))
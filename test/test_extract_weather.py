@@ -3,11 +3,13 @@
 from unittest.mock import MagicMock
 import pytest
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from freezegun import freeze_time
 
-from src.extract_weather import (get_response, process_current_data, 
-                                 process_hourly_data, process_daily_data, convert_unix_timestamp)
+from src.extract_weather import (get_response, get_responses, process_current_data, 
+                                 process_hourly_data, process_daily_data, convert_unix_timestamp,
+                                 get_client, make_cache_backend, LRUDictStorage, CacheStats,
+                                 convert_unix_timestamps, create_client, CACHE_STATS)
 
 
 
@@ -31,6 +33,16 @@ def test_get_response_mock_client_runtime_error():
 
 
 
+def test_get_responses_keeps_original_error():
+    mock_client = MagicMock()
+    error = ConnectionError("Open-Meteo unavailable")
+    mock_client.weather_api.side_effect = error
+
+    with pytest.raises(RuntimeError) as raised:
+        get_responses([29], [-03.11], mock_client)
+    assert raised.value.__cause__ is error
+
+
 def test_process_current_data_returns_tuple_correct_len():
     mock_response = MagicMock()
     current_data = process_current_data(mock_response)
@@ -219,3 +231,91 @@ def test_process_daily_data_runtime_error():
 
     with pytest.raises(RuntimeError):
         process_daily_data(mock_response)
+
+
+
+def test_get_client_is_shared_per_process():
+    assert get_client(60, backend="memory") is get_client(60, backend="memory")
+    assert get_client(60, backend="memory") is not get_client(120, backend="memory")
+
+
+def test_get_client_backend_from_environment(monkeypatch):
+    monkeypatch.setenv("WEATHER_CACHE_BACKEND", "memory")
+    assert get_client(90) is get_client(90, backend="memory")
+
+
+def test_get_client_unknown_backend():
+    with pytest.raises(ValueError):
+        get_client(60, backend="redis")
+
+
+def test_make_cache_backend_sqlite_uses_wal(tmp_path):
+    backend = make_cache_backend("sqlite", str(tmp_path / "weather"))
+    with backend.responses.connection() as conn:
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert journal_mode == "wal"
+
+
+def test_make_cache_backend_memory_is_lru():
+    backend = make_cache_backend("memory")
+    assert isinstance(backend.responses, LRUDictStorage)
+
+
+def test_lru_dict_storage_evicts_least_recently_used():
+    storage = LRUDictStorage(maxsize=2)
+    storage["a"] = 1
+    storage["b"] = 2
+    storage["a"]
+    storage["c"] = 3
+
+    assert set(storage) == {"a", "c"}
+
+
+def test_cache_stats_counts_hits_and_misses():
+    stats = CacheStats()
+    stats.record(MagicMock(from_cache=True))
+    stats.record(MagicMock(from_cache=False))
+    stats.record(MagicMock(from_cache=True))
+
+    assert stats.as_dict() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3}
+
+
+def test_create_client_counts_each_response_once(requests_mock):
+    requests_mock.get("https://api.open-meteo.com/v1/forecast", content=b"")
+    session = create_client(1234, "memory")._session
+    before = CACHE_STATS.as_dict()
+
+    session.get("https://api.open-meteo.com/v1/forecast")
+    session.get("https://api.open-meteo.com/v1/forecast")
+
+    after = CACHE_STATS.as_dict()
+    assert requests_mock.call_count == 1
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+
+def test_process_hourly_data_slices_by_response_timestamps():
+    mock_response = MagicMock()
+    mock_hourly = mock_response.Hourly.return_value
+
+    start = datetime(2025, 8, 1, tzinfo=timezone.utc)
+    mock_hourly.Time.return_value = start.timestamp()
+    mock_hourly.TimeEnd.return_value = (start + timedelta(days=7)).timestamp()
+    mock_hourly.Interval.return_value = 3600
+    mock_variable = MagicMock()
+    mock_variable.ValuesAsNumpy.return_value = list(range(168))
+    mock_hourly.Variables.return_value = mock_variable
+
+    # 01:30 BST is 00:30 GMT, so the forecast starts from the response's hour 24
+    now = datetime(2025, 8, 2, 1, 30, tzinfo=timezone(timedelta(hours=1)))
+    hourly_data = process_hourly_data(mock_response, now=now)
+
+    assert len(hourly_data) == 24
+    assert hourly_data["Date"].iloc[0] == pd.Timestamp("2025-08-02 00:00", tz="UTC")
+    assert hourly_data["Temperature (°C)"].iloc[0] == 24
+
+
+def test_convert_unix_timestamps_matches_convert_unix_timestamp():
+    timestamps = [0, 1754301848, 1754373600]
+    assert list(convert_unix_timestamps(timestamps)) == [
+        convert_unix_timestamp(timestamp) for timestamp in timestamps]
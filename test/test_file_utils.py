@@ -0,0 +1,24 @@
+# pylint: skip-file
+from concurrent.futures import ThreadPoolExecutor
+
+from src.file_utils import write_atomically
+
+
+def test_write_atomically_replaces_content(tmp_path):
+    path = tmp_path / "image.jpg"
+    write_atomically(path, b"old")
+    write_atomically(path, b"new")
+
+    assert path.read_bytes() == b"new"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_write_atomically_concurrent_writes_of_one_path(tmp_path):
+    path = tmp_path / "image.jpg"
+    contents = [bytes([i]) * 100000 for i in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda content: write_atomically(path, content), contents))
+
+    assert path.read_bytes() in contents
+    assert list(tmp_path.iterdir()) == [path]
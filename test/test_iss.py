@@ -4,33 +4,41 @@ from unittest.mock import MagicMock
 from datetime import datetime, timezone
 
 import requests
+import pandas as pd
 import pytest
 import freezegun
 
-from src.iss_etl import get_iss_lat_long_now, get_passes, present_iss_passes
+from src.iss_etl import (get_iss_lat_long_now, get_passes, present_iss_passes,
+                         clear_tle_cache, get_tle, predict_passes_for_locations)
 
 LONDON_LAT = +51.30
 LONDON_LON = -00.05
 STATIC_TIMESTAMP=1754469547
 STATIC_DATETIME=datetime.fromtimestamp(STATIC_TIMESTAMP, tz=timezone.utc)
 
+@pytest.fixture(autouse=True)
+def empty_tle_cache():
+    clear_tle_cache()
+    yield
+    clear_tle_cache()
+
 @pytest.fixture
 def tle_fix():
     return """ISS (ZARYA)
 1 25544U 98067A   25217.57738833  .00008075  00000-0  14750-3 0  9991
 2 25544  51.6349  62.2717 0001595 155.7040 204.4024 15.50349286522825"""
 
-def test_lat_long_ok(mocker):
-    loc_dict = {"iss_position": {"latitude": LONDON_LAT, "longitude": LONDON_LON}}
+@freezegun.freeze_time(STATIC_DATETIME)
+def test_lat_long_ok(mocker, tle_fix):
     req_mock = MagicMock(spec=requests.Response)
     req_mock.status_code = 200
-    req_mock.json = MagicMock(return_value=loc_dict)
+    req_mock.text = tle_fix
     mock_api = mocker.patch(__name__ + ".requests.get",
                             return_value=req_mock)
     lat, lon = get_iss_lat_long_now()
     assert mock_api.call_count == 1
-    assert lat == +51.30
-    assert lon == -00.05
+    assert lat == pytest.approx(39.34, abs=0.01)
+    assert lon == pytest.approx(13.66, abs=0.01)
 
 def test_lat_long_fail(mocker):
     req_mock = MagicMock(spec=requests.Response)
@@ -98,4 +106,69 @@ def test_present_iss_passes(mocker, tle_fix, n_param):
     assert len(present_list) == n_param
     assert present_list[0][0] == '2025-08-06 13:44:22+00:00'
     assert present_list[0][1] == 241
-    assert mock_api.call_count == 1
\ No newline at end of file
+    assert mock_api.call_count == 1
+
+@freezegun.freeze_time(STATIC_DATETIME)
+def test_get_tle_reuses_cached_tle(mocker, tle_fix):
+    req_mock = MagicMock(spec=requests.Response)
+    req_mock.status_code = 200
+    req_mock.text = tle_fix
+    mock_api = mocker.patch(__name__ + ".requests.get",
+                            return_value=req_mock)
+
+    get_passes(LONDON_LAT, LONDON_LON)
+    get_passes(LONDON_LAT, LONDON_LON, n=3)
+    assert mock_api.call_count == 1
+
+def test_get_tle_refreshes_when_stale(mocker, tle_fix):
+    req_mock = MagicMock(spec=requests.Response)
+    req_mock.status_code = 200
+    req_mock.text = tle_fix
+    mock_api = mocker.patch(__name__ + ".requests.get",
+                            return_value=req_mock)
+
+    first = get_tle()
+    req_mock.status_code = 400
+    assert get_tle(max_age=0) == first
+    assert mock_api.call_count == 2
+
+@freezegun.freeze_time(STATIC_DATETIME)
+def test_predict_passes_for_locations(mocker, tle_fix):
+    req_mock = MagicMock(spec=requests.Response)
+    req_mock.status_code = 200
+    req_mock.text = tle_fix
+    mock_api = mocker.patch(__name__ + ".requests.get",
+                            return_value=req_mock)
+
+    # Same observer as test_get_passes, which passes the coordinates to get_passes as lon, lat
+    locations = {"London": {"lat": LONDON_LON, "lon": LONDON_LAT},
+                 "Scotland": {"lat": 56.49, "lon": -4.20}}
+    passes = predict_passes_for_locations(locations, n=3, start=STATIC_DATETIME)
+
+    assert mock_api.call_count == 1
+    assert set(passes["location"]) == {"London", "Scotland"}
+    london = passes[passes["location"] == "London"]
+    assert london["rise_time"].iloc[0] == datetime.fromtimestamp(1754487862, tz=timezone.utc)
+    assert london["duration_seconds"].iloc[0] == 241
+
+@freezegun.freeze_time(STATIC_DATETIME)
+def test_predict_passes_for_locations_methods_agree(mocker, tle_fix):
+    req_mock = MagicMock(spec=requests.Response)
+    req_mock.status_code = 200
+    req_mock.text = tle_fix
+    mocker.patch(__name__ + ".requests.get", return_value=req_mock)
+
+    locations = {"London": {"lat": 51.51, "lon": -0.13},
+                 "Scotland": {"lat": 56.49, "lon": -4.20}}
+    ephem_passes = predict_passes_for_locations(locations, n=5, start=STATIC_DATETIME)
+    sgp4_passes = predict_passes_for_locations(locations, n=5, start=STATIC_DATETIME,
+                                               method="sgp4")
+
+    assert list(sgp4_passes["location"]) == list(ephem_passes["location"])
+    rise_difference = (sgp4_passes["rise_time"] - ephem_passes["rise_time"]).abs()
+    assert rise_difference.max() <= pd.Timedelta(seconds=5)
+    assert (sgp4_passes["duration_seconds"] - ephem_passes["duration_seconds"]).abs().max() <= 5
+
+def test_predict_passes_for_locations_unknown_method():
+    with pytest.raises(ValueError):
+        predict_passes_for_locations({}, n=1, method="open-notify")
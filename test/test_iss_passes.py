@@ -0,0 +1,56 @@
+# pylint: skip-file
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.iss_etl import present_iss_passes
+from src.iss_passes import save_passes, load_next_passes
+
+NOW = datetime(2025, 8, 6, 8, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE iss_pass (
+                region_name TEXT, rise_time TIMESTAMP, duration_seconds INT,
+                PRIMARY KEY (region_name, rise_time))"""))
+    return engine
+
+
+def make_passes(region_name, hours):
+    return pd.DataFrame({
+        "location": region_name,
+        "rise_time": [NOW + timedelta(hours=h) for h in hours],
+        "duration_seconds": [300 + h for h in hours]
+    })
+
+
+def test_load_next_passes_skips_past_passes(engine):
+    save_passes(engine, make_passes("London", [-2, 1, 3, 5]))
+
+    passes = load_next_passes(engine, "London", n=2, now=NOW)
+    assert passes["response"] == [
+        {"risetime": int((NOW + timedelta(hours=1)).timestamp()), "duration": 301},
+        {"risetime": int((NOW + timedelta(hours=3)).timestamp()), "duration": 303}]
+    assert present_iss_passes(passes)[0] == ("2025-08-06 09:00:00+00:00", 301)
+
+
+def test_save_passes_replaces_region(engine):
+    save_passes(engine, pd.concat([make_passes("London", [1, 2]),
+                                   make_passes("Scotland", [1])]))
+    save_passes(engine, make_passes("London", [4]))
+
+    with engine.connect() as conn:
+        counts = dict(conn.execute(text(
+            "SELECT region_name, COUNT(*) FROM iss_pass GROUP BY region_name")).all())
+    assert counts == {"London": 1, "Scotland": 1}
+
+
+def test_load_next_passes_none_stored(engine):
+    with pytest.raises(RuntimeError):
+        load_next_passes(engine, "London", now=NOW)
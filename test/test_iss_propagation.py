@@ -0,0 +1,77 @@
+# pylint: skip-file
+from datetime import datetime, timedelta, timezone
+
+import ephem
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.iss_propagation import (make_satellite, make_time_grid, propagate, subsatellite_points,
+                                 observer_positions, elevations, find_passes,
+                                 predict_passes_on_grid, ground_track)
+
+TLE = ("ISS (ZARYA)",
+       "1 25544U 98067A   25217.57738833  .00008075  00000-0  14750-3 0  9991",
+       "2 25544  51.6349  62.2717 0001595 155.7040 204.4024 15.50349286522825")
+START = datetime(2025, 8, 6, 8, 39, 7, tzinfo=timezone.utc)
+
+
+def test_ground_track_follows_ephem():
+    track = ground_track(TLE, START, minutes=90, step=600)
+    iss = ephem.readtle(*TLE)
+
+    assert len(track) == 10
+    for when, longitude in zip(track["time"], track["longitude"]):
+        iss.compute(when.to_pydatetime())
+        assert longitude == pytest.approx(np.degrees(iss.sublong), abs=0.05)
+
+
+def test_elevations_overhead():
+    times = make_time_grid(START, timedelta(0))
+    satellite_position = propagate(make_satellite(TLE), times)
+    latitude, longitude = subsatellite_points(satellite_position)
+
+    observer_position, observer_up = observer_positions(
+        np.array([latitude[0], -latitude[0]]), np.array([longitude[0], longitude[0] + 180]),
+        np.zeros(2))
+    elevation = elevations(satellite_position, observer_position, observer_up)
+
+    assert elevation.shape == (2, 1)
+    assert elevation[0, 0] == pytest.approx(90, abs=0.01)
+    assert elevation[1, 0] < 0
+
+
+def test_find_passes_interpolates_and_skips_partial_passes():
+    times = pd.date_range(START, periods=10, freq="60s")
+    elevation = np.array([
+        [-10, -5, 5, 15, 5, -5, -5, -5, -5, -5],
+        [5, -5, -5, -5, -5, -5, -5, 5, 10, 10],
+    ], dtype=float)
+
+    passes = find_passes(elevation, times, ["rising", "partial"], n=5)
+
+    assert list(passes["location"]) == ["rising"]
+    assert passes["rise_time"].iloc[0] == pd.Timestamp(START) + pd.Timedelta(seconds=90)
+    assert passes["duration_seconds"].iloc[0] == 180
+
+
+def test_predict_passes_on_grid_matches_ephem():
+    locations = {"London": {"lat": 51.51, "lon": -0.13}, "Quito": {"lat": -0.18, "lon": -78.47}}
+    passes = predict_passes_on_grid(TLE, locations, n=4, start=START)
+    iss = ephem.readtle(*TLE)
+
+    for name, coordinates in locations.items():
+        observer = ephem.Observer()
+        observer.lat, observer.long = str(coordinates["lat"]), str(coordinates["lon"])
+        observer.pressure = 0
+        observer.date = START
+        expected = []
+        for _ in range(4):
+            rise_time, _, _, _, set_time, _ = observer.next_pass(iss)
+            expected.append(ephem.Date(rise_time).datetime().replace(tzinfo=timezone.utc))
+            observer.date = rise_time + 25 * ephem.minute
+
+        rise_times = passes.loc[passes["location"] == name, "rise_time"]
+        assert len(rise_times) == 4
+        for predicted, rise_time in zip(rise_times, expected):
+            assert abs(predicted - rise_time) <= timedelta(seconds=5)
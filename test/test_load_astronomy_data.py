@@ -1,5 +1,7 @@
 # pylint: skip-file
 import pandas as pd
+import psycopg2
+import pytest
 from unittest.mock import MagicMock, patch
 
 from src.load_astronomy_data import (
@@ -11,6 +13,9 @@ from src.load_astronomy_data import (
     make_forecast_dataframe,
     make_distance_dataframe,
     upload_to_db,
+    dataframe_to_csv,
+    get_forecast_months,
+    get_forecast_storage,
     main
 )
 
@@ -107,6 +112,37 @@ def test_make_forecast_dataframe_columns():
     ]
 
 
+def test_make_forecast_dataframe_numeric_storage_nulls_strings():
+    data = pd.DataFrame({
+        "date": ["2025-01-01"],
+        "longitude": [1.0],
+        "latitude": [1.0],
+        "planetary_body_id": [1],
+        "constellation_id": [2],
+        "right_ascension_hours": [10],
+        "right_ascension_string": ["09h 01m 12s"],
+        "declination_degrees": [20],
+        "declination_string": ["-29° 37' 12"],
+        "altitude_degrees": [5],
+        "altitude_string": ["46° 35' 24"],
+        "azimuth_degrees": [30],
+        "azimuth_string": ["324° 43' 12"]
+    })
+
+    result = make_forecast_dataframe(data, storage="numeric")
+    strings = ['right_ascension_string', 'declination_string',
+               'altitude_string', 'azimuth_string']
+    assert list(result.columns) == list(data.columns)
+    assert result[strings].isna().all().all()
+    assert result["right_ascension_hours"].tolist() == [10]
+
+
+def test_get_forecast_storage_rejects_unknown_mode(monkeypatch):
+    monkeypatch.setenv("FORECAST_STORAGE", "compressed")
+    with pytest.raises(ValueError):
+        get_forecast_storage()
+
+
 # Tests for making the distance dataframe
 def test_make_distance_dataframe_valid():
     df = pd.DataFrame({
@@ -121,8 +157,8 @@ def test_make_distance_dataframe_valid():
 
 
 # Tests for the inserting of both forecast and distance dataframes into the RDS
-@patch("pandas.DataFrame.to_sql")
-def test_upload_to_db_calls_to_sql(mock_to_sql):
+@pytest.fixture
+def upload_dataframes():
     df_forecast_test = pd.DataFrame({
         "date": ["2025-01-01"],
         "longitude": [1.0],
@@ -144,7 +180,93 @@ def test_upload_to_db_calls_to_sql(mock_to_sql):
         'planetary_body_id': [1],
         'date': ['2025-01-01']
     })
+    return df_forecast_test, df_distance_test
+
+
+def test_upload_to_db_copies_and_upserts(upload_dataframes):
     engine = MagicMock()
+    connection = engine.raw_connection.return_value
+    cursor = connection.cursor.return_value
+    cursor.rowcount = 1
+
+    stats = upload_to_db(*upload_dataframes, engine)
 
-    upload_to_db(df_forecast_test, df_distance_test, engine)
-    assert mock_to_sql.call_count == 2
+    assert cursor.copy_expert.call_count == 2
+    upserts = [c.args[0] for c in cursor.execute.call_args_list
+               if "ON CONFLICT" in c.args[0]]
+    assert len(upserts) == 2
+    connection.commit.assert_called_once()
+    connection.close.assert_called_once()
+    assert stats["forecast"]["rows"] == 1
+    assert stats["distance"]["rows"] == 1
+    assert stats["forecast"]["seconds"] >= 0
+
+
+def test_upload_to_db_keeps_last_forecast_per_location(upload_dataframes):
+    engine = MagicMock()
+    cursor = engine.raw_connection.return_value.cursor.return_value
+    cursor.rowcount = 1
+
+    upload_to_db(*upload_dataframes, engine)
+
+    forecast_upsert = next(c.args[0] for c in cursor.execute.call_args_list
+                           if "INSERT INTO forecast" in c.args[0])
+    key = "planetary_body_id, latitude, longitude, date"
+    assert f"DISTINCT ON ({key})" in forecast_upsert
+    assert f"ORDER BY {key}, staging_row DESC" in forecast_upsert
+    assert f"ON CONFLICT ({key})" in forecast_upsert
+
+
+def test_upload_to_db_creates_partitions_and_refreshes_view(upload_dataframes):
+    engine = MagicMock()
+    cursor = engine.raw_connection.return_value.cursor.return_value
+    cursor.rowcount = 1
+
+    upload_to_db(*upload_dataframes, engine)
+
+    statements = [c.args[0] for c in cursor.execute.call_args_list]
+    assert "create_forecast_partition" in statements[0]
+    assert cursor.execute.call_args_list[0].args[1] == ("2025-01-01",)
+    assert "REFRESH MATERIALIZED VIEW CONCURRENTLY planetary_body_forecast" in statements[-1]
+
+
+def test_get_forecast_months_one_per_month():
+    df = pd.DataFrame({"date": ["2025-01-30", "2025-02-02", "2025-01-31", "2025-02-10"]})
+    assert get_forecast_months(df) == ["2025-01-01", "2025-02-01"]
+
+
+def test_upload_to_db_rolls_back_on_error(upload_dataframes):
+    engine = MagicMock()
+    connection = engine.raw_connection.return_value
+    connection.cursor.return_value.copy_expert.side_effect = psycopg2.Error(
+        "duplicate")
+
+    with pytest.raises(RuntimeError):
+        upload_to_db(*upload_dataframes, engine)
+
+    connection.rollback.assert_called_once()
+    connection.commit.assert_not_called()
+    connection.close.assert_called_once()
+
+
+def test_dataframe_to_csv_writes_null_ids():
+    df = pd.DataFrame({
+        "planetary_body_id": [1, 2],
+        "constellation_id": [3, None],
+        "declination_string": ['15° 30\' 36"', "-1° 0' 0\""]
+    })
+
+    lines = dataframe_to_csv(df).read().splitlines()
+
+    assert lines[0] == '1,3,"15° 30\' 36"""'
+    assert lines[1] == '2,,"-1° 0\' 0"""'
+
+
+def test_make_distance_dataframe_drops_duplicate_locations():
+    df = pd.DataFrame({
+        'astronomical_units': [1.01, 1.01, 0.5],
+        'planetary_body_id': [1, 1, 2],
+        'date': ["2025-01-01", "2025-01-01", "2025-01-01"]
+    })
+    result = make_distance_dataframe(df)
+    assert len(result) == 2
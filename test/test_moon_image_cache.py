@@ -0,0 +1,41 @@
+# pylint: skip-file
+import hashlib
+import os
+
+from src.moon_image_cache import MoonImageCache, make_key, round_coordinate
+
+
+def test_make_key_shares_nearby_locations():
+    london = make_key("2025-08-06", 51.5, -0.12, "default")
+    assert make_key("2025-08-06", 52.4, -1.9, "default") == london
+    assert make_key("2025-08-06", 56.5, -4.2, "default") != london
+    assert make_key("2025-08-07", 51.5, -0.12, "default") != london
+    assert make_key("2025-08-06", 51.5, -0.12, "sketch") != london
+    assert round_coordinate(-2.4) == 0.0
+
+
+def test_cache_round_trip_stores_identical_images_once(tmp_path):
+    cache = MoonImageCache(tmp_path)
+    assert cache.get("a") is None
+
+    cache.set("a", b"moon")
+    cache.set("b", b"moon")
+    assert cache.get("a") == b"moon"
+    assert cache.get("b") == b"moon"
+    assert len(os.listdir(tmp_path / "images")) == 1
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = MoonImageCache(tmp_path, max_bytes=10)
+    cache.set("first", b"11111")
+    cache.set("second", b"22222")
+    os.utime(cache.image_path(hashlib.sha256(b"11111").hexdigest()), (0, 0))
+    os.utime(cache.image_path(hashlib.sha256(b"22222").hexdigest()), (1, 1))
+
+    # Reading the older image makes the other one the least recently used
+    assert cache.get("first") == b"11111"
+    cache.set("third", b"33333")
+
+    assert cache.get("first") == b"11111"
+    assert cache.get("second") is None
+    assert cache.get("third") == b"33333"
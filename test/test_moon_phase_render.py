@@ -0,0 +1,38 @@
+# pylint: skip-file
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from src.moon_phase_render import render_phase, render_moon_phase
+
+LONDON_LAT = 51.5
+LONDON_LON = -0.12
+
+
+def lit_fraction(image):
+    disc = image[:, :, 0] > 0
+    return (image[:, :, 0] > 100).sum() / disc.sum()
+
+
+def test_render_phase_full_and_new():
+    assert lit_fraction(render_phase(0, 0, size=100)) == pytest.approx(1)
+    assert lit_fraction(render_phase(np.pi, 0, size=100)) == pytest.approx(0)
+
+
+@pytest.mark.parametrize(
+    'day, lit_side',
+    (
+        ("2025-08-01", "right"),
+        ("2025-08-16", "left")
+    )
+)
+def test_render_moon_phase_quarters(day, lit_side):
+    when = datetime.fromisoformat(day).replace(hour=21, tzinfo=timezone.utc)
+    image = render_moon_phase(LONDON_LAT, LONDON_LON, when, size=100)
+    lit = image[:, :, 0] > 100
+
+    assert image.shape == (100, 100, 3)
+    assert lit_fraction(image) == pytest.approx(0.5, abs=0.1)
+    left, right = lit[:, :50].sum(), lit[:, 50:].sum()
+    assert (right > left) == (lit_side == "right")
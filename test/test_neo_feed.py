@@ -0,0 +1,88 @@
+# pylint: skip-file
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.extract_nasa import parse_neo_feed
+from src.neo_feed import feed_windows, ingest_neos, load_neos, NEO_FEED_URL
+
+
+def make_neo(neo_id, name, hazardous, miss_distance, velocity, diameter=100.0):
+    return {
+        "id": neo_id,
+        "name": f"({name})",
+        "estimated_diameter": {"meters": {"estimated_diameter_min": diameter,
+                                          "estimated_diameter_max": diameter * 2}},
+        "is_potentially_hazardous_asteroid": hazardous,
+        "close_approach_data": [{"miss_distance": {"kilometers": str(miss_distance)},
+                                 "relative_velocity": {"kilometers_per_hour": str(velocity)}}]
+    }
+
+
+FEED = {"near_earth_objects": {
+    "2025-05-23": [make_neo("1", "2025 AA", False, 5000000.04, 20000.0),
+                   make_neo("2", "2025 BB", True, 1000000.0, 90000.0)],
+    "2025-05-24": [make_neo("1", "2025 AA", False, 6000000.0, 21000.0)]
+}}
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE near_earth_object (
+                neo_id TEXT, approach_date DATE, name TEXT, diameter_min_m REAL,
+                diameter_max_m REAL, hazardous BOOLEAN, miss_distance_km REAL,
+                relative_velocity_kmph REAL, PRIMARY KEY (neo_id, approach_date))"""))
+    return engine
+
+
+def test_parse_neo_feed():
+    neos = parse_neo_feed(FEED)
+
+    assert list(neos["neo_id"]) == ["1", "2", "1"]
+    assert list(neos["approach_date"]) == ["2025-05-23", "2025-05-23", "2025-05-24"]
+    assert neos["name"].iloc[0] == "2025 AA"
+    assert neos["miss_distance_km"].iloc[0] == 5000000.0
+    assert list(neos["hazardous"]) == [False, True, False]
+
+
+def test_parse_neo_feed_empty():
+    assert parse_neo_feed({"near_earth_objects": {}}).empty
+
+
+def test_feed_windows():
+    assert feed_windows(date(2025, 5, 1), 10) == [(date(2025, 5, 1), date(2025, 5, 7)),
+                                                   (date(2025, 5, 8), date(2025, 5, 10))]
+
+
+def test_ingest_neos_upserts(engine, requests_mock):
+    requests_mock.get(NEO_FEED_URL, json=FEED)
+    assert ingest_neos(engine, date(2025, 5, 23)) == 3
+
+    updated = {"near_earth_objects": {
+        "2025-05-23": [make_neo("1", "2025 AA", False, 4000000.0, 20000.0)]}}
+    requests_mock.get(NEO_FEED_URL, json=updated)
+    ingest_neos(engine, date(2025, 5, 23))
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM near_earth_object")).scalar() == 3
+    neos = load_neos(engine, "2025-05-23")
+    assert list(neos["miss_distance_km"]) == [1000000.0, 4000000.0]
+    assert requests_mock.last_request.qs["end_date"] == ["2025-05-29"]
+
+
+def test_load_neos_filters_and_sorts(engine, requests_mock):
+    requests_mock.get(NEO_FEED_URL, json=FEED)
+    ingest_neos(engine, date(2025, 5, 23))
+
+    assert list(load_neos(engine, "2025-05-23", sort_by="relative_velocity_kmph",
+                          descending=True)["name"]) == ["2025 BB", "2025 AA"]
+    assert list(load_neos(engine, "2025-05-23", hazardous_only=True)["name"]) == ["2025 BB"]
+    assert list(load_neos(engine, "2025-05-23", max_miss_distance_km=2000000)["neo_id"]) == ["2"]
+    assert list(load_neos(engine, "2025-05-23", min_velocity_kmph=50000)["neo_id"]) == ["2"]
+
+    with pytest.raises(ValueError):
+        load_neos(engine, "2025-05-23", sort_by="name; DROP TABLE near_earth_object")
@@ -0,0 +1,109 @@
+# pylint: skip-file
+import json
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+import pandas as pd
+
+from src.pipeline_astronomy_data import (extract_locations, transform_locations, run_pipeline,
+                                         stream_location)
+
+
+@pytest.fixture
+def raw_data():
+    with open("data/astronomy_test_data.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def locations():
+    return [
+        {"lat": +51.30, "lon": -00.05},
+        {"lat": +55.57, "lon": -03.11},
+        {"lat": +54.60, "lon": -05.93}
+    ]
+
+
+@patch("src.pipeline_astronomy_data.stream_planetary_positions")
+def test_extract_locations_fetches_every_location(mock_stream, locations):
+    mock_stream.side_effect = lambda coordinates, *args, **kwargs: iter([
+        {"latitude": coordinates["lat"], "longitude": coordinates["lon"]}])
+    dates = {"start": date(2025, 8, 10), "end": date(2025, 8, 11)}
+
+    result = extract_locations(locations, dates, {}, max_workers=2)
+
+    assert [frame.to_dict("records") for frame in result] == [
+        [{"latitude": coordinates["lat"], "longitude": coordinates["lon"]}]
+        for coordinates in locations]
+    assert mock_stream.call_count == 3
+
+
+@patch("src.pipeline_astronomy_data.stream_planetary_positions")
+def test_extract_locations_shares_session(mock_stream, locations):
+    mock_stream.side_effect = lambda *args, **kwargs: iter([{"planetary_body": "Sun"}])
+
+    extract_locations(locations, {}, {})
+
+    sessions = {id(call.kwargs["session"])
+                for call in mock_stream.call_args_list}
+    assert len(sessions) == 1
+
+
+@patch("src.pipeline_astronomy_data.stream_planetary_positions")
+def test_stream_location_empty_response(mock_stream):
+    mock_stream.return_value = iter([])
+
+    with pytest.raises(ValueError):
+        stream_location({"lat": 51.51, "lon": -0.13}, {}, {})
+
+
+def test_transform_locations_combines_locations(raw_data):
+    result = transform_locations([raw_data, raw_data])
+
+    assert isinstance(result, pd.DataFrame)
+    assert len(result) == 2 * 11 * 2
+    assert result.index.is_unique
+
+
+def test_transform_locations_empty_response():
+    with pytest.raises(ValueError):
+        transform_locations([{}])
+
+
+def test_transform_locations_wrong_type():
+    with pytest.raises(TypeError):
+        transform_locations(["not a dict"])
+
+
+@patch("src.pipeline_astronomy_data.main")
+@patch("src.pipeline_astronomy_data.extract_requests")
+@patch("src.pipeline_astronomy_data.get_backfill_requests")
+@patch("src.pipeline_astronomy_data.get_db_connection")
+def test_run_pipeline_backfill_without_gaps_skips_extract(
+        mock_conn, mock_backfill, mock_extract, mock_main):
+    mock_backfill.return_value = []
+
+    run_pipeline(backfill_horizon=7)
+
+    mock_backfill.assert_called_once()
+    mock_extract.assert_not_called()
+    mock_main.assert_not_called()
+
+
+@patch("src.pipeline_astronomy_data.main")
+@patch("src.pipeline_astronomy_data.transform_locations")
+@patch("src.ephemeris_astronomy_data.get_local_planetary_positions")
+@patch("src.pipeline_astronomy_data.extract_requests")
+@patch("src.pipeline_astronomy_data.get_date_range")
+@patch("src.pipeline_astronomy_data.get_db_connection")
+def test_run_pipeline_local_ephemeris_skips_api(
+        mock_conn, mock_dates, mock_extract, mock_local, mock_transform, mock_main):
+    mock_dates.return_value = {"from_date": "2025-07-19", "to_date": "2025-07-25"}
+    mock_local.return_value = {"data": {}}
+
+    run_pipeline(locations=[{"lat": 51.51, "lon": -0.13}], local_ephemeris=True)
+
+    mock_local.assert_called_once()
+    mock_extract.assert_not_called()
+    mock_transform.assert_called_once_with([{"data": {}}])
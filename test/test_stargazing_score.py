@@ -0,0 +1,166 @@
+# pylint: skip-file
+import math
+from datetime import datetime, timezone
+
+import ephem
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.stargazing_score import (make_hours, julian_dates, body_positions, altitudes,
+                                  score_grid, compute_scores, best_windows, load_weather_grid,
+                                  get_best_windows)
+
+START = datetime(2025, 1, 10, tzinfo=timezone.utc)
+
+
+def grid(value, shape=(2, 4)):
+    return np.full(shape, value, dtype=float)
+
+
+def clear_dark_night(**overrides):
+    inputs = {
+        "cloud_cover": grid(0), "visibility": grid(30000), "humidity": grid(50),
+        "sun_altitude": grid(-30), "moon_altitude": grid(-10), "moon_lit": grid(1),
+        "planets_up": grid(0)
+    }
+    inputs.update(overrides)
+    return inputs
+
+
+def test_make_hours_starts_on_the_hour():
+    times = make_hours(datetime(2025, 1, 10, 21, 45, tzinfo=timezone.utc), hours=3)
+    assert list(times) == [pd.Timestamp("2025-01-10 21:00", tz="UTC"),
+                           pd.Timestamp("2025-01-10 22:00", tz="UTC"),
+                           pd.Timestamp("2025-01-10 23:00", tz="UTC")]
+
+
+def test_julian_dates():
+    times = pd.DatetimeIndex([pd.Timestamp("2000-01-01 12:00", tz="UTC")])
+    assert julian_dates(times)[0] == pytest.approx(2451545.0)
+
+
+def test_altitudes_match_ephem():
+    times = make_hours(START, hours=24)
+    latitudes, longitudes = np.array([51.3, 57.1]), np.array([-0.05, -4.2])
+    sun_altitudes = altitudes(*body_positions("Sun", times), latitudes, longitudes,
+                              julian_dates(times))
+
+    observer = ephem.Observer()
+    observer.lat, observer.lon, observer.pressure = "57.1", "-4.2", 0
+    for hour in (0, 6, 12, 18):
+        observer.date = times[hour].to_pydatetime()
+        assert sun_altitudes[1, hour] == pytest.approx(
+            math.degrees(ephem.Sun(observer).alt), abs=0.5)
+
+
+def test_score_grid_clear_dark_night_scores_highly():
+    assert (score_grid(**clear_dark_night()) == 100).all()
+
+
+def test_score_grid_daylight_and_cloud_score_zero():
+    assert (score_grid(**clear_dark_night(sun_altitude=grid(10))) == 0).all()
+    assert (score_grid(**clear_dark_night(cloud_cover=grid(100))) == 0).all()
+
+
+def test_score_grid_moonlight_and_damp_lower_score():
+    base = score_grid(**clear_dark_night(visibility=grid(5000)))
+    moonlit = score_grid(**clear_dark_night(visibility=grid(5000), moon_altitude=grid(60)))
+    damp = score_grid(**clear_dark_night(visibility=grid(5000), humidity=grid(95)))
+    assert (moonlit < base).all()
+    assert (damp < base).all()
+
+
+def test_score_grid_aurora_and_planets_raise_score():
+    inputs = clear_dark_night(cloud_cover=grid(50))
+    base = score_grid(**inputs)
+    assert (score_grid(**inputs, aurora_status="Red") > base).all()
+    assert (score_grid(**{**inputs, "planets_up": grid(2)}) > base).all()
+
+
+def test_score_grid_missing_weather_scores_zero():
+    assert (score_grid(**clear_dark_night(cloud_cover=grid(np.nan))) == 0).all()
+
+
+def test_compute_scores_shape():
+    times = make_hours(START, hours=48)
+    weather = {"cloud_cover": grid(0, (3, 48)), "visibility": grid(30000, (3, 48)),
+               "relative_humidity": grid(50, (3, 48))}
+    scores = compute_scores([51.3, 54.0, 57.1], [-0.05, -2.0, -4.2], weather, times)
+
+    assert scores.shape == (3, 48)
+    # Midday in January is never dark enough
+    assert (scores[:, 12] == 0).all()
+    assert (scores[:, 0] > 0).all()
+
+
+def test_best_windows_finds_runs():
+    times = make_hours(START, hours=6)
+    scores = np.array([
+        [0, 70, 80, 0, 90, 90],
+        [65, 0, 0, 0, 0, 0]
+    ], dtype=float)
+
+    windows = best_windows(scores, ["London", "Scotland"], times)
+
+    assert list(windows["location"]) == ["London", "London", "Scotland"]
+    assert list(windows["hours"]) == [2, 2, 1]
+    assert list(windows["mean_score"]) == [90.0, 75.0, 65.0]
+    assert list(windows["peak_score"]) == [90.0, 80.0, 65.0]
+    assert windows["start"].iloc[0] == times[4]
+    assert windows["end"].iloc[0] == times[5] + pd.Timedelta(hours=1)
+
+
+def test_best_windows_none_good():
+    times = make_hours(START, hours=3)
+    windows = best_windows(np.zeros((2, 3)), ["London", "Scotland"], times)
+    assert windows.empty
+
+
+def test_load_weather_grid_aligns_regions_and_hours():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE weather_hourly (
+                region_name TEXT, forecast_time TIMESTAMP, cloud_cover REAL,
+                visibility REAL, relative_humidity REAL)"""))
+    times = make_hours(START, hours=3)
+    pd.DataFrame({
+        "region_name": ["Scotland", "Scotland", "London"],
+        "forecast_time": [times[0], times[1], times[2]],
+        "cloud_cover": [10.0, 20.0, 30.0],
+        "visibility": [1000.0, 2000.0, 3000.0],
+        "relative_humidity": [50.0, 60.0, 70.0]
+    }).to_sql("weather_hourly", engine, if_exists="append", index=False)
+
+    weather = load_weather_grid(engine, ["London", "Scotland"], times)
+
+    np.testing.assert_array_equal(weather["cloud_cover"],
+                                  [[np.nan, np.nan, 30.0], [10.0, 20.0, np.nan]])
+
+
+@pytest.fixture
+def empty_weather_engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE weather_hourly (
+                region_name TEXT, forecast_time TIMESTAMP, cloud_cover REAL,
+                visibility REAL, relative_humidity REAL)"""))
+    return engine
+
+
+def test_load_weather_grid_empty_snapshot_is_nan(empty_weather_engine):
+    times = make_hours(START, hours=3)
+
+    weather = load_weather_grid(empty_weather_engine, ["London", "Scotland"], times)
+
+    for column in ("cloud_cover", "visibility", "relative_humidity"):
+        assert weather[column].shape == (2, 3)
+        assert np.isnan(weather[column]).all()
+
+
+def test_get_best_windows_empty_snapshot_has_no_windows(empty_weather_engine):
+    windows = get_best_windows(empty_weather_engine, start=START)
+    assert windows.empty
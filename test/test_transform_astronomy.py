@@ -1,9 +1,14 @@
 # pylint: skip-file
+import io
 import json
 
 import pytest
 
-from src.transform_astronomy_data import filter_data, add_record
+import pandas as pd
+
+from src.transform_astronomy_data import (filter_data, filter_data_columnar, add_record,
+                                          filter_records, iter_json_file_records,
+                                          iter_record_frames, iter_records)
 
 @pytest.fixture
 def raw_data():
@@ -53,3 +58,42 @@ def test_add_record(raw_data):
     assert added_record["azimuth_string"] == '177° 26\' 24"'
 
 
+
+def test_filter_data_columnar_matches_filter_data(raw_data):
+    expected = filter_data(raw_data)
+    result = filter_data_columnar(raw_data)
+
+    assert result["planetary_body"].dtype == "category"
+    assert result["constellation"].dtype == "category"
+    pd.testing.assert_frame_equal(expected, result.astype({
+        "planetary_body": expected.dtypes["planetary_body"],
+        "constellation": expected.dtypes["constellation"]
+    }))
+
+def test_iter_json_file_records_matches_filter_data(raw_data):
+    expected = filter_data(raw_data)
+    result = filter_records(iter_json_file_records("data/astronomy_test_data.json"))
+
+    pd.testing.assert_frame_equal(expected, result)
+
+
+def test_iter_records_handles_any_key_order(raw_data):
+    expected = filter_data(raw_data)
+    # Table before observer, and each body's cells before its entry
+    reordered = {"data": {
+        "table": {"rows": [{"cells": row["cells"], "entry": row["entry"]}
+                           for row in raw_data["data"]["table"]["rows"]]},
+        "observer": raw_data["data"]["observer"]
+    }}
+
+    result = filter_records(iter_records(io.BytesIO(json.dumps(reordered).encode())))
+
+    pd.testing.assert_frame_equal(expected, result)
+
+
+def test_iter_record_frames_chunks_records():
+    records = iter_json_file_records("data/astronomy_test_data.json")
+
+    frames = list(iter_record_frames(records, chunk_size=10))
+
+    assert [len(frame) for frame in frames] == [10, 10, 2]
@@ -77,6 +77,12 @@ def test_transform_hourly_data_values(raw_hourly_data):
     assert result_df.loc[2, "Cloud Cover (%)"] == 44.0
 
 
+def test_transform_hourly_data_leaves_input_unchanged(raw_hourly_data):
+    original = raw_hourly_data.copy()
+    transform_hourly_data(raw_hourly_data)
+    pd.testing.assert_frame_equal(raw_hourly_data, original)
+
+
 def test_transform_daily_data_columns(raw_daily_data):
     input_daily_data = pd.DataFrame({
         "Date": ["2025-07-31"],
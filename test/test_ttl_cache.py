@@ -0,0 +1,91 @@
+# pylint: skip-file
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.ttl_cache import TTLCache, ttl_cache, cache_stats, freeze
+
+
+def test_ttl_cache_hits_and_misses():
+    fetch = MagicMock(side_effect=lambda x: x * 2)
+    cached = ttl_cache(ttl=60)(fetch)
+
+    assert cached(2) == 4
+    assert cached(2) == 4
+    assert cached(3) == 6
+
+    assert fetch.call_count == 2
+    stats = cached.cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["size"] == 2
+
+
+def test_ttl_cache_expires_entries():
+    fetch = MagicMock(return_value="data")
+    cached = ttl_cache(ttl=10)(fetch)
+
+    with patch("src.ttl_cache.time.monotonic", return_value=100.0):
+        cached("url")
+    with patch("src.ttl_cache.time.monotonic", return_value=105.0):
+        cached("url")
+    with patch("src.ttl_cache.time.monotonic", return_value=111.0):
+        cached("url")
+
+    assert fetch.call_count == 2
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    fetch = MagicMock(side_effect=lambda x: x)
+    cached = ttl_cache(ttl=60, maxsize=2)(fetch)
+
+    cached(1)
+    cached(2)
+    cached(1)
+    cached(3)
+    cached(1)
+    cached(2)
+
+    assert fetch.call_count == 4
+    assert cached.cache_stats()["evictions"] == 2
+
+
+def test_ttl_cache_keys_on_dict_arguments():
+    fetch = MagicMock(return_value="apod")
+    cached = ttl_cache(ttl=60)(fetch)
+
+    cached("url", {"date": "2025-08-10", "api_key": "key"})
+    cached("url", {"api_key": "key", "date": "2025-08-10"})
+    cached("url", {"api_key": "key", "date": "2025-08-11"})
+
+    assert fetch.call_count == 2
+
+
+def test_ttl_cache_does_not_cache_errors():
+    fetch = MagicMock(side_effect=[RuntimeError("down"), "data"])
+    cached = ttl_cache(ttl=60)(fetch)
+
+    with pytest.raises(RuntimeError):
+        cached()
+    assert cached() == "data"
+
+
+def test_cache_stats_lists_registered_caches():
+    def fetch_something():
+        return 1
+
+    cached = ttl_cache(ttl=60)(fetch_something)
+    cached()
+
+    assert cache_stats()[f"{__name__}.test_cache_stats_lists_registered_caches.<locals>.fetch_something"]["misses"] == 1
+
+
+def test_ttl_cache_rejects_bad_settings():
+    with pytest.raises(ValueError):
+        TTLCache(ttl=0)
+    with pytest.raises(ValueError):
+        TTLCache(ttl=1, maxsize=0)
+
+
+def test_freeze_nested_values():
+    assert freeze({"b": [1, 2], "a": {"c": 3}}) == (("a", (("c", 3),)), ("b", (1, 2)))
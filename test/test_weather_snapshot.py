@@ -0,0 +1,139 @@
+# pylint: skip-file
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.weather_snapshot import (extract_region_weather, make_snapshot, save_snapshot,
+                                  load_region_weather, refresh_snapshot)
+
+START = datetime(2025, 8, 1, tzinfo=timezone.utc)
+
+
+def make_mock_response(temperature):
+    """Open-Meteo style response with a week of hourly and daily values"""
+    mock_response = MagicMock()
+
+    current_variable = MagicMock()
+    current_variable.Value.return_value = temperature
+    mock_response.Current.return_value.Variables.return_value = current_variable
+
+    hourly = mock_response.Hourly.return_value
+    hourly.Time.return_value = START.timestamp()
+    hourly.TimeEnd.return_value = (START + timedelta(days=7)).timestamp()
+    hourly.Interval.return_value = 3600
+    hourly_variable = MagicMock()
+    hourly_variable.ValuesAsNumpy.return_value = np.arange(168, dtype=float)
+    hourly.Variables.return_value = hourly_variable
+
+    daily = mock_response.Daily.return_value
+    daily.Time.return_value = START.timestamp()
+    daily.TimeEnd.return_value = (START + timedelta(days=7)).timestamp()
+    daily.Interval.return_value = 86400
+    daily_variable = MagicMock()
+    daily_variable.ValuesInt64AsNumpy.return_value = np.full(7, int(START.timestamp()) + 18000)
+    daily_variable.ValuesAsNumpy.return_value = np.arange(7, dtype=float)
+    daily.Variables.return_value = daily_variable
+
+    return mock_response
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE weather_current (
+                region_name TEXT, fetched_at TIMESTAMP, temperature REAL,
+                relative_humidity REAL, wind_speed REAL, wind_gusts REAL,
+                precipitation REAL, cloud_cover REAL)"""))
+        conn.execute(text("""
+            CREATE TABLE weather_hourly (
+                region_name TEXT, forecast_time TIMESTAMP, temperature REAL,
+                relative_humidity REAL, precipitation REAL, wind_speed REAL,
+                wind_gusts REAL, visibility REAL, cloud_cover REAL)"""))
+        conn.execute(text("""
+            CREATE TABLE weather_daily (
+                region_name TEXT, date DATE, sunrise TIMESTAMP, sunset TIMESTAMP,
+                max_wind_speed REAL, max_wind_gusts REAL,
+                max_temperature REAL, min_temperature REAL)"""))
+    return engine
+
+
+REGIONS = {"London": {"lat": 51.3, "lon": -0.05},
+           "Scotland": {"lat": 55.57, "lon": -3.11}}
+
+
+def test_extract_region_weather_makes_one_request():
+    mock_client = MagicMock()
+    mock_client.weather_api.return_value = [make_mock_response(15.0), make_mock_response(12.0)]
+
+    responses = extract_region_weather(mock_client, REGIONS)
+
+    mock_client.weather_api.assert_called_once()
+    params = mock_client.weather_api.call_args.kwargs["params"]
+    assert params["latitude"] == [51.3, 55.57]
+    assert params["longitude"] == [-0.05, -3.11]
+    assert list(responses) == ["London", "Scotland"]
+
+
+def test_extract_region_weather_missing_responses():
+    mock_client = MagicMock()
+    mock_client.weather_api.return_value = [make_mock_response(15.0)]
+
+    with pytest.raises(RuntimeError):
+        extract_region_weather(mock_client, REGIONS)
+
+
+def test_make_snapshot_keeps_full_forecast():
+    snapshot = make_snapshot({"London": make_mock_response(15.0),
+                              "Scotland": make_mock_response(12.0)}, START)
+
+    assert len(snapshot["weather_current"]) == 2
+    assert len(snapshot["weather_hourly"]) == 2 * 168
+    assert len(snapshot["weather_daily"]) == 2 * 7
+    assert list(snapshot["weather_current"]["temperature"]) == [15.0, 12.0]
+
+
+def test_save_snapshot_replaces_regions(engine):
+    save_snapshot(engine, make_snapshot({"London": make_mock_response(15.0)}, START))
+    save_snapshot(engine, make_snapshot({"London": make_mock_response(18.0)}, START))
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM weather_current")).scalar() == 1
+        assert conn.execute(text("SELECT COUNT(*) FROM weather_hourly")).scalar() == 168
+        assert conn.execute(text("SELECT temperature FROM weather_current")).scalar() == 18.0
+
+
+def test_load_region_weather_slices_from_current_hour(engine):
+    save_snapshot(engine, make_snapshot({"London": make_mock_response(15.0),
+                                         "Scotland": make_mock_response(12.0)}, START))
+
+    current, hourly, daily = load_region_weather(
+        engine, "Scotland", now=START + timedelta(hours=30, minutes=20))
+
+    assert current[0] == 12.0
+    assert len(current) == 6
+    assert len(hourly) == 24
+    assert hourly["Date"].iloc[0] == START + timedelta(hours=30)
+    assert hourly["Temperature (°C)"].iloc[0] == 30.0
+    assert list(hourly.columns) == ["Date", "Temperature (°C)", "Relative Humidity (%)",
+                                    "Precipitation (mm)", "Wind Speed (km/h)",
+                                    "Wind Gusts (km/h)", "Visibility (m)", "Cloud Cover (%)"]
+    assert len(daily) == 7
+    assert "Sunrise" in daily.columns
+
+
+def test_load_region_weather_missing_region(engine):
+    with pytest.raises(RuntimeError):
+        load_region_weather(engine, "London")
+
+
+def test_refresh_snapshot_saves_every_region(engine, monkeypatch):
+    monkeypatch.setattr("src.weather_snapshot.REGIONS", REGIONS)
+    mock_client = MagicMock()
+    mock_client.weather_api.return_value = [make_mock_response(15.0), make_mock_response(12.0)]
+
+    assert refresh_snapshot(engine, mock_client) == 2